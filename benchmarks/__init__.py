@@ -0,0 +1 @@
+"""Benchmarks for jdiff, run each module with `python -m benchmarks.<module>` from the repository root."""
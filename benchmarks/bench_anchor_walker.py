@@ -0,0 +1,47 @@
+"""Time and allocations of anchored path extraction with and without the single traversal walker."""
+
+import tracemalloc
+
+from jdiff import JdiffPath, extract_data_from_json
+
+from .utility import bgp_summary, interfaces, report, timed
+
+CASES = [
+    ("bgp", "result[0].vrfs.default.peerList[*].[$peerAddress$,state]"),
+    ("bgp", "result[0].vrfs.default.peerList[*].[$peerAddress$,state,prefixesReceived,prefixesSent]"),
+    ("interfaces", "interfaces.$*$.interfaceStatus"),
+    ("interfaces", "interfaces.*.[$name$,interfaceStatus,mtu]"),
+]
+
+
+def allocated(function):
+    """Return the peak traced memory in MB of one call to 'function'."""
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    """Run the benchmark."""
+    documents = {"bgp": bgp_summary(peers=50_000), "interfaces": interfaces(50_000)}
+    rows = []
+    for name, path in CASES:
+        document = documents[name]
+        walker_path = JdiffPath(path)
+        legacy_path = JdiffPath(path)
+        legacy_path.anchor_walker = None
+        if extract_data_from_json(document, walker_path) != extract_data_from_json(document, legacy_path):
+            raise ValueError(f"Walker and legacy results differ for {path}")
+
+        for mode, parsed in (("legacy", legacy_path), ("walker", walker_path)):
+            seconds = timed(lambda parsed=parsed: extract_data_from_json(document, parsed))
+            peak = allocated(lambda parsed=parsed: extract_data_from_json(document, parsed))
+            rows.append([path, mode, f"{seconds * 1000:.1f}", f"{peak:.1f}"])
+
+    report("Anchored extraction, 50k peers or interfaces", rows, ["path", "mode", "ms", "peak MB"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time of diffing polls against a baseline they differ from, with diff_generator or a BaselineComparator.
+
+Each poll changes the status of 20 interfaces, on top of counters that differ from the baseline on every poll.
+"""
+
+import copy
+from itertools import cycle
+
+from jdiff import BaselineComparator
+from jdiff.evaluators import DIFF_ENGINES, diff_generator
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 5_000
+
+
+def main():
+    """Run the benchmark."""
+    baseline = interfaces(INTERFACES)
+    polls = []
+    patches = []
+    for status in ("notconnect", "disabled"):
+        poll = copy.deepcopy(interfaces(INTERFACES, seed=1))
+        operations = []
+        for index in range(0, INTERFACES, INTERFACES // 20):
+            poll["interfaces"][f"Ethernet{index}"]["interfaceStatus"] = status
+            operations.append(
+                {"op": "replace", "path": f"/interfaces/Ethernet{index}/interfaceStatus", "value": status}
+            )
+        polls.append(poll)
+        patches.append(operations)
+
+    rows = []
+    for engine in DIFF_ENGINES:
+        comparator = BaselineComparator(baseline, engine=engine)
+        comparator.update(polls[1])
+        next_poll = cycle(polls).__next__
+        next_patch = cycle(patches).__next__
+        for method, function in (
+            ("diff_generator", lambda engine=engine: diff_generator(baseline, polls[0], engine=engine, lazy=True)),
+            ("update", lambda comparator=comparator: comparator.update(next_poll(), lazy=True)),
+            ("apply_patch", lambda comparator=comparator: comparator.apply_patch(next_patch(), lazy=True)),
+        ):
+            milliseconds = f"{timed(function) * 1000:.1f}"
+            rows.append(
+                [engine, method, milliseconds, "-" if method == "diff_generator" else comparator.stats.rediffed]
+            )
+
+    report(
+        f"Poll of {INTERFACES} interfaces with 20 changes and changed counters against the baseline",
+        rows,
+        ["engine", "method", "ms", "chunks rediffed"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Time, peak memory and size of diff_generator results, unbounded or bounded by max_diffs or max_bytes."""
+
+import json
+import re
+import tracemalloc
+
+from jdiff.evaluators import diff_generator
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 20_000
+
+
+def renamed_keys(data):
+    """Return data with its keys renamed from camelCase to snake_case, like after an OS upgrade changing the schema."""
+    if isinstance(data, dict):
+        return {re.sub(r"(?<=[a-z])([A-Z])", r"_\1", key).lower(): renamed_keys(value) for key, value in data.items()}
+    return data
+
+
+def peak_memory(function):
+    """Return the peak memory in bytes allocated by a call to function, and its result."""
+    tracemalloc.start()
+    try:
+        result = function()
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """Run the benchmark."""
+    pre = interfaces(INTERFACES)
+    rows = []
+    for name, post in (("renamed keys", renamed_keys(pre)), ("all counters", interfaces(INTERFACES, seed=1))):
+        for bound, kwargs in (
+            ("unbounded", {"engine": "native"}),
+            ("max_diffs=100", {"max_diffs": 100}),
+            ("max_bytes=64000", {"max_bytes": 64_000}),
+        ):
+            seconds = timed(lambda post=post, kwargs=kwargs: diff_generator(pre, post, **kwargs))
+            peak, result = peak_memory(lambda post=post, kwargs=kwargs: diff_generator(pre, post, **kwargs))
+            size = len(json.dumps(result))
+            rows.append([name, bound, f"{seconds * 1000:.0f}", f"{peak / 1024 / 1024:.1f}", f"{size / 1024:.0f}"])
+
+    report(
+        f"diff_generator of {INTERFACES} interfaces with a changed schema or changed counters",
+        rows,
+        ["post", "bound", "ms", "peak MB", "result KB"],
+    )
+
+
+if __name__ == "__main__":
+    main()
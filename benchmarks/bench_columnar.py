@@ -0,0 +1,45 @@
+"""Memory and time of numeric extraction results, as a list, a mapping or columns."""
+
+import gc
+import tracemalloc
+
+from jdiff import extract_data_from_json
+
+from .utility import bgp_summary, report, timed
+
+PATH = "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived,prefixesSent,upDownTime]"
+
+
+def retained(function):
+    """Return the result of 'function', the memory in MB it still holds once the call returned, and its peak."""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size / 1024 / 1024, peak / 1024 / 1024
+
+
+def main():
+    """Run the benchmark."""
+    document = bgp_summary(100_000)
+    rows = []
+    for output in ("list", "mapping", "columnar"):
+        result, size, peak = retained(lambda output=output: extract_data_from_json(document, PATH, output=output))
+        seconds = timed(lambda output=output: extract_data_from_json(document, PATH, output=output))
+        values = len(result) * 3
+        rows.append(
+            [output, f"{seconds * 1000:.1f}", f"{size:.1f}", f"{peak:.1f}", f"{size * 1024 * 1024 / values:.1f}"]
+        )
+        del result
+
+    report(
+        "Extraction of 3 numeric fields of 100k peers",
+        rows,
+        ["output", "ms", "retained MB", "peak MB", "bytes per value"],
+    )
+
+
+if __name__ == "__main__":
+    main()
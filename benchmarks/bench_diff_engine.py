@@ -0,0 +1,51 @@
+"""Time of diff_generator with the DeepDiff and the native engines, on a 10MB snapshot."""
+
+import copy
+import json
+
+from jdiff.evaluators import diff_generator
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 30_000
+
+
+def snapshots():
+    """Return a pre snapshot and post snapshots with no change, a few changes, and every counter changed."""
+    pre = interfaces(INTERFACES)
+    unchanged = copy.deepcopy(pre)
+    few_changes = copy.deepcopy(pre)
+    for index in range(0, INTERFACES, 1000):
+        few_changes["interfaces"][f"Ethernet{index}"]["interfaceStatus"] = "notconnect"
+    return pre, [
+        ("no change", unchanged),
+        ("30 changes", few_changes),
+        ("all counters", interfaces(INTERFACES, seed=1)),
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    pre, posts = snapshots()
+    size = len(json.dumps(pre)) / 1024 / 1024
+    rows = []
+    for name, post in posts:
+        expected = diff_generator(pre, post, engine="deepdiff")
+        if diff_generator(pre, post, engine="native") != expected:
+            raise ValueError(f"Engines differ on {name}.")
+        deepdiff_seconds = timed(lambda post=post: diff_generator(pre, post, engine="deepdiff"), repeat=1)
+        native_seconds = timed(lambda post=post: diff_generator(pre, post, engine="native"))
+        rows.append(
+            [
+                name,
+                f"{deepdiff_seconds * 1000:.1f}",
+                f"{native_seconds * 1000:.1f}",
+                f"{deepdiff_seconds / native_seconds:.1f}x",
+            ]
+        )
+
+    report(f"diff_generator on a {size:.1f}MB snapshot", rows, ["post", "deepdiff ms", "native ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
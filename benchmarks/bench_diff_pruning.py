@@ -0,0 +1,24 @@
+"""Time and walked value pairs of the native diff engine, with and without pruning of equal subtrees."""
+
+from jdiff.utils.diff_engine import JsonDiff
+
+from .bench_diff_engine import snapshots
+from .utility import report, timed
+
+
+def main():
+    """Run the benchmark."""
+    pre, posts = snapshots()
+    rows = []
+    for name, post in posts:
+        for prune in (False, True):
+            engine = JsonDiff(prune=prune)
+            seconds = timed(lambda engine=engine, post=post: engine.diff(pre, post))
+            visited, pruned, changes = engine.stats
+            rows.append([name, "yes" if prune else "no", f"{seconds * 1000:.1f}", visited, pruned, changes])
+
+    report("Native diff engine pruning", rows, ["post", "prune", "ms", "visited", "pruned", "changes"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Time and peak memory of a pass/fail check with diff_generator results built eagerly or lazily."""
+
+import copy
+import tracemalloc
+
+from jdiff.evaluators import diff_generator
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 20_000
+
+
+def peak_memory(function):
+    """Return the peak memory in bytes allocated by a call to function."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """Run the benchmark."""
+    pre = interfaces(INTERFACES)
+    few_changes = copy.deepcopy(pre)
+    for index in range(0, INTERFACES, 1000):
+        few_changes["interfaces"][f"Ethernet{index}"]["interfaceStatus"] = "notconnect"
+    rows = []
+    for name, post in (("20 changes", few_changes), ("all counters", interfaces(INTERFACES, seed=1))):
+        for result, lazy in (("dict", False), ("DiffResult", True)):
+
+            def check(post=post, lazy=lazy):
+                return bool(diff_generator(pre, post, engine="native", lazy=lazy))
+
+            seconds = timed(check)
+            peak = peak_memory(check)
+            rows.append([name, result, f"{seconds * 1000:.1f}", f"{peak / 1024 / 1024:.1f}"])
+
+    report(f"bool(diff_generator(...)) on {INTERFACES} interfaces", rows, ["post", "result", "ms", "peak MB"])
+
+
+if __name__ == "__main__":
+    main()
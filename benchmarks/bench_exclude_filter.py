@@ -0,0 +1,54 @@
+"""Iterative, frozenset based exclude_filter compared to the previous recursive implementation."""
+
+import copy
+
+from jdiff.utils.data_normalization import exclude_filter, exclude_filter_copy
+
+from .utility import interfaces, report, timed
+
+EXCLUDE = ["interfaceStatistics", "interfaceCounters"] + [f"vendorSpecificKey{index}" for index in range(50)]
+
+
+def recursive_exclude_filter(data, exclude):
+    """Previous implementation of exclude_filter, kept as baseline."""
+    if isinstance(data, dict):
+        for exclude_element in exclude:
+            try:
+                data.pop(exclude_element)
+            except KeyError:
+                pass
+
+        for key in data:
+            if isinstance(data[key], (dict, list)):
+                recursive_exclude_filter(data[key], exclude)
+
+    elif isinstance(data, list):
+        for element in data:
+            if isinstance(element, (dict, list)):
+                recursive_exclude_filter(element, exclude)
+
+
+def main():
+    """Run the benchmark."""
+    document = interfaces(100_000)
+    rows = []
+    for name, function in (
+        ("recursive (previous)", recursive_exclude_filter),
+        ("iterative frozenset", exclude_filter),
+    ):
+        copies = [copy.deepcopy(document) for _ in range(3)]
+        seconds = timed(lambda function=function, copies=copies: function(copies.pop(), EXCLUDE))
+        rows.append([name, f"{seconds:.3f}"])
+    seconds = timed(lambda: exclude_filter_copy(document, EXCLUDE))
+    rows.append(["exclude_filter_copy", f"{seconds:.3f}"])
+
+    stats = exclude_filter(copy.deepcopy(document), EXCLUDE)
+    report(
+        f"exclude_filter on 100k interfaces, {len(EXCLUDE)} excluded keys ({stats.visited} visited, {stats.removed} removed)",
+        rows,
+        ["implementation", "seconds"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Per document throughput of extract_many compared to calling extract_data_from_json in a loop."""
+
+from jdiff import compile_path, extract_data_from_json, extract_many
+
+from .utility import bgp_summary, report, timed
+
+PATH = "result[0].vrfs.default.peerList[*].[$peerAddress$,state,prefixesReceived]"
+
+
+def main():
+    """Run the benchmark."""
+    template = bgp_summary(peers=8)
+    rows = []
+    for count in (1_000, 10_000, 100_000):
+        documents = [template] * count
+
+        def loop():
+            for document in documents:
+                extract_data_from_json(document, PATH)
+
+        def batch():
+            for _ in extract_many(documents, PATH):
+                pass
+
+        def chunked():
+            for _ in extract_many(documents, compile_path(PATH), chunk_size=1000):
+                pass
+
+        for name, function in (("loop", loop), ("extract_many", batch), ("extract_many chunk=1000", chunked)):
+            seconds = timed(function, repeat=1 if count == 100_000 else 3)
+            rows.append([count, name, f"{seconds * 1e6 / count:.2f}", f"{count / seconds:,.0f}"])
+
+    report("extract_many throughput", rows, ["documents", "mode", "us/doc", "docs/s"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Peak memory and time of extract_stream compared to json.load followed by extract_many."""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from jdiff import extract_many, extract_stream
+
+from .utility import interfaces, report
+
+PATH = "interfaces.$*$.[interfaceStatus,mtu]"
+
+
+def measure(function):
+    """Return the wall clock time in seconds and the peak traced memory in MB of one call to 'function'."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024
+
+
+def main():
+    """Run the benchmark."""
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        for count in (1_000, 10_000):
+            records = [interfaces(16, seed=index) for index in range(count)]
+            files = {"ndjson": os.path.join(folder, "records.ndjson"), "array": os.path.join(folder, "records.json")}
+            with open(files["ndjson"], "w", encoding="utf-8") as filehandle:
+                filehandle.writelines(f"{json.dumps(record)}\n" for record in records)
+            with open(files["array"], "w", encoding="utf-8") as filehandle:
+                json.dump(records, filehandle)
+            del records
+            size = os.path.getsize(files["array"]) / 1024 / 1024
+
+            def load(filepath=files["array"]):
+                with open(filepath, "r", encoding="utf-8") as filehandle:
+                    for _ in extract_many(json.load(filehandle), PATH):
+                        pass
+
+            def stream_ndjson(filepath=files["ndjson"]):
+                for _ in extract_stream(filepath, PATH):
+                    pass
+
+            def stream_array(filepath=files["array"]):
+                for _ in extract_stream(filepath, PATH):
+                    pass
+
+            for name, function in (
+                ("json.load + extract_many", load),
+                ("extract_stream ndjson", stream_ndjson),
+                ("extract_stream array", stream_array),
+            ):
+                seconds, peak = measure(function)
+                rows.append([count, f"{size:.1f}", name, f"{seconds:.2f}", f"{peak:.1f}"])
+
+    report("extract_stream peak memory", rows, ["records", "file MB", "mode", "seconds", "peak MB"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Time of check types evaluated in full or in fail-fast mode, on passing and failing inputs."""
+
+import copy
+
+from jdiff import CheckType, extract_data_from_json
+
+from .utility import bgp_summary, interfaces, report, timed
+
+INTERFACES = 10_000
+PEERS = 100_000
+
+
+def diff_cases():
+    """Return exact_match and tolerance cases on interface snapshots: (check, name, args, kwargs)."""
+    pre = interfaces(INTERFACES)
+    grown = copy.deepcopy(pre)
+    for interface in grown["interfaces"].values():
+        interface["interfaceCounters"]["inOctets"] *= 1.01
+    changed = interfaces(INTERFACES, seed=1)
+    return [
+        ("exact_match", "pass", (pre, copy.deepcopy(pre)), {"engine": "native"}),
+        ("exact_match", "fail", (pre, changed), {"engine": "native"}),
+        ("tolerance", "pass", (pre, grown, 10), {"engine": "native"}),
+        ("tolerance", "fail", (pre, changed, 10), {"engine": "native"}),
+    ]
+
+
+def item_cases():
+    """Return parameter_match, regex and operator cases on a BGP peer list: (check, name, args, kwargs)."""
+    data = bgp_summary(PEERS)
+    states = extract_data_from_json(data, "result[0].vrfs.default.peerList[*].[$peerAddress$,state]")
+    groups = extract_data_from_json(data, "result[0].vrfs.default.peerList[*].[$peerAddress$,peerGroup]")
+    return [
+        ("parameter_match", "pass", ({"state": "Active"}, states, "no-match"), {}),
+        ("parameter_match", "fail", ({"state": "Established"}, states, "match"), {}),
+        ("regex", "pass", (".*-SPINE$", groups, "match"), {}),
+        ("regex", "fail", (".*UNDERLAY.*", groups, "match"), {}),
+        ("operator", "pass", ({"params": {"mode": "is-in", "operator_data": ["Established", "Idle"]}}, states), {}),
+        ("operator", "fail", ({"params": {"mode": "is-in", "operator_data": ["Established"]}}, states), {}),
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    rows = []
+    for check_type, name, args, kwargs in diff_cases() + item_cases():
+        check = CheckType.create(check_type)
+        passed = check.evaluate(*args, **kwargs)[1]
+        if check.evaluate(*args, fail_fast=True, **kwargs) != ({}, passed):
+            raise ValueError(f"Fail-fast {check_type} differs on {name}.")
+        full_seconds = timed(lambda check=check, args=args, kwargs=kwargs: check.evaluate(*args, **kwargs), repeat=5)
+        fail_fast_seconds = timed(
+            lambda check=check, args=args, kwargs=kwargs: check.evaluate(*args, fail_fast=True, **kwargs), repeat=5
+        )
+        rows.append(
+            [
+                check_type,
+                name,
+                f"{full_seconds * 1000:.1f}",
+                f"{fail_fast_seconds * 1000:.2f}",
+                f"{full_seconds / fail_fast_seconds:.1f}x",
+            ]
+        )
+
+    report(
+        f"Check types on {INTERFACES} interfaces and {PEERS} BGP peers, evaluated in full or failing fast",
+        rows,
+        ["check type", "input", "full ms", "fail-fast ms", "speedup"],
+    )
+
+
+if __name__ == "__main__":
+    main()
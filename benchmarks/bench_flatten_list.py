@@ -0,0 +1,88 @@
+"""Time of flattening 4-level nested results, before and after the single pass flatten_list."""
+
+from jdiff import extract_data_from_json
+from jdiff.utils.data_normalization import flatten_list
+from jdiff.utils.jmespath_parsers import compile_expression
+
+from .utility import report, timed
+
+PATH = "sites[*].racks[*].devices[*].[name,state,uptime]"
+
+
+def legacy_flatten_list(my_list):
+    """Recursive flatten_list as implemented before the single pass version, kept for comparison."""
+
+    def iter_flatten_list(my_list):
+        if is_flat_list(my_list):
+            yield my_list
+        else:
+            for item in my_list:
+                yield from iter_flatten_list(item)
+
+    def is_flat_list(obj):
+        return isinstance(obj, list) and not any(isinstance(i, list) for i in obj)
+
+    if is_flat_list(my_list):
+        return my_list
+    return list(iter_flatten_list(my_list))
+
+
+def legacy_normalize(values):
+    """Flattening stage of extract_data_from_json before the single pass version, kept for comparison."""
+    if any(isinstance(i, list) for i in values):
+        for element in values:
+            for item in element:
+                if isinstance(item, list):
+                    values = legacy_flatten_list(values)
+                    break
+    return values
+
+
+def sites(count: int, racks: int, devices: int) -> dict:
+    """Build a document with the given number of sites, racks per site and devices per rack."""
+    return {
+        "sites": [
+            {
+                "racks": [
+                    {
+                        "devices": [
+                            {
+                                "name": f"s{site}r{rack}d{device}",
+                                "state": "up" if device % 9 else "down",
+                                "uptime": device,
+                            }
+                            for device in range(devices)
+                        ]
+                    }
+                    for rack in range(racks)
+                ]
+            }
+            for site in range(count)
+        ]
+    }
+
+
+def main():
+    """Run the benchmark."""
+    rows = []
+    for count, racks, devices in ((10, 10, 100), (100, 10, 10), (1_000, 10, 1)):
+        document = sites(count, racks, devices)
+        # Values as returned by jmespath, before extract_data_from_json flattens them.
+        values = compile_expression(PATH).search(document)
+        expected = legacy_flatten_list(values)
+        for mode, function in (
+            ("legacy flatten_list", lambda values=values: legacy_flatten_list(values)),
+            ("flatten_list", lambda values=values: flatten_list(values)),
+            ("flatten_list depth=3", lambda values=values: flatten_list(values, 3)),
+            ("legacy normalization", lambda values=values: legacy_normalize(values)),
+            ("extract_data_from_json", lambda document=document: extract_data_from_json(document, PATH)),
+        ):
+            if mode.startswith("flatten_list") and function() != expected:
+                raise ValueError(f"{mode} result differs from legacy flatten_list")
+            rows.append([f"{count}x{racks}x{devices}", mode, f"{timed(function) * 1000:.1f}"])
+
+    report("Flattening 4-level nested results", rows, ["sites x racks x devices", "mode", "ms"])
+
+
+if __name__ == "__main__":
+    main()
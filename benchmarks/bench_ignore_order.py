@@ -0,0 +1,56 @@
+"""Time of order-insensitive diffs of reshuffled lists: DeepDiff ignore_order, sorting first, or multiset hashing."""
+
+from deepdiff import DeepDiff
+
+from jdiff.evaluators import diff_generator
+
+from .utility import report, timed
+
+
+def acl(entries, seed=0):
+    """Return an ACL like document with the given number of entries, in an order picked by seed."""
+    rules = [
+        {
+            "sequence": index * 10,
+            "action": "permit" if index % 3 else "deny",
+            "source": f"10.{index // 256}.{index % 256}.0/24",
+        }
+        for index in range(entries)
+    ]
+    # 7919 is prime, so this is a permutation of the entries for any count it does not divide.
+    order = [(index * 7919 + seed * 104729) % entries for index in range(entries)]
+    return {"vlans": order, "entries": [rules[index] for index in order]}
+
+
+def sorted_lists(data):
+    """Return data with its lists sorted, as done by hand before comparing outputs whose order is not meaningful."""
+    return {"vlans": sorted(data["vlans"]), "entries": sorted(data["entries"], key=lambda rule: rule["sequence"])}
+
+
+def main():
+    """Run the benchmark."""
+    rows = []
+    for count in (1000, 10000):
+        pre = acl(count)
+        post = acl(count, seed=1)
+        post["vlans"][0] = -1
+        post["entries"][0] = dict(post["entries"][0], action="deny")
+        methods = [
+            ("DeepDiff ignore_order", lambda pre=pre, post=post: DeepDiff(pre, post, ignore_order=True)),
+            ("sorted, then deepdiff", lambda pre=pre, post=post: diff_generator(sorted_lists(pre), sorted_lists(post))),
+            (
+                "sorted, then native",
+                lambda pre=pre, post=post: diff_generator(sorted_lists(pre), sorted_lists(post), engine="native"),
+            ),
+            ("native ignore_order", lambda pre=pre, post=post: diff_generator(pre, post, ignore_order=True)),
+        ]
+        for name, function in methods:
+            if count > 1000 and name.startswith("DeepDiff"):
+                continue
+            rows.append([count, name, f"{timed(function) * 1000:.1f}"])
+
+    report("Order-insensitive diff of reshuffled VLAN and ACL lists", rows, ["items", "method", "ms"])
+
+
+if __name__ == "__main__":
+    main()
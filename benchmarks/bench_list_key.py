@@ -0,0 +1,47 @@
+"""Time and size of diff_generator results on BGP peer lists, aligned by position or by a list key."""
+
+import copy
+
+from jdiff.evaluators import diff_generator
+from jdiff.utils.diff_engine import json_diff
+
+from .utility import bgp_summary, report, timed
+
+
+def changed_peers(pre):
+    """Return a copy of pre with a peer inserted at the top of the list and a peer gone Idle."""
+    post = copy.deepcopy(pre)
+    peers = post["result"][0]["vrfs"]["default"]["peerList"]
+    peers[len(peers) // 2]["state"] = "Idle"
+    peers.insert(0, dict(peers[0], peerAddress="192.168.0.1"))
+    return post
+
+
+def main():
+    """Run the benchmark."""
+    rows = []
+    for count in (1000, 10000):
+        pre = bgp_summary(count)
+        post = changed_peers(pre)
+        for name, kwargs in (
+            ("deepdiff by position", {"engine": "deepdiff"}),
+            ("native by position", {"engine": "native"}),
+            ("native by peerAddress", {"list_key": "peerAddress"}),
+        ):
+            if count > 1000 and kwargs.get("engine") == "deepdiff":
+                continue
+            # DeepDiff reports the same differences as the native engine by position.
+            report_types = json_diff(pre, post, list_key=kwargs.get("list_key")).values()
+            differences = sum(len(differences) for differences in report_types)
+            seconds = timed(lambda pre=pre, post=post, kwargs=kwargs: diff_generator(pre, post, **kwargs))
+            rows.append([count, name, f"{seconds * 1000:.1f}", differences])
+
+    report(
+        "diff_generator of a peer list with one peer inserted and one changed",
+        rows,
+        ["peers", "alignment", "ms", "differences"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Time of anchored extraction and evaluation with the list and the mapping outputs."""
+
+from jdiff import CheckType, extract_data_from_json
+
+from .utility import bgp_summary, report, timed
+
+PATH = "result[0].vrfs.default.peerList[*].[$peerAddress$,state,peerGroup]"
+
+
+def main():
+    """Run the benchmark."""
+    pre, post = bgp_summary(peers=50_000), bgp_summary(peers=50_000, seed=1)
+    checks = [
+        ("extract", None, None),
+        ("parameter_match", "parameter_match", lambda check, value: check.evaluate({"state": "Idle"}, value, "match")),
+        ("regex", "regex", lambda check, value: check.evaluate("Estab.*", value, "no-match")),
+        (
+            "operator contains",
+            "operator",
+            lambda check, value: check.evaluate({"params": {"mode": "contains", "operator_data": "E"}}, value),
+        ),
+    ]
+    rows = []
+    for output in ("list", "mapping"):
+        value = extract_data_from_json(pre, PATH, output=output)
+        for name, check_type, evaluate in checks:
+            if check_type is None:
+                seconds = timed(lambda output=output: extract_data_from_json(pre, PATH, output=output))
+            else:
+                check = CheckType.create(check_type)
+                seconds = timed(lambda check=check, evaluate=evaluate, value=value: evaluate(check, value))
+            rows.append([name, output, f"{seconds * 1000:.1f}"])
+
+        post_value = extract_data_from_json(post, PATH, output=output)
+        exact_match = CheckType.create("exact_match")
+        seconds = timed(lambda value=value, post_value=post_value: exact_match.evaluate(value, post_value), repeat=1)
+        rows.append(["exact_match", output, f"{seconds * 1000:.1f}"])
+
+    report("Anchored extraction and evaluation, 50k peers", rows, ["step", "output", "ms"])
+
+
+if __name__ == "__main__":
+    main()
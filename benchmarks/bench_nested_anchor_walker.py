@@ -0,0 +1,57 @@
+"""Time of multi reference key extraction with and without the single traversal walker."""
+
+from jdiff import JdiffPath, extract_data_from_json, iter_anchored_records
+
+from .utility import report, timed
+
+CASES = [
+    "$*$.peers.$*$.*.ipv4.[accepted_prefixes,received_prefixes,sent_prefixes]",
+    "$*$.peers.$*$.[is_enabled,is_up]",
+]
+
+
+def bgp_neighbors(vrfs: int, peers: int) -> dict:
+    """Build a napalm 'get_bgp_neighbors' like document with the given number of VRFs and peers per VRF."""
+    return {
+        f"vrf{vrf}": {
+            "router_id": "10.0.0.1",
+            "peers": {
+                f"10.{vrf % 256}.{index // 256 % 256}.{index % 256}": {
+                    "is_enabled": True,
+                    "is_up": bool(index % 5),
+                    "remote_as": 65000 + index % 100,
+                    "address_family": {
+                        "ipv4": {"accepted_prefixes": index, "received_prefixes": index, "sent_prefixes": 3},
+                        "ipv6": {"accepted_prefixes": -1, "received_prefixes": -1, "sent_prefixes": -1},
+                    },
+                }
+                for index in range(peers)
+            },
+        }
+        for vrf in range(vrfs)
+    }
+
+
+def main():
+    """Run the benchmark."""
+    document = bgp_neighbors(vrfs=50, peers=1_000)
+    rows = []
+    for path in CASES:
+        walker_path = JdiffPath(path)
+        legacy_path = JdiffPath(path)
+        legacy_path.anchor_walker = None
+        if extract_data_from_json(document, walker_path) != extract_data_from_json(document, legacy_path):
+            raise ValueError(f"Walker and legacy results differ for {path}")
+
+        for mode, function in (
+            ("legacy", lambda: extract_data_from_json(document, legacy_path)),
+            ("walker", lambda: extract_data_from_json(document, walker_path)),
+            ("tuple keys", lambda: list(iter_anchored_records(document, walker_path))),
+        ):
+            rows.append([path, mode, f"{timed(function) * 1000:.1f}"])
+
+    report("Multi reference key extraction, 50 VRFs of 1k peers", rows, ["path", "mode", "ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Time of diff_generator on a large document, serial or with worker processes diffing its top-level subtrees."""
+
+import os
+
+from jdiff.evaluators import diff_generator
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 5_000
+
+
+def main():
+    """Run the benchmark."""
+    pre = interfaces(INTERFACES)
+    post = interfaces(INTERFACES, seed=1)
+    # Split the interfaces in top-level keys, as large documents hold several large tables.
+    pre = {f"table{index}": dict(list(pre["interfaces"].items())[index::8]) for index in range(8)}
+    post = {f"table{index}": dict(list(post["interfaces"].items())[index::8]) for index in range(8)}
+    rows = []
+    for engine in ("deepdiff", "native"):
+        for workers in (None, 2, 4):
+            seconds = timed(lambda engine=engine, workers=workers: diff_generator(pre, post, engine, workers=workers))
+            rows.append([engine, workers or "serial", f"{seconds * 1000:.0f}"])
+
+    report(
+        f"diff_generator of {INTERFACES} interfaces with changed counters on {os.cpu_count()} CPUs",
+        rows,
+        ["engine", "workers", "ms"],
+    )
+
+
+if __name__ == "__main__":
+    main()
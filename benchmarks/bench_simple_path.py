@@ -0,0 +1,59 @@
+"""Per path speedup of the SimplePath walker over the jmespath interpreter."""
+
+import jmespath
+
+from jdiff.utils.simple_path import compile_simple_path
+
+from .utility import bgp_summary, interfaces, report, timed
+
+CASES = [
+    ("bgp", "result[0].vrfs.default.routerId"),
+    ("bgp", "result[0].vrfs.default.peerList[*].state"),
+    ("bgp", "result[0].vrfs.default.peerList[*].[peerAddress,state,prefixesReceived]"),
+    ("bgp", "result[*].vrfs.*.peerList[*].prefixesReceived"),
+    ("interfaces", "interfaces.*.interfaceStatus"),
+    ("interfaces", "interfaces.*.interfaceCounters.[inOctets,outOctets]"),
+    ("interfaces", "interfaces.*.[name,mtu,bandwidth]"),
+]
+
+
+def main():
+    """Run the benchmark."""
+    documents = {"bgp": bgp_summary(peers=500), "interfaces": interfaces(500)}
+    rows = []
+    for name, expression in CASES:
+        document = documents[name]
+        parsed = jmespath.compile(expression)
+        walker = compile_simple_path(expression)
+        if walker.search(document) != parsed.search(document):
+            raise ValueError(f"SimplePath and jmespath results differ for {expression}")
+        calls = 2_000
+
+        def run_jmespath(document=document, parsed=parsed):
+            for _ in range(calls):
+                parsed.search(document)
+
+        def run_walker(document=document, walker=walker):
+            for _ in range(calls):
+                walker.search(document)
+
+        jmespath_seconds = timed(run_jmespath)
+        walker_seconds = timed(run_walker)
+        rows.append(
+            [
+                expression,
+                f"{jmespath_seconds * 1e6 / calls:.1f}",
+                f"{walker_seconds * 1e6 / calls:.1f}",
+                f"{jmespath_seconds / walker_seconds:.1f}x",
+            ]
+        )
+
+    report(
+        "SimplePath speedup, 500 peers or interfaces per document",
+        rows,
+        ["path", "jmespath us", "walker us", "speedup"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Time, bytes read and peak memory of diffing a persisted snapshot, loaded whole or through its digest index."""
+
+import json
+import os
+import tempfile
+import tracemalloc
+
+from jdiff import load_snapshot, save_snapshot
+from jdiff.evaluators import diff_generator
+
+from .bench_diff_engine import snapshots
+from .utility import report, timed
+
+
+def peak(function):
+    """Return the peak memory in MB allocated while calling 'function'."""
+    tracemalloc.start()
+    function()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size / 1024 / 1024
+
+
+def main():
+    """Run the benchmark."""
+    pre, posts = snapshots()
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "pre.json")
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            json.dump(pre, json_file)
+        snapshot_path = os.path.join(directory, "pre.snapshot")
+        save_seconds = timed(lambda: save_snapshot(pre, snapshot_path), repeat=1)
+        index_size = os.path.getsize(snapshot_path + ".index.json")
+
+        def full(post):
+            with open(json_path, encoding="utf-8") as json_file:
+                return diff_generator(json.load(json_file), post, engine="native")
+
+        def indexed(post):
+            return load_snapshot(snapshot_path).diff(post, engine="native")
+
+        rows = []
+        for name, post in posts:
+            if full(post) != indexed(post):
+                raise ValueError(f"Snapshot diff differs on {name}.")
+            snapshot = load_snapshot(snapshot_path)
+            snapshot.diff(post)
+            for method, function, read in (
+                ("json.load", full, os.path.getsize(json_path)),
+                ("digest index", indexed, index_size + snapshot.stats.size),
+            ):
+                seconds = timed(lambda function=function, post=post: function(post))
+                memory = peak(lambda function=function, post=post: function(post))
+                rows.append([name, method, f"{seconds * 1000:.1f}", f"{read / 1024 / 1024:.2f}", f"{memory:.1f}"])
+
+    report(
+        f"Diff of a persisted snapshot (saved in {save_seconds * 1000:.0f}ms, index {index_size / 1024 / 1024:.1f}MB)",
+        rows,
+        ["post", "pre loaded with", "ms", "read MB", "peak MB"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Time and peak memory of tolerance checks on counters that grew within tolerance, with one or per-path tolerances."""
+
+import copy
+import tracemalloc
+
+from jdiff import CheckType
+
+from .utility import interfaces, report, timed
+
+INTERFACES = 20_000
+
+
+def peak_memory(function):
+    """Return the peak memory in bytes allocated by a call to function."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """Run the benchmark."""
+    pre = interfaces(INTERFACES)
+    post = copy.deepcopy(pre)
+    for interface in post["interfaces"].values():
+        interface["interfaceCounters"]["inOctets"] = interface["interfaceCounters"]["inOctets"] * 1.01 + 1
+        interface["interfaceCounters"]["outOctets"] = interface["interfaceCounters"]["outOctets"] * 1.01 + 1
+        interface["interfaceStatistics"]["inBitsRate"] += 2
+    check = CheckType.create("tolerance")
+    rows = []
+    for name, tolerance in (
+        ("10%", 10),
+        ("per path", {"*.interfaceCounters.*": 10, "*.interfaceStatistics.*": {"absolute": 5}}),
+    ):
+        for engine in ("deepdiff", "native"):
+
+            def evaluate(engine=engine, tolerance=tolerance):
+                return check.evaluate(pre, post, tolerance, engine=engine)
+
+            seconds = timed(evaluate, repeat=1 if engine == "deepdiff" else 3)
+            peak = peak_memory(evaluate)
+            rows.append([name, engine, evaluate()[1], f"{seconds * 1000:.0f}", f"{peak / 1024 / 1024:.1f}"])
+
+    report(
+        f"tolerance of {INTERFACES} interfaces with 60000 changed values within tolerance",
+        rows,
+        ["tolerance", "engine", "passed", "ms", "peak MB"],
+    )
+
+
+if __name__ == "__main__":
+    main()
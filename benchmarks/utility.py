@@ -0,0 +1,78 @@
+"""Utility code for running benchmarks."""
+
+import time
+from typing import Callable, Dict, List
+
+
+def bgp_summary(peers: int, seed: int = 0) -> Dict:
+    """Build an Arista 'show ip bgp summary' like document with the given number of peers."""
+    return {
+        "jsonrpc": "2.0",
+        "id": "EapiExplorer-1",
+        "result": [
+            {
+                "vrfs": {
+                    "default": {
+                        "routerId": "10.0.0.1",
+                        "asn": "65000",
+                        "peerList": [
+                            {
+                                "peerAddress": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+                                "state": "Established" if (index + seed) % 7 else "Idle",
+                                "prefixesReceived": (index * 7 + seed) % 1000,
+                                "prefixesSent": (index * 3 + seed) % 1000,
+                                "peerGroup": "IPv4-UNDERLAY-SPINE" if index % 2 else "EVPN-OVERLAY-SPINE",
+                                "upDownTime": 1626247820.0720868 + index,
+                            }
+                            for index in range(peers)
+                        ],
+                    }
+                }
+            }
+        ],
+    }
+
+
+def interfaces(count: int, seed: int = 0) -> Dict:
+    """Build a 'show interfaces' like document with the given number of interfaces."""
+    return {
+        "interfaces": {
+            f"Ethernet{index}": {
+                "name": f"Ethernet{index}",
+                "interfaceStatus": "connected" if (index + seed) % 11 else "notconnect",
+                "mtu": 9214,
+                "bandwidth": 100000000000,
+                "interfaceCounters": {
+                    "inOctets": index * 1000 + seed,
+                    "outOctets": index * 2000 + seed,
+                    "inDiscards": 0,
+                    "outDiscards": seed % 3,
+                },
+                "interfaceStatistics": {
+                    "inBitsRate": 3403.4362520883615 + seed,
+                    "outBitsRate": 16249.69114419833,
+                    "updateInterval": 300,
+                },
+            }
+            for index in range(count)
+        }
+    }
+
+
+def timed(function: Callable, repeat: int = 3) -> float:
+    """Return the best wall clock time in seconds of 'repeat' calls to 'function'."""
+    timings = []  # type: List[float]
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(title: str, rows: List[List], headers: List[str]) -> None:
+    """Print benchmark rows as an aligned table."""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    print(f"\n{title}")
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
@@ -2,8 +2,36 @@
 
 from importlib import metadata
 
+from .baseline import BaselineComparator
 from .check_types import CheckType
-from .extract_data import extract_data_from_json
+from .columnar import ColumnarResult
+from .diff_result import DiffResult
+from .evaluators import set_diff_engine
+from .extract_data import (
+    extract_data_from_json,
+    extract_many,
+    extract_paths,
+    extract_stream,
+    iter_anchored_records,
+)
+from .path import JdiffPath, compile_path
+from .snapshot import SnapshotIndex, load_snapshot, save_snapshot
 
 __version__ = metadata.version(__name__)
-__all__ = ["CheckType", "extract_data_from_json"]
+__all__ = [
+    "BaselineComparator",
+    "CheckType",
+    "ColumnarResult",
+    "DiffResult",
+    "JdiffPath",
+    "SnapshotIndex",
+    "compile_path",
+    "extract_data_from_json",
+    "extract_many",
+    "extract_paths",
+    "extract_stream",
+    "iter_anchored_records",
+    "load_snapshot",
+    "save_snapshot",
+    "set_diff_engine",
+]
@@ -0,0 +1,313 @@
+"""Incremental diffs of polled documents against a retained baseline.
+
+The comparison of the baseline with the current document is split into subtrees: dicts and lists the engines walk
+key by key, or position by position, are split into their children until subtrees are no larger than a chunk size.
+The differences of each chunk are kept with the digest of its JSON text in the current document.
+
+A new poll, given as a whole document, only rediffs the chunks whose digest changed since the previous poll; given
+as JSON-patch style operations, only the chunks along the patched paths. Differences that persist from poll to
+poll, like counters that always differ from the baseline, are not computed again.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Hashable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .diff_result import DiffResult
+from .evaluators import diff_generator
+from .snapshot import CHUNK_SIZE
+from .utils.diff_engine import json_size
+from .utils.diff_helpers import group_diff_paths, merge_diff_paths, prefix_diff_paths, split_dicts, split_lists
+
+PATCH_OPERATIONS = ("add", "remove", "replace")
+
+# Key of the values added, removed or replaced by a patch, in the tree of the keys it touched.
+_PATCHED = object()
+
+Keys = Tuple[Hashable, ...]
+
+
+class RefreshStats(NamedTuple):
+    """Chunks diffed again, and chunks whose differences were kept, by the last update or apply_patch."""
+
+    rediffed: int
+    reused: int
+
+
+class _Node:
+    """Subtree of the comparison between the baseline and the current document.
+
+    A "chunk" node holds the differences of its whole subtree. A "dict" or "list" node holds the keys, or items,
+    added and removed at its level, and a node for each key, or index, common to the baseline and the document.
+    """
+
+    __slots__ = ("kind", "digest", "diff_paths", "children")
+
+    def __init__(
+        self, kind: str, diff_paths: Dict, children: Optional[Dict[Hashable, "_Node"]] = None, digest: Any = None
+    ) -> None:
+        """__init__ method for _Node class."""
+        self.kind = kind
+        self.diff_paths = diff_paths
+        self.children = children or {}
+        self.digest = digest
+
+
+def _digest(value: Any) -> Optional[str]:
+    """Return the digest of the JSON text of a value, or None if it is not JSON-serializable."""
+    try:
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BaselineComparator:
+    """Differences of polled documents against a retained baseline, recomputed only where the documents changed.
+
+    Attributes:
+        baseline: reference document.
+        document: current document, the baseline until the first update.
+        engine: diff engine, "deepdiff" or "native", see `diff_generator`.
+        chunk_size: largest JSON text, in characters, of the baseline subtrees diffed as a whole.
+        stats: chunks diffed again and chunks kept by the last update or apply_patch.
+
+    Example:
+        >>> baseline = {"interfaces": {f"Ethernet{index}": {"mtu": 1500, "counter": index} for index in range(3)}}
+        >>> comparator = BaselineComparator(baseline, chunk_size=40)
+        >>> comparator.apply_patch([{"op": "replace", "path": "/interfaces/Ethernet1/mtu", "value": 9214}])
+        {'interfaces': {'Ethernet1': {'mtu': {'new_value': 9214, 'old_value': 1500}}}}
+        >>> comparator.stats
+        RefreshStats(rediffed=1, reused=0)
+    """
+
+    def __init__(self, baseline: Any, engine: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> None:
+        """__init__ method for BaselineComparator class."""
+        if chunk_size < 1:
+            raise ValueError(f"'chunk_size' must be a positive integer. You have: {chunk_size}.")
+        self.baseline = baseline
+        self.document = baseline
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.stats = RefreshStats(0, 0)
+        self._counters = [0, 0]
+        self._root = self._build(baseline, baseline, ())
+
+    def update(self, document: Any, lazy: bool = False) -> Union[Dict, DiffResult]:
+        """Compare a new document to the baseline, diffing again only the chunks whose digest changed.
+
+        Args:
+            document: new poll of the document.
+            lazy: return a DiffResult instead of the nested dict, see `diff_generator`.
+
+        Returns:
+            The differences between the baseline and document, like diff_generator(baseline, document).
+        """
+        self._counters = [0, 0]
+        self._root = self._refresh(self._root, self.baseline, document, ())
+        self.document = document
+        self.stats = RefreshStats(*self._counters)
+        return self.differences(lazy=lazy)
+
+    def apply_patch(self, operations: Sequence[Mapping], lazy: bool = False) -> Union[Dict, DiffResult]:
+        """Apply JSON-patch style operations to the current document and diff again the chunks they touch.
+
+        The current document is not modified: containers along the patched paths are copied. Operations apply in
+        order, and none applies if one fails.
+
+        Args:
+            operations: {"op": "add", "remove" or "replace", "path": JSON pointer, "value": new value} dicts, such as
+                {"op": "replace", "path": "/interfaces/Ethernet1/mtu", "value": 9214}. "-" adds to the end of a list.
+            lazy: return a DiffResult instead of the nested dict, see `diff_generator`.
+
+        Returns:
+            The differences between the baseline and the patched document.
+
+        Raises:
+            ValueError: an operation is not supported, or its path does not exist in the document.
+        """
+        # Operations are all applied before refreshing any node, a failing patch leaves the comparator unchanged.
+        document = self.document
+        copies: Dict[int, Any] = {}
+        touched: Dict[Hashable, Any] = {}
+        for operation in operations:
+            op = operation.get("op")
+            if op not in PATCH_OPERATIONS:
+                raise ValueError(f"'op' should be one of the following: {', '.join(PATCH_OPERATIONS)}. You have: {op}")
+            pointer = operation.get("path", "")
+            tokens = [token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]]
+            keys: List[Hashable] = []
+            if tokens:
+                try:
+                    document = _patched(document, tokens, op, operation.get("value"), keys, copies)
+                except (KeyError, IndexError, TypeError, ValueError) as error:
+                    raise ValueError(
+                        f"Path {pointer} of the '{op}' operation doesn't exist in the document."
+                    ) from error
+            elif op == "remove":
+                raise ValueError("The whole document can't be removed.")
+            else:
+                document = operation["value"]
+            level = touched
+            for key in keys:
+                level = level.setdefault(key, {})
+            level[_PATCHED] = True
+
+        self._counters = [0, 0]
+        self._root = self._refresh_patched(self._root, self.baseline, document, (), touched)
+        self.document = document
+        self.stats = RefreshStats(*self._counters)
+        return self.differences(lazy=lazy)
+
+    def differences(self, lazy: bool = False) -> Union[Dict, DiffResult]:
+        """Return the differences between the baseline and the current document, like diff_generator."""
+        diff_paths: Dict[str, Any] = {}
+        # Engines report the keys added to or removed from a dict before the differences of its common keys, and
+        # the items added to or removed from the end of a list after the differences of its common positions.
+        stack: List[Union[_Node, Dict]] = [self._root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, _Node):
+                children = list(reversed(item.children.values()))
+                stack.extend([item.diff_paths, *children] if item.kind == "list" else [*children, item.diff_paths])
+                continue
+            merge_diff_paths(diff_paths, item)
+        if lazy:
+            return DiffResult(diff_paths)
+        return group_diff_paths(diff_paths)
+
+    def _build(self, pre: Any, post: Any, path: Keys) -> _Node:
+        """Return the node comparing pre and post, found at path, diffing its chunks."""
+        if json_size(pre, self.chunk_size) > self.chunk_size:
+            if type(pre) is dict and type(post) is dict:
+                node = self._split_dict(pre, post, path)
+                if node is not None:
+                    node.children = {key: self._build(pre[key], post[key], path + (key,)) for key in node.children}
+                    return node
+            elif type(pre) is list and type(post) is list:
+                node = self._split_list(pre, post, path)
+                if node is not None:
+                    node.children = {
+                        index: self._build(pre[index], post[index], path + (index,)) for index in node.children
+                    }
+                    return node
+
+        self._counters[0] += 1
+        diff_paths = diff_generator(pre, post, engine=self.engine, lazy=True).diff_paths
+        return _Node("chunk", prefix_diff_paths(diff_paths, path), digest=_digest(post))
+
+    def _refresh(self, node: _Node, pre: Any, post: Any, path: Keys) -> _Node:
+        """Return node updated for a new post, keeping the chunks whose digest did not change."""
+        if node.kind == "chunk":
+            digest = _digest(post)
+            if digest is not None and digest == node.digest:
+                self._counters[1] += 1
+                return node
+            return self._build(pre, post, path)
+
+        if node.kind == "dict":
+            new_node = self._split_dict(pre, post, path) if type(post) is dict else None
+        else:
+            new_node = self._split_list(pre, post, path) if type(post) is list else None
+        if new_node is None:
+            return self._build(pre, post, path)
+        new_node.children = {
+            key: self._refresh(node.children[key], pre[key], post[key], path + (key,))
+            if key in node.children
+            else self._build(pre[key], post[key], path + (key,))
+            for key in new_node.children
+        }
+        return new_node
+
+    def _refresh_patched(self, node: _Node, pre: Any, post: Any, path: Keys, touched: Dict) -> _Node:
+        """Return node updated for a patched post, refreshing only the nodes along the touched keys.
+
+        touched maps the keys patched under node to the keys patched under them, and to True under _PATCHED for the
+        values added, removed or replaced.
+        """
+        if node.kind == "chunk" or _PATCHED in touched:
+            return self._refresh(node, pre, post, path)
+
+        patched = [key for key, keys in touched.items() if _PATCHED in keys]
+        if node.kind == "list":
+            if type(post) is not list:
+                return self._build(pre, post, path)
+            if patched:
+                # Items were added or removed, shifting the positions of the next ones.
+                return self._refresh(node, pre, post, path)
+            for index, keys in touched.items():
+                if index in node.children:
+                    node.children[index] = self._refresh_patched(
+                        node.children[index], pre[index], post[index], path + (index,), keys
+                    )
+                else:
+                    # An item added to the baseline changed, it is reported with its value.
+                    node.diff_paths = split_lists(pre, post, path)[0]  # type: ignore[index]
+            return node
+
+        if type(post) is not dict:
+            return self._build(pre, post, path)
+        if patched:
+            new_node = self._split_dict(pre, post, path)
+            if new_node is None:
+                return self._build(pre, post, path)
+        else:
+            new_node = node
+        # Only common keys have a node: keys added to the baseline are reported by path, whatever their content.
+        for key in new_node.children:
+            if key not in node.children or key in patched:
+                new_node.children[key] = self._build(pre[key], post[key], path + (key,))
+            elif key in touched:
+                new_node.children[key] = self._refresh_patched(
+                    node.children[key], pre[key], post[key], path + (key,), touched[key]
+                )
+            else:
+                new_node.children[key] = node.children[key]
+        return new_node
+
+    @staticmethod
+    def _split_dict(pre: Dict, post: Dict, path: Keys) -> Optional[_Node]:
+        """Return the node of two dicts walked key by key, with a child for each common key, or None."""
+        split = split_dicts(pre, post, path)
+        return None if split is None else _Node("dict", split[0], dict.fromkeys(split[1]))
+
+    @staticmethod
+    def _split_list(pre: List, post: List, path: Keys) -> Optional[_Node]:
+        """Return the node of two lists compared position by position, with a child for each position, or None."""
+        split = split_lists(pre, post, path)
+        return None if split is None else _Node("list", split[0], dict.fromkeys(split[1]))
+
+
+def _patched(  # pylint: disable=too-many-arguments
+    value: Any, tokens: List[str], op: str, new_value: Any, keys: List[Hashable], copies: Dict[int, Any]
+) -> Any:
+    """Return value with the operation applied at the path of tokens, appending the path keys to keys.
+
+    Containers along the path are copied, unless they are copies made by a previous operation of the patch, kept in
+    copies by id.
+    """
+    token, rest = tokens[0], tokens[1:]
+    if isinstance(value, dict):
+        if (rest or op != "add") and token not in value:
+            raise KeyError(token)
+        key: Hashable = token
+    elif isinstance(value, list):
+        append = token == "-" and op == "add" and not rest  # noqa: S105
+        key = len(value) if append else int(token)
+        if not 0 <= key < len(value) + (op == "add" and not rest):
+            raise IndexError(token)
+    else:
+        raise TypeError(f"Values of type {type(value)} can't be patched.")
+    keys.append(key)
+
+    copy = value if id(value) in copies else value.copy()
+    copies[id(copy)] = copy
+    if rest:
+        copy[key] = _patched(value[key], rest, op, new_value, keys, copies)
+    elif op == "remove":
+        del copy[key]
+    elif op == "add" and isinstance(copy, list):
+        copy.insert(key, new_value)
+    else:
+        copy[key] = new_value
+    return copy
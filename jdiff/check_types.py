@@ -1,9 +1,20 @@
 """CheckType Implementation."""
 
+import fnmatch
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple, Union
+from functools import partial
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Pattern, Tuple, Union
 
-from .evaluators import diff_generator, operator_evaluator, parameter_evaluator, regex_evaluator
+from .diff_result import DiffResult
+from .evaluators import diff_generator, has_diff, operator_evaluator, parameter_evaluator, regex_evaluator
+from .utils.diff_engine import ListKey
+
+# Kinds of tolerance of a path pattern, see ToleranceType.evaluate.
+TOLERANCE_KINDS = ("percent", "absolute")
+
+# (compiled path pattern or None for any path, "percent" or "absolute", amount)
+ToleranceRule = Tuple[Optional[Pattern], str, float]
 
 
 # pylint: disable=arguments-differ
@@ -56,6 +67,11 @@ class CheckType(ABC):
         """Result method implementation. Will return diff data and bool for checking failed result."""
         return evaluation_result, not evaluation_result
 
+    @staticmethod
+    def fail_fast_result(passed: bool) -> Tuple[Dict, bool]:
+        """Result of a fail-fast evaluation, which stops at the first violation: only the boolean, without data."""
+        return {}, passed
+
 
 class ExactMatchType(CheckType):
     """Exact Match class docstring."""
@@ -65,9 +81,50 @@ class ExactMatchType(CheckType):
         # No need for _validate method as exact-match does not take any specific arguments.
         pass
 
-    def evaluate(self, reference_data: Any, value_to_compare: Any) -> Tuple[Dict, bool]:  # type: ignore
-        """Returns the difference between values and the boolean."""
-        evaluation_result = diff_generator(reference_data, value_to_compare)
+    def evaluate(  # type: ignore[override]  # pylint: disable=too-many-arguments
+        self,
+        reference_data: Any,
+        value_to_compare: Any,
+        engine: Optional[str] = None,
+        list_key: Optional[ListKey] = None,
+        ignore_order: bool = False,
+        fail_fast: bool = False,
+        max_diffs: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        lazy: bool = False,
+        workers: Optional[int] = None,
+    ) -> Tuple[Union[Dict, DiffResult], bool]:
+        """Returns the difference between values and the boolean.
+
+        Args:
+            reference_data: dataset to compare.
+            value_to_compare: dataset to compare.
+            engine: diff engine, "deepdiff" or "native", see `diff_generator`. Only the native engine skips the
+                equal subtrees of data that differs.
+            list_key: field, or fields, aligning lists by identity, see `diff_generator`.
+            ignore_order: compare lists as multisets of their items, see `diff_generator`.
+            fail_fast: stop at the first difference and return an empty dict with the boolean, see `has_diff`.
+            max_diffs: largest number of differences reported, the others are counted, see `diff_generator`.
+            max_bytes: largest size of the differences reported, see `diff_generator`.
+            lazy: return the differences as a DiffResult, building the nested dict only when asked.
+            workers: number of processes diffing large data in parallel, see `diff_generator`.
+        """
+        if fail_fast:
+            changed = has_diff(
+                reference_data, value_to_compare, engine=engine, list_key=list_key, ignore_order=ignore_order
+            )
+            return self.fail_fast_result(not changed)
+        evaluation_result = diff_generator(
+            reference_data,
+            value_to_compare,
+            engine=engine,
+            list_key=list_key,
+            ignore_order=ignore_order,
+            max_diffs=max_diffs,
+            max_bytes=max_bytes,
+            lazy=lazy,
+            workers=workers,
+        )
         return self.result(evaluation_result)
 
 
@@ -80,43 +137,131 @@ class ToleranceType(CheckType):
         # reference_data = getattr(kwargs, "reference_data")
         if not tolerance:
             raise ValueError("'tolerance' argument is mandatory for Tolerance Check Type.")
+        if isinstance(tolerance, Mapping):
+            for pattern, pattern_tolerance in tolerance.items():
+                if not isinstance(pattern, str):
+                    raise ValueError(f"Tolerance path patterns must be strings. You have: {type(pattern)}.")
+                _tolerance_amount(pattern, pattern_tolerance)
+            return
         if not isinstance(tolerance, (int, float)):
             raise ValueError(f"Tolerance argument's value must be a number. You have: {type(tolerance)}.")
         if tolerance < 0:
             raise ValueError(f"Tolerance value must be greater than 0. You have: {tolerance}.")
 
-    def evaluate(self, reference_data: Any, value_to_compare: Any, tolerance: int) -> Tuple[Dict, bool]:  # type: ignore[override]
-        """Returns the difference between values and the boolean. Overwrites method in base class."""
+    def evaluate(  # type: ignore[override]  # pylint: disable=too-many-arguments
+        self,
+        reference_data: Any,
+        value_to_compare: Any,
+        tolerance: Union[int, float, Mapping[str, Any]],
+        engine: Optional[str] = None,
+        list_key: Optional[ListKey] = None,
+        ignore_order: bool = False,
+        fail_fast: bool = False,
+        max_diffs: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        lazy: bool = False,
+    ) -> Tuple[Union[Dict, DiffResult], bool]:
+        """Returns the difference between values and the boolean. Overwrites method in base class.
+
+        Changed values within tolerance are left out as they are found by the native engine, and afterwards from
+        the differences found by DeepDiff.
+
+        Args:
+            reference_data: dataset to compare.
+            value_to_compare: dataset to compare.
+            tolerance: accepted percentage of change of numeric values, or a mapping of path patterns to
+                tolerances, to check values with different thresholds in one pass. Patterns are matched with
+                fnmatch against the keys and indexes of the path of a changed value joined with dots, such as
+                "Ethernet1.counters.inOctets", the first matching pattern applies, and changes to values matching
+                no pattern are reported. Tolerances are a percentage, {"percent": number} or {"absolute": number}.
+            engine: diff engine, "deepdiff" or "native", see `diff_generator`.
+            list_key: field, or fields, aligning lists by identity, see `diff_generator`.
+            ignore_order: compare lists as multisets of their items, see `diff_generator`.
+            fail_fast: stop at the first difference out of tolerance and return an empty dict with the boolean.
+            max_diffs: largest number of differences beyond tolerance reported, see `diff_generator`.
+            max_bytes: largest size of the differences beyond tolerance reported, see `diff_generator`.
+            lazy: return the differences beyond tolerance as a DiffResult, building the nested dict only when asked.
+        """
         self._validate(tolerance=tolerance)
-        evaluation_result = diff_generator(reference_data, value_to_compare)
-        self._remove_within_tolerance(evaluation_result, tolerance)
+        accept = partial(_within_tolerance, rules=_tolerance_rules(tolerance))
+        if fail_fast:
+            changed = has_diff(
+                reference_data,
+                value_to_compare,
+                engine=engine,
+                list_key=list_key,
+                ignore_order=ignore_order,
+                accept=accept,
+            )
+            return self.fail_fast_result(not changed)
+        evaluation_result = diff_generator(
+            reference_data,
+            value_to_compare,
+            engine=engine,
+            list_key=list_key,
+            ignore_order=ignore_order,
+            max_diffs=max_diffs,
+            max_bytes=max_bytes,
+            lazy=lazy,
+            accept=accept,
+        )
         return self.result(evaluation_result)
 
-    def _remove_within_tolerance(self, diff: Dict, tolerance: Union[int, float]) -> None:
-        """Recursively look into diff and apply tolerance check, remove reported difference when within tolerance."""
 
-        def _make_float(value: Any) -> float:
-            """Make float, treat non-convertable as 0."""
+def _tolerance_amount(pattern: str, tolerance: Any) -> Tuple[str, float]:
+    """Return the kind and amount of the tolerance of a path pattern, raising a ValueError when it is invalid."""
+    kind, amount = "percent", tolerance
+    if isinstance(tolerance, Mapping) and len(tolerance) == 1:
+        kind, amount = next(iter(tolerance.items()))
+    if kind not in TOLERANCE_KINDS or isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise ValueError(
+            f"Tolerance of '{pattern}' must be a number, or a dict with a 'percent' or 'absolute' number. "
+            f"You have: {tolerance}."
+        )
+    if amount < 0:
+        raise ValueError(f"Tolerance value must be greater than 0. You have: {amount}.")
+    return kind, amount
+
+
+def _tolerance_rules(tolerance: Union[int, float, Mapping[str, Any]]) -> List[ToleranceRule]:
+    """Return the rules of a validated tolerance, compiling its path patterns."""
+    if not isinstance(tolerance, Mapping):
+        return [(None, "percent", tolerance)]
+    return [
+        (re.compile(fnmatch.translate(pattern)), *_tolerance_amount(pattern, pattern_tolerance))
+        for pattern, pattern_tolerance in tolerance.items()
+    ]
+
+
+def _make_float(value: Any) -> float:
+    """Make float, treat non-convertable as 0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _within_tolerance(
+    path: Tuple[Hashable, ...], old_value: Any, new_value: Any, *, rules: List[ToleranceRule]
+) -> bool:
+    """Return True if new value is within the tolerance of the first rule matching path, of the previous value."""
+    rendered_path = None
+    for pattern, kind, amount in rules:
+        if pattern is not None:
+            if rendered_path is None:
+                rendered_path = ".".join(str(key) for key in path)
+            if not pattern.match(rendered_path):
+                continue
+        if kind == "absolute":
             try:
-                return float(value)
-            except ValueError:
-                return 0
-
-        def _within_tolerance(*, old_value: Union[str, int, float], new_value: Union[str, int, float]) -> bool:
-            """Return True if new value is within the tolerance range of the previous value."""
-            tolerance_factor = tolerance / 100
-            old_value, new_value = _make_float(old_value), _make_float(new_value)
-            max_diff = old_value * tolerance_factor
-            return (old_value - max_diff) < new_value < (old_value + max_diff)
-
-        for key, value in list(diff.items()):  # casting list makes copy, so we don't modify object being iterated.
-            if isinstance(value, dict):
-                if "new_value" in value.keys() and "old_value" in value.keys() and _within_tolerance(**value):
-                    diff.pop(key)
-                else:
-                    self._remove_within_tolerance(diff[key], tolerance)
-                if not value:
-                    diff.pop(key)
+                old_value, new_value = float(old_value), float(new_value)
+            except (TypeError, ValueError):
+                return False
+            return (old_value - amount) < new_value < (old_value + amount)
+        old_value, new_value = _make_float(old_value), _make_float(new_value)
+        max_diff = old_value * amount / 100
+        return (old_value - max_diff) < new_value < (old_value + max_diff)
+    return False
 
 
 class ParameterMatchType(CheckType):
@@ -138,11 +283,18 @@ class ParameterMatchType(CheckType):
                 f"'mode' argument should be one of the following: {', '.join(mode_options)}. You have: {mode}"
             )
 
-    def evaluate(self, params: Dict, value_to_compare: List[Dict], mode: str) -> Tuple[Dict, bool]:  # type: ignore[override]
-        """Parameter Match evaluator implementation."""
+    def evaluate(  # type: ignore[override]
+        self, params: Dict, value_to_compare: List[Dict], mode: str, fail_fast: bool = False
+    ) -> Tuple[Dict, bool]:
+        """Parameter Match evaluator implementation.
+
+        With fail_fast, stop at the first item not matching and return an empty dict with the boolean.
+        """
         self._validate(params=params, mode=mode)
         # TODO: we don't use the mode?
-        evaluation_result = parameter_evaluator(value_to_compare, params, mode)
+        evaluation_result = parameter_evaluator(value_to_compare, params, mode, fail_fast=fail_fast)
+        if fail_fast:
+            return self.fail_fast_result(not evaluation_result)
         return self.result(evaluation_result)
 
 
@@ -163,10 +315,17 @@ class RegexType(CheckType):
         if mode not in mode_options:
             raise ValueError(f"'mode' argument should be {mode_options}. You have: {mode}")
 
-    def evaluate(self, regex: str, value_to_compare: List[Dict[Any, Dict]], mode: str) -> Tuple[Dict, bool]:  # type: ignore[override]
-        """Regex Match evaluator implementation."""
+    def evaluate(  # type: ignore[override]
+        self, regex: str, value_to_compare: List[Dict[Any, Dict]], mode: str, fail_fast: bool = False
+    ) -> Tuple[Dict, bool]:
+        """Regex Match evaluator implementation.
+
+        With fail_fast, stop at the first item not matching and return an empty dict with the boolean.
+        """
         self._validate(regex=regex, mode=mode)
-        evaluation_result = regex_evaluator(value_to_compare, regex, mode)
+        evaluation_result = regex_evaluator(value_to_compare, regex, mode, fail_fast=fail_fast)
+        if fail_fast:
+            return self.fail_fast_result(not evaluation_result)
         return self.result(evaluation_result)
 
 
@@ -255,12 +414,17 @@ class OperatorType(CheckType):
                     f"You have: {params_value} of type {type(params_value)}."
                 )
 
-    def evaluate(self, params: Any, value_to_compare: Any) -> Tuple[Dict, bool]:  # type: ignore[override]
-        """Operator evaluator implementation."""
+    def evaluate(self, params: Any, value_to_compare: Any, fail_fast: bool = False) -> Tuple[Dict, bool]:  # type: ignore[override]
+        """Operator evaluator implementation.
+
+        With fail_fast, stop at the first failing item and return an empty dict with the boolean.
+        """
         self._validate(params)
         # For name consistency.
         reference_data = params
-        evaluation_result = operator_evaluator(reference_data["params"], value_to_compare)
+        evaluation_result = operator_evaluator(reference_data["params"], value_to_compare, fail_fast=fail_fast)
+        if fail_fast:
+            return self.fail_fast_result(evaluation_result[1])
         return self.result(evaluation_result)
 
     def result(self, evaluation_result):
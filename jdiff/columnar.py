@@ -0,0 +1,181 @@
+"""Columnar extraction result."""
+
+from array import array
+from typing import Any, Dict, Hashable, ItemsView, Iterator, List, Mapping, Optional, Tuple, Union, ValuesView
+
+Column = Union[array, List]
+
+# array typecode used for the columns holding only Python ints, or only Python floats.
+INT_TYPECODE = "q"
+FLOAT_TYPECODE = "d"
+
+
+class ColumnarResult(Mapping):
+    """Anchored extraction result stored as one list of reference keys plus one column per extracted field.
+
+    Columns holding only integers or only floats are `array.array` of 8-byte machine values, other columns are
+    plain lists. The result is also a read-only mapping {reference key: {field: value}}, equal to the mapping
+    output of `extract_data_from_json`, so every check type accepts it.
+
+    Attributes:
+        reference_keys: reference keys, in data order.
+        columns: column of each extracted field, in the order of reference_keys.
+        missing: fields absent from the record at each position of reference_keys, for the records not holding
+            every field. Their columns hold None at that position, records leave them out.
+
+    Example:
+        >>> result = ColumnarResult.from_mapping({"10.1.0.0": {"prefixesReceived": 50}, "10.2.0.0": {"prefixesReceived": 75}})
+        >>> result.columns["prefixesReceived"]
+        array('q', [50, 75])
+        >>> result["10.2.0.0"]
+        {'prefixesReceived': 75}
+    """
+
+    def __init__(
+        self,
+        reference_keys: List[Hashable],
+        columns: Dict[str, Column],
+        missing: Optional[Dict[int, Tuple[str, ...]]] = None,
+    ) -> None:
+        """__init__ method for ColumnarResult class."""
+        for field, column in columns.items():
+            if len(column) != len(reference_keys):
+                raise ValueError(f"Column {field!r} has {len(column)} values for {len(reference_keys)} reference keys.")
+        self.reference_keys = reference_keys
+        self.columns = columns
+        self.missing = missing or {}
+        self._index: Optional[Dict[Hashable, int]] = None
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping) -> "ColumnarResult":
+        """Build the columns of a {reference key: {field: value}} mapping.
+
+        Fields are taken in order of first appearance. A field missing from a record is None in its column and
+        kept in `missing`, so the result still reads back as the mapping.
+        """
+        keys = list(mapping)
+        fields: Dict[str, None] = {}
+        for record in mapping.values():
+            if not isinstance(record, Mapping):
+                raise TypeError(f"Values must be mappings of field to value. You have {type(record)}: {record}.")
+            if len(record) != len(fields) or record.keys() != fields.keys():
+                fields.update(dict.fromkeys(record))
+        records = mapping.values()
+        # Fields of a record are a subset of all fields, it lacks some of them only when it holds fewer.
+        missing = {
+            position: tuple(field for field in fields if field not in record)
+            for position, record in enumerate(records)
+            if len(record) != len(fields)
+        }
+        columns = {field: [record.get(field) for record in records] for field in fields}
+        return cls.from_columns(keys, columns, missing)
+
+    @classmethod
+    def from_columns(
+        cls,
+        reference_keys: List[Hashable],
+        columns: Mapping[str, List],
+        missing: Optional[Dict[int, Tuple[str, ...]]] = None,
+    ) -> "ColumnarResult":
+        """Build a result from lists of values, packing the numeric ones into arrays."""
+        return cls(reference_keys, {field: _column(values) for field, values in columns.items()}, missing)
+
+    def column(self, field: str) -> Column:
+        """Return the values of a field, in the order of reference_keys."""
+        return self.columns[field]
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Return the columns as NumPy arrays, sharing the memory of `array.array` columns.
+
+        Raises:
+            ImportError: NumPy is not installed.
+        """
+        try:
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError("NumPy must be installed to convert columns to NumPy arrays.") from error
+
+        dtypes = {INT_TYPECODE: numpy.int64, FLOAT_TYPECODE: numpy.float64}
+        return {
+            field: numpy.frombuffer(column, dtype=dtypes[column.typecode])
+            if isinstance(column, array)
+            else numpy.array(column, dtype=object)
+            for field, column in self.columns.items()
+        }
+
+    def items(self) -> ItemsView:
+        """Return a view of (reference key, {field: value}) pairs, reading the columns row by row."""
+        return _ColumnarItemsView(self)
+
+    def values(self) -> ValuesView:
+        """Return a view of the {field: value} records, reading the columns row by row."""
+        return _ColumnarValuesView(self)
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        """Yield the {field: value} record of each reference key, in data order."""
+        fields = list(self.columns)
+        if not fields:
+            return ({} for _ in self.reference_keys)
+        records = (dict(zip(fields, row)) for row in zip(*self.columns.values()))
+        if not self.missing:
+            return records
+        return (self._drop_missing(position, record) for position, record in enumerate(records))
+
+    def _drop_missing(self, position: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Remove from record the fields missing at position of reference_keys."""
+        for field in self.missing.get(position, ()):
+            del record[field]
+        return record
+
+    def __getitem__(self, key: Hashable) -> Dict[str, Any]:
+        """Return {field: value} of a reference key."""
+        if self._index is None:
+            self._index = {reference_key: position for position, reference_key in enumerate(self.reference_keys)}
+        position = self._index[key]
+        return self._drop_missing(position, {field: column[position] for field, column in self.columns.items()})
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over reference keys, in data order."""
+        return iter(self.reference_keys)
+
+    def __len__(self) -> int:
+        """Return the number of reference keys."""
+        return len(self.reference_keys)
+
+    def __repr__(self) -> str:
+        """Return the representation of the result."""
+        missing = f", missing={self.missing!r}" if self.missing else ""
+        return f"{self.__class__.__name__}(reference_keys={self.reference_keys!r}, columns={self.columns!r}{missing})"
+
+
+class _ColumnarItemsView(ItemsView):
+    """Items view of a ColumnarResult, iterating over the columns without looking up each reference key."""
+
+    _mapping: ColumnarResult
+
+    def __iter__(self) -> Iterator:
+        """Yield (reference key, {field: value}) pairs."""
+        return zip(self._mapping.reference_keys, self._mapping._records())
+
+
+class _ColumnarValuesView(ValuesView):
+    """Values view of a ColumnarResult, iterating over the columns without looking up each reference key."""
+
+    _mapping: ColumnarResult
+
+    def __iter__(self) -> Iterator:
+        """Yield {field: value} records."""
+        return self._mapping._records()
+
+
+def _column(values: List) -> Column:
+    """Pack values into an array when they are all ints, or all floats, keep them as a list otherwise."""
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        try:
+            return array(INT_TYPECODE, values)
+        except OverflowError:
+            return values
+    if kinds == {float}:
+        return array(FLOAT_TYPECODE, values)
+    return values
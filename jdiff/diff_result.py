@@ -0,0 +1,117 @@
+"""Lazy diff result."""
+
+from typing import Any, Dict, Hashable, Iterator, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .utils.diff_engine import (
+    DICTIONARY_ITEM_ADDED,
+    DICTIONARY_ITEM_REMOVED,
+    ITERABLE_ITEM_ADDED,
+    ITERABLE_ITEM_REMOVED,
+    TRUNCATED,
+    VALUES_CHANGED,
+)
+from .utils.diff_helpers import group_diff_paths
+
+# (report type, kind of difference, True if the report holds values), in the order of the nested output.
+_REPORTS = (
+    (VALUES_CHANGED, "changed", True),
+    (DICTIONARY_ITEM_REMOVED, "missing", False),
+    (DICTIONARY_ITEM_ADDED, "new", False),
+    (ITERABLE_ITEM_REMOVED, "missing", True),
+    (ITERABLE_ITEM_ADDED, "new", True),
+)
+
+
+class Difference(NamedTuple):
+    """Difference between pre and post data.
+
+    Attributes:
+        kind: "changed", "missing" or "new".
+        path: keys and indexes leading to the difference.
+        value: {"new_value": ..., "old_value": ...} of a changed value, the item of a list missing or new, or None
+            for a key missing or new.
+    """
+
+    kind: str
+    path: Tuple[Hashable, ...]
+    value: Any
+
+
+class DiffResult:
+    """Differences between pre and post data, kept flat, with the nested output of diff_generator built on demand.
+
+    Checking whether there are differences, counting them or iterating over the ones under a path does not build
+    the nested output. `to_dict` builds it on first call, and a DiffResult compares equal to it.
+
+    Attributes:
+        diff_paths: differences keyed by tuples of keys and indexes, like json_diff(t1, t2, view="paths").
+
+    Example:
+        >>> from jdiff.evaluators import diff_generator
+        >>> result = diff_generator({"Ethernet1": {"mtu": 1500}, "Ethernet2": {"mtu": 1500}}, {"Ethernet1": {"mtu": 9214}}, lazy=True)
+        >>> bool(result), len(result)
+        (True, 2)
+        >>> list(result.iter_prefix(("Ethernet1",)))
+        [Difference(kind='changed', path=('Ethernet1', 'mtu'), value={'new_value': 9214, 'old_value': 1500})]
+        >>> result.to_dict()
+        {'Ethernet1': {'mtu': {'new_value': 9214, 'old_value': 1500}}, 'Ethernet2': 'missing'}
+    """
+
+    def __init__(self, diff_paths: Mapping) -> None:
+        """__init__ method for DiffResult class."""
+        self.diff_paths = diff_paths
+        self._nested: Optional[Dict] = None
+
+    @property
+    def truncated(self) -> Dict[Tuple[Hashable, ...], int]:
+        """Count of the differences left out of a result bounded by max_diffs or max_bytes, by top-level path."""
+        return dict(self.diff_paths.get(TRUNCATED, {}))
+
+    def iter_prefix(self, prefix: Sequence[Hashable]) -> Iterator[Difference]:
+        """Yield the differences whose path starts with prefix, keys and indexes included."""
+        prefix = tuple(prefix)
+        length = len(prefix)
+        for report_type, kind, with_values in _REPORTS:
+            report = self.diff_paths.get(report_type)
+            if not report:
+                continue
+            if with_values:
+                for path, value in report.items():
+                    if path[:length] == prefix:
+                        yield Difference(kind, path, value)
+            else:
+                for path in report:
+                    if path[:length] == prefix:
+                        yield Difference(kind, path, None)
+
+    def to_dict(self) -> Dict:
+        """Return the nested output of diff_generator, built on first call."""
+        if self._nested is None:
+            self._nested = group_diff_paths(self.diff_paths)
+        return self._nested
+
+    def __iter__(self) -> Iterator[Difference]:
+        """Iterate over all the differences."""
+        return self.iter_prefix(())
+
+    def __len__(self) -> int:
+        """Return the number of differences, not counting the differences left out of a bounded result."""
+        return sum(len(self.diff_paths.get(report_type, ())) for report_type, _, _ in _REPORTS)
+
+    def __bool__(self) -> bool:
+        """Return True if there are differences, including differences left out of a bounded result."""
+        return any(self.diff_paths.values())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the nested output with a dict, or with the nested output of another DiffResult."""
+        if isinstance(other, DiffResult):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation of the result."""
+        return f"{self.__class__.__name__}(differences={len(self)}, truncated={sum(self.truncated.values())})"
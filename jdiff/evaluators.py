@@ -1,79 +1,335 @@
 """Evaluators."""
 
 import re
-from typing import Any, Dict, List, Mapping, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+from typing import Any, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from deepdiff import DeepDiff
 
+from .diff_result import DiffResult
 from .operator import Operator
-from .utils.diff_helpers import fix_deepdiff_key_names, get_diff_iterables_items
+from .utils.diff_engine import (
+    VALUES_CHANGED,
+    Accept,
+    JsonDiff,
+    ListKey,
+    UnsupportedDataError,
+    is_equal,
+    json_diff,
+    json_size,
+)
+from .utils.diff_helpers import (
+    group_diff_paths,
+    merge_diff_paths,
+    prefix_diff_paths,
+    split_dicts,
+    split_lists,
+    tree_paths,
+)
 
+DIFF_ENGINES = ("deepdiff", "native")
 
-def diff_generator(pre_result: Any, post_result: Any) -> Dict:
+# Size of the reference data, in characters of JSON, below which diff_generator compares serially with any workers.
+PARALLEL_MIN_SIZE = 1_000_000
+
+# Partitions of the top-level keys, or items, diffed per worker, so that workers finishing early take more.
+PARTITIONS_PER_WORKER = 4
+
+# Engine used by diff_generator when none is given, see set_diff_engine.
+_diff_engine = "deepdiff"  # pylint: disable=invalid-name
+
+
+def _validate_engine(engine: str) -> None:
+    """Raise a ValueError for an unknown diff engine."""
+    if engine not in DIFF_ENGINES:
+        raise ValueError(
+            f"'engine' argument should be one of the following: {', '.join(DIFF_ENGINES)}. You have: {engine}"
+        )
+
+
+def set_diff_engine(engine: str) -> None:
+    """Set the engine used by diff_generator, and by the check types built on it, when none is given.
+
+    Args:
+        engine: "deepdiff" (default) or "native".
+    """
+    global _diff_engine  # pylint: disable=global-statement,invalid-name
+    _validate_engine(engine)
+    _diff_engine = engine
+
+
+def get_diff_engine() -> str:
+    """Return the engine used by diff_generator when none is given."""
+    return _diff_engine
+
+
+def _compare(
+    pre_result: Any, post_result: Any, engine: str, accept: Optional[Accept] = None, **native_options: Any
+) -> Mapping:
+    """Return the differences between pre and post data, shaped like DeepDiff's text view keyed by path tuples.
+
+    The native engine hands data it does not support, like sets or custom objects, over to DeepDiff, unless options
+    only the native engine supports are set in native_options: list_key, ignore_order, max_diffs or max_bytes. Both
+    engines return at once when pre and post data are equal. Changed values accept returns True for are left out,
+    as they are found by the native engine, and afterwards from the differences found by DeepDiff.
+    """
+    if engine == "native":
+        try:
+            return json_diff(pre_result, post_result, view="paths", accept=accept, **native_options)
+        except UnsupportedDataError:
+            if any(value is not None and value is not False for value in native_options.values()):
+                raise
+    if is_equal(pre_result, post_result):
+        return {}
+    diff_paths = tree_paths(DeepDiff(pre_result, post_result, view="tree"))
+    if accept is not None and VALUES_CHANGED in diff_paths:
+        values_changed = {
+            path: change
+            for path, change in diff_paths[VALUES_CHANGED].items()
+            if not accept(path, change["old_value"], change["new_value"])
+        }
+        if values_changed:
+            diff_paths[VALUES_CHANGED] = values_changed
+        else:
+            del diff_paths[VALUES_CHANGED]
+    return diff_paths
+
+
+def _accept_under(prefix: Tuple[Hashable, ...], accept: Accept, path: Tuple[Hashable, ...], *values: Any) -> bool:
+    """Call accept with the path of a changed value found under prefix, from the root of the whole data."""
+    return accept(prefix + path, *values)
+
+
+def _compare_partition(
+    items: List[Tuple[Any, Any, Any]], engine: str, accept: Optional[Accept], native_options: Dict
+) -> Dict:
+    """Return the differences between the pre and post values of (key, pre value, post value) items, merged."""
+    diff_paths: Dict[str, Any] = {}
+    for key, pre_value, post_value in items:
+        key_accept = None if accept is None else partial(_accept_under, (key,), accept)
+        key_diff_paths = _compare(pre_value, post_value, engine, accept=key_accept, **native_options)
+        merge_diff_paths(diff_paths, prefix_diff_paths(key_diff_paths, (key,)))
+    return diff_paths
+
+
+def _compare_parallel(  # pylint: disable=too-many-arguments
+    pre_result: Any,
+    post_result: Any,
+    engine: str,
+    workers: int,
+    accept: Optional[Accept] = None,
+    **native_options: Any,
+) -> Mapping:
+    """Return the differences between pre and post data like _compare, diffing top-level subtrees in a process pool.
+
+    The values of the keys two dicts share, or the items at the same positions of two lists, are split into
+    partitions diffed by worker processes and merged in order with the keys, or items, added and removed. Data
+    smaller than PARALLEL_MIN_SIZE, or that the engines don't walk key by key or position by position at the top
+    level, is compared serially, like with max_diffs or max_bytes, which bound the whole result.
+    """
+    split = None
+    if (
+        native_options.get("max_diffs") is None
+        and native_options.get("max_bytes") is None
+        and json_size(pre_result, PARALLEL_MIN_SIZE) >= PARALLEL_MIN_SIZE
+    ):
+        if type(pre_result) is dict and type(post_result) is dict:
+            split = split_dicts(pre_result, post_result)
+        elif (
+            type(pre_result) is list
+            and type(post_result) is list
+            and native_options.get("list_key") is None
+            and not native_options.get("ignore_order")
+        ):
+            split = split_lists(pre_result, post_result)
+    if split is None:
+        return _compare(pre_result, post_result, engine, accept=accept, **native_options)
+
+    level_diff_paths, keys = split
+    items = [(key, pre_result[key], post_result[key]) for key in keys]
+    size = max(1, -(-len(items) // (workers * PARTITIONS_PER_WORKER)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partitions = executor.map(
+            _compare_partition,
+            [items[start : start + size] for start in range(0, len(items), size)],
+            repeat(engine),
+            repeat(accept),
+            repeat(native_options),
+        )
+        # Engines report the keys added to or removed from a dict before the differences of the keys kept, and the
+        # items added to or removed from the end of a list after the differences of the items at the same position.
+        diff_paths: Dict[str, Any] = {}
+        if isinstance(keys, list):
+            merge_diff_paths(diff_paths, level_diff_paths)
+        for partition in partitions:
+            merge_diff_paths(diff_paths, partition)
+        if not isinstance(keys, list):
+            merge_diff_paths(diff_paths, level_diff_paths)
+    return diff_paths
+
+
+def _diff_engine_for(engine: Optional[str], **native_options: Any) -> str:
+    """Return the engine comparing data, raising a ValueError when native_options set can't be used with it.
+
+    native_options are the options only the native engine supports, such as list_key, unset when None or False.
+    """
+    native_only = [name for name, value in native_options.items() if value is not None and value is not False]
+    if engine is None:
+        engine = "native" if native_only else _diff_engine
+    else:
+        _validate_engine(engine)
+    if native_only and engine != "native":
+        raise ValueError(f"'{native_only[0]}' argument requires the native engine. You have: {engine}")
+    return engine
+
+
+def diff_generator(  # pylint: disable=too-many-arguments
+    pre_result: Any,
+    post_result: Any,
+    engine: Optional[str] = None,
+    list_key: Optional[ListKey] = None,
+    ignore_order: bool = False,
+    max_diffs: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    lazy: bool = False,
+    workers: Optional[int] = None,
+    accept: Optional[Accept] = None,
+) -> Union[Dict, DiffResult]:
     """Generates diff between pre and post data based on check definition.
 
     Args:
         pre_result: dataset to compare
         post_result: dataset to compare
+        engine: "deepdiff" to compare with DeepDiff, or "native" to compare with the built-in engine specialized for
+            JSON-compatible data, which returns the same differences faster. Defaults to the engine set with
+            set_diff_engine, or to "native" with any of the options below. Both engines return at once on equal
+            data, but only the native engine skips the equal subtrees of data that differs.
+        list_key: field, or fields, identifying the records of lists. Lists are then aligned by identity with a hash
+            join instead of by position: records holding the fields are matched by their values, other items by
+            their content, and only the items added, removed or changed are reported. Requires the native engine.
+        ignore_order: compare lists as multisets of their items, hashed once, in linear time: only the items
+            whose count differs are reported, in the "missing" and "new" lists of their list. Requires the native
+            engine.
+        max_diffs: largest number of differences reported. Past it, the engine stops keeping differences and only
+            counts them by top-level key, under the "_truncated" key of the result, so the memory held stays
+            bounded however different the data is. Requires the native engine.
+        max_bytes: largest size of the differences reported, in characters of their paths and values in JSON, like
+            max_diffs. Bounds the result when a single difference, like a whole subtree replaced, is large. Requires
+            the native engine.
+        lazy: return a DiffResult holding the differences flat, which builds the nested dict only when asked.
+        workers: number of processes diffing the top-level keys, or list items, in parallel. Data smaller than
+            PARALLEL_MIN_SIZE characters of JSON, data replaced as a whole at the top level, and results bounded by
+            max_diffs or max_bytes are compared serially. The differences are the same either way.
+        accept: function of the path keys, old value and new value of a changed value, returning True when the
+            change must not be reported, like a change within tolerance. The native engine calls it as it finds
+            changes, so accepted changes are neither collected nor counted against max_diffs and max_bytes.
 
     Returns:
         dict: differences between two datasets with the following keys:
             - "values_changed": Item values that have changed
             - "missing": Item keys that have been removed
             - "new": Item keys that have been added
+            - "_truncated": Count of the differences left out by top-level key, when max_diffs or max_bytes is hit
     """
-    diff_result = DeepDiff(pre_result, post_result)
+    native_options = {
+        "list_key": list_key,
+        "ignore_order": ignore_order,
+        "max_diffs": max_diffs,
+        "max_bytes": max_bytes,
+    }
+    engine = _diff_engine_for(engine, **native_options)
+    if workers is None or workers == 1:
+        diff_paths = _compare(pre_result, post_result, engine, accept=accept, **native_options)
+    elif not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"'workers' must be a positive integer. You have: {workers}.")
+    else:
+        diff_paths = _compare_parallel(pre_result, post_result, engine, workers, accept=accept, **native_options)
+    if lazy:
+        return DiffResult(diff_paths)
+    return group_diff_paths(diff_paths)
+
 
-    result = diff_result.get("values_changed", {})
+def has_diff(  # pylint: disable=too-many-arguments
+    pre_result: Any,
+    post_result: Any,
+    engine: Optional[str] = None,
+    list_key: Optional[ListKey] = None,
+    ignore_order: bool = False,
+    accept: Optional[Accept] = None,
+) -> bool:
+    """Return True if diff_generator would report a difference between pre and post data, stopping at the first one.
 
-    if diff_result.get("dictionary_item_removed"):
-        result.update({k: "missing" for k in diff_result["dictionary_item_removed"]})
+    Both engines report the same differences, so the walk is done by the native engine, which stops at the first
+    difference instead of collecting them all. Data the native engine does not support is handed over to DeepDiff.
+
+    Args:
+        pre_result: dataset to compare
+        post_result: dataset to compare
+        engine: "deepdiff" or "native", validated like in diff_generator.
+        list_key: field, or fields, aligning lists by identity, see diff_generator.
+        ignore_order: compare lists as multisets of their items, see diff_generator.
+        accept: function of the path keys, old value and new value of a changed value, returning True when the change
+            must not be counted, see diff_generator.
+    """
+    _diff_engine_for(engine, list_key=list_key, ignore_order=ignore_order)
+    try:
+        return JsonDiff(list_key=list_key, ignore_order=ignore_order).changed(pre_result, post_result, accept)
+    except UnsupportedDataError:
+        if list_key is not None or ignore_order:
+            raise
+    return bool(_compare(pre_result, post_result, "deepdiff", accept=accept))
 
-    if diff_result.get("dictionary_item_added"):
-        result.update({k: "new" for k in diff_result["dictionary_item_added"]})
 
-    iterables_items = get_diff_iterables_items(diff_result)
-    if iterables_items:
-        result.update(iterables_items)
+def _keyed_items(values: List[Dict]) -> Iterator[Tuple[Any, Dict]]:
+    """Yield (reference key, value) for each item of a list extracted with the "list" output.
 
-    return fix_deepdiff_key_names(result)
+    Items normalized with $key$ are single-key dicts, other items are keyed by their index.
+    """
+    for index, value in enumerate(values):
+        # value: {'7.7.7.7': {'peerAddress': '7.7.7.7', 'localAsn': '65130.1101', 'linkType': 'externals
+        if not isinstance(value, dict):
+            raise TypeError(f"'value' ({value}) must be of type Dict, and it's {type(value)}")
+
+        # When data has been normalized with $key$, get inner key and value
+        if len(value) == 1:
+            # inner_key: '7.7.7.7', inner_value: {'peerAddress': '7.7.7.7', 'localAsn': '65130.1101', ...}
+            yield next(iter(value.items()))
+        else:
+            yield index, value
 
 
-def parameter_evaluator(values: List[Dict], parameters: Mapping, mode: str) -> Dict:
+def parameter_evaluator(
+    values: Union[List[Dict], Mapping], parameters: Mapping, mode: str, fail_fast: bool = False
+) -> Dict:
     """Parameter Match evaluator engine.
 
     Args:
-        values: List of items what we will check the parameters against
+        values: List of items what we will check the parameters against, or mapping of reference key to item
         parameters: Dict with the keys and reference values to check
         mode: "match" or "no-match" to define the evaluation mode
+        fail_fast: stop at the first item not matching the expectations, which is then the only one returned
 
     Example:
         values: [{'7.7.7.7': {'peerAddress': '7.7.7.7', 'localAsn': '65130.1100', 'linkType': 'external'}}]
+        values: {'7.7.7.7': {'peerAddress': '7.7.7.7', 'localAsn': '65130.1100', 'linkType': 'external'}}
         parameters: {'localAsn': '65130.1100', 'linkType': 'external'}
 
     Returns:
         Dictionary with all the items that have some value not matching the expectations from parameters
     """
-    if not isinstance(values, list):
-        raise TypeError("'values' must be of type List.")
+    if isinstance(values, Mapping):
+        items = values.items()
+    elif isinstance(values, list):
+        items = _keyed_items(values)
+    else:
+        raise TypeError("'values' must be of type List or Mapping.")
 
     result = {}
-    for index, value in enumerate(values):
-        # value: {'7.7.7.7': {'peerAddress': '7.7.7.7', 'localAsn': '65130.1101', 'linkType': 'externals
-        if not isinstance(value, dict):
-            raise TypeError(f"'value' ({value}) must be of type Dict, and it's {type(value)}")
-
+    for inner_key, value in items:
         result_item = {}
 
-        # When data has been normalized with $key$, get inner key and value
-        if len(value) == 1:
-            # inner_key: '7.7.7.7'
-            inner_key = list(value.keys())[0]
-            # inner_value: [{'peerAddress': '7.7.7.7', 'localAsn': '65130.1101', 'linkType': 'externals'}]
-            value = list(value.values())[0]
-        else:
-            inner_key = index
-
         for parameter_key, parameter_value in parameters.items():
             if mode == "match" and value[parameter_key] != parameter_value:
                 result_item[parameter_key] = value[parameter_key]
@@ -82,36 +338,53 @@ def parameter_evaluator(values: List[Dict], parameters: Mapping, mode: str) -> D
 
         if result_item:
             result[inner_key] = result_item
+            if fail_fast:
+                break
 
     return result
 
 
-def regex_evaluator(values: List[Dict[Any, Dict]], regex_expression: str, mode: str) -> Dict:
-    """Regex Match evaluator engine."""
-    # values: [{'7.7.7.7': {'peerGroup': 'EVPN-OVERLAY-SPINE'}}]
+def regex_evaluator(
+    values: Union[List[Dict[Any, Dict]], Mapping], regex_expression: str, mode: str, fail_fast: bool = False
+) -> Dict:
+    """Regex Match evaluator engine.
+
+    With fail_fast, stop at the first item not matching the expectations, which is then the only one returned.
+    """
+    # values: [{'7.7.7.7': {'peerGroup': 'EVPN-OVERLAY-SPINE'}}] or {'7.7.7.7': {'peerGroup': 'EVPN-OVERLAY-SPINE'}}
     # parameter: {'regex': '.*UNDERLAY.*', 'mode': 'match'}
     result = {}
-    if not isinstance(values, list):
-        raise TypeError("Something went wrong during JMSPath parsing. 'values' must be of type List.")
-
-    for item in values:
-        for founded_value in item.values():
-            for value in founded_value.values():
-                match_result = re.search(regex_expression, value)
-                # Fail if there is no regex match for "match" mode
-                if mode == "match" and not match_result:
-                    result.update(item)
-                # Fail if there is regex match for "no-match" mode.
-                elif mode == "no-match" and match_result:
-                    result.update(item)
+    if isinstance(values, Mapping):
+        items = values.items()
+    elif isinstance(values, list):
+        items = (pair for item in values for pair in item.items())
+    else:
+        raise TypeError("Something went wrong during JMSPath parsing. 'values' must be of type List or Mapping.")
+
+    for key, founded_value in items:
+        for value in founded_value.values():
+            match_result = re.search(regex_expression, value)
+            # Fail if there is no regex match for "match" mode
+            if mode == "match" and not match_result:
+                result[key] = founded_value
+            # Fail if there is regex match for "no-match" mode.
+            elif mode == "no-match" and match_result:
+                result[key] = founded_value
+        if fail_fast and result:
+            break
 
     return result
 
 
-def operator_evaluator(reference_data: Mapping, value_to_compare: Mapping) -> Tuple[Dict, bool]:
-    """Operator evaluator call."""
+def operator_evaluator(
+    reference_data: Mapping, value_to_compare: Mapping, fail_fast: bool = False
+) -> Tuple[Dict, bool]:
+    """Operator evaluator call.
+
+    With fail_fast, stop at the first failing item, which is then the only one returned.
+    """
     # reference_data
     # {'mode': 'all-same', 'operator_data': True}
     operator_mode = reference_data["mode"].replace("-", "_")
-    operator = Operator(reference_data["operator_data"], value_to_compare)
+    operator = Operator(reference_data["operator_data"], value_to_compare, fail_fast=fail_fast)
     return getattr(operator, operator_mode)()
@@ -1,22 +1,63 @@
 """Extract data from JSON. Based on custom JMSPath implementation."""
 
-import re
+import os
 import warnings
-from typing import Any, Dict, List, Mapping, Optional, Union
+from itertools import islice
+from typing import IO, Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
-import jmespath
-
-from .utils.data_normalization import exclude_filter, flatten_list
+from .columnar import ColumnarResult
+from .path import JdiffPath, compile_path
+from .utils.anchor_walker import AnchorWalker
+from .utils.data_normalization import exclude_filter, exclude_filter_copy, flatten_list
 from .utils.jmespath_parsers import (
     associate_key_of_my_value,
-    jmespath_refkey_parser,
-    jmespath_value_parser,
+    check_unique_keys,
+    concatenate_reference_keys,
+    keys_values_mapping,
     keys_values_zipper,
-    multi_reference_keys,
 )
+from .utils.json_stream import DEFAULT_READ_SIZE, iter_json_records
+
+OUTPUT_FORMATS = ("list", "mapping", "columnar")
+
+
+def _parse_path(path: Union[str, JdiffPath, None]) -> JdiffPath:
+    """Return the JdiffPath for 'path', parsing strings through the compile_path cache."""
+    if isinstance(path, JdiffPath):
+        return path
+    if not path:
+        warnings.warn("JMSPath cannot be empty string or type 'None'. Path argument reverted to default value '*'")
+        path = "*"
+    return compile_path(path)
+
+
+def _validate_output(output: str) -> None:
+    """Raise ValueError when 'output' is not a supported output format."""
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"'output' argument should be one of the following: {', '.join(OUTPUT_FORMATS)}. You have: {output}"
+        )
 
 
-def extract_data_from_json(data: Union[Mapping, List], path: str = "*", exclude: Optional[List] = None) -> Any:
+def _apply_exclude(data: Any, exclude: Optional[List], inplace: bool) -> Any:
+    """Validate the exclude list and remove the excluded keys from data, in place or from a shared copy."""
+    if exclude and isinstance(data, (Dict, List)):
+        if not isinstance(exclude, list):
+            raise ValueError(f"Exclude list must be defined as a list. You have {type(exclude)}")
+        # exclude unwanted elements
+        if not inplace:
+            return exclude_filter_copy(data, exclude)
+        exclude_filter(data, exclude)
+    return data
+
+
+def extract_data_from_json(
+    data: Union[Mapping, List],
+    path: Union[str, JdiffPath] = "*",
+    exclude: Optional[List] = None,
+    inplace: bool = True,
+    output: str = "list",
+) -> Any:
     """Return wanted data from outpdevice data based on the check path. See unit test for complete example.
 
     Get the wanted values to be evaluated if JMESPath expression is defined,
@@ -28,59 +69,82 @@ def extract_data_from_json(data: Union[Mapping, List], path: str = "*", exclude:
 
     Args:
         data: json data structure
-        path: JMESPath to extract specific values
+        path: JMESPath to extract specific values, either as string or as JdiffPath parsed beforehand
         exclude: list of keys to exclude
+        inplace: remove excluded keys from data itself. When False data is left untouched, only containers holding excluded keys and their parents are copied.
+        output: shape of the data extracted by anchored paths. "list" returns one dictionary per reference key
+            sorted by reference key, i.e. [{"10.1.0.0": {"state": "Idle"}}]. "mapping" returns a single dictionary
+            in data order, i.e. {"10.1.0.0": {"state": "Idle"}}, without sorting. Reference keys must then be unique.
+            "columnar" returns the same mapping as a `ColumnarResult`, holding one column per field, numeric
+            columns being packed into `array.array`.
+
     Returns:
         Evaluated data, may be anything depending on JMESPath used.
     """
-    if exclude and isinstance(data, (Dict, List)):
-        if not isinstance(exclude, list):
-            raise ValueError(f"Exclude list must be defined as a list. You have {type(exclude)}")
-        # exclude unwanted elements
-        exclude_filter(data, exclude)
+    _validate_output(output)
+    data = _apply_exclude(data, exclude, inplace)
+    path = _parse_path(path)
 
-    if not path:
-        warnings.warn("JMSPath cannot be empty string or type 'None'. Path argument reverted to default value '*'")
-        path = "*"
+    if output == "columnar":
+        if isinstance(path.anchor_walker, AnchorWalker):
+            # Values are collected field by field, without building a record per reference key.
+            collected = path.anchor_walker.columns(data)
+            if collected is not None:
+                reference_keys, columns = collected
+                check_unique_keys(reference_keys)
+                return ColumnarResult.from_columns(reference_keys, columns)
+        extracted = extract_data_from_json(data, path, output="mapping")
+        return ColumnarResult.from_mapping(extracted) if path.is_anchored else extracted
 
-    if path == "*":
+    if path.is_raw:
         # return if path is not specified
         return data
 
+    if path.anchor_walker is not None:
+        extracted = path.anchor_walker.extract(data, output)
+        if extracted is not None:
+            return extracted
+
     # Multi ref_key
-    if len(re.findall(r"\$.*?\$", path)) > 1:
-        clean_path = path.replace("$", "")
-        values = jmespath.search(f"{clean_path}{' | []' * (path.count('*') - 1)}", data)
-        return keys_values_zipper(
-            multi_reference_keys(path, data),
-            associate_key_of_my_value(clean_path, values),
+    if path.is_multi_reference:
+        values = path.value_expression.search(data)
+        zipper = keys_values_mapping if output == "mapping" else keys_values_zipper
+        return zipper(
+            concatenate_reference_keys(expression.search(data) for expression in path.reference_key_expressions),
+            associate_key_of_my_value(path.value_path, values),
         )
 
-    values = jmespath.search(jmespath_value_parser(path), data)
+    values = path.value_expression.search(data)
 
     if values is None:
         raise TypeError("JMSPath returned 'None'. Please, verify your JMSPath regex.")
 
     # check for multi-nested lists
     if any(isinstance(i, list) for i in values):
-        # process elements to check if lists should be flattened
+        # process elements to check if lists should be flattened, in a single pass over them
+        nested = False
         for element in values:
             for item in element:
                 # raise if there is a dict, path must be more specific to extract data
                 if isinstance(item, dict):
+                    if nested:
+                        values = flatten_list(values)
                     raise TypeError(
                         f'Must be list of lists i.e. [["Idle", 75759616], ["Idle", 75759620]]. You have "{values}".'
                     )
                 if isinstance(item, list):
-                    values = flatten_list(values)  # flatten list and rewrite values
+                    nested = True
                     break  # items are the same, need to check only first to see if this is a nested list
+        if nested:
+            # flatten list and rewrite values, the nesting level is known from the path when it has no filter
+            values = flatten_list(values, path.value_depth - 1 if path.value_depth else None)
 
     # We need to get a list of reference keys - list of strings.
     # Based on the expression or data we might have different data types
     # therefore we need to normalize.
-    if re.search(r"\$.*\$", path):
-        paired_key_value = associate_key_of_my_value(jmespath_value_parser(path), values)
-        wanted_reference_keys = jmespath.search(jmespath_refkey_parser(path), data)
+    if path.is_anchored:
+        paired_key_value = associate_key_of_my_value(path.value_path, values)
+        wanted_reference_keys = path.reference_key_expressions[0].search(data)
 
         if isinstance(wanted_reference_keys, dict):  # when wanted_reference_keys is dict() type
             list_of_reference_keys = list(wanted_reference_keys.keys())
@@ -93,8 +157,204 @@ def extract_data_from_json(data: Union[Mapping, List], path: str = "*", exclude:
         else:
             raise ValueError("Reference Key normalization failure. Please verify data type returned.")
 
+        if output == "mapping":
+            return keys_values_mapping(list_of_reference_keys, paired_key_value)
+
         normalized = keys_values_zipper(list_of_reference_keys, paired_key_value)
         # Data between pre and post may come in different order, so it needs to be sorted.
         return sorted(normalized, key=lambda arg: list(arg.keys()))
 
     return values
+
+
+def extract_many(
+    documents: Iterable[Union[Mapping, List]],
+    path: Union[str, JdiffPath] = "*",
+    exclude: Optional[List] = None,
+    chunk_size: Optional[int] = None,
+    inplace: bool = True,
+    output: str = "list",
+) -> Iterator[Any]:
+    """Lazily run `extract_data_from_json` with the same path over many documents.
+
+    The path is parsed once for the whole batch and documents are only consumed as results are requested,
+    so `documents` can be a generator reading device outputs one at a time.
+
+    Args:
+        documents: iterable of json data structures, i.e. the outputs of the same command from many devices.
+        path: JMESPath to extract specific values, either as string or as JdiffPath parsed beforehand.
+        exclude: list of keys to exclude.
+        chunk_size: when set, yield lists of up to chunk_size results instead of one result at a time.
+        inplace: remove excluded keys from the documents themselves, see `extract_data_from_json`.
+        output: "list", "mapping" or "columnar", see `extract_data_from_json`.
+
+    Returns:
+        Iterator over the evaluated data of each document, in input order.
+
+    Example:
+        >>> outputs = [{"peers": {"10.1.0.0": {"state": "Idle"}}}, {"peers": {"10.1.0.0": {"state": "Up"}}}]
+        >>> list(extract_many(outputs, "peers.$*$.state"))
+        [[{'10.1.0.0': {'state': 'Idle'}}], [{'10.1.0.0': {'state': 'Up'}}]]
+    """
+    if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size < 1):
+        raise ValueError(f"chunk_size must be a positive integer. You have {chunk_size}")
+    _validate_output(output)
+
+    path = _parse_path(path)
+    results = (extract_data_from_json(document, path, exclude, inplace, output) for document in documents)
+    if chunk_size is None:
+        return results
+    return _chunked(results, chunk_size)
+
+
+def extract_stream(
+    source: Union[str, os.PathLike, IO],
+    path: Union[str, JdiffPath] = "*",
+    exclude: Optional[List] = None,
+    chunk_size: Optional[int] = None,
+    fmt: str = "auto",
+    read_size: int = DEFAULT_READ_SIZE,
+    output: str = "list",
+) -> Iterator[Any]:
+    r"""Lazily run `extract_data_from_json` over the records of an NDJSON file or of a top-level JSON array.
+
+    The source is read incrementally and each record is extracted and released before the next one is decoded,
+    so memory usage is bounded by the largest single record instead of the whole file.
+
+    Args:
+        source: path of the file to read, or a text or binary stream opened for reading.
+        path: JMESPath to extract specific values, either as string or as JdiffPath parsed beforehand.
+        exclude: list of keys to exclude from each record.
+        chunk_size: when set, yield lists of up to chunk_size results instead of one result at a time.
+        fmt: "ndjson", "array" or "auto", see `iter_json_records`.
+        read_size: number of characters requested from the stream per read.
+        output: "list", "mapping" or "columnar", see `extract_data_from_json`.
+
+    Returns:
+        Iterator over the evaluated data of each record, in input order.
+
+    Example:
+        >>> import io
+        >>> stream = io.StringIO('{"peers": {"10.1.0.0": {"state": "Idle"}}}\n{"peers": {"10.1.0.0": {"state": "Up"}}}\n')
+        >>> list(extract_stream(stream, "peers.$*$.state"))
+        [[{'10.1.0.0': {'state': 'Idle'}}], [{'10.1.0.0': {'state': 'Up'}}]]
+    """
+    # Records are decoded fresh from the source, so excluded keys can always be removed in place.
+    return extract_many(iter_json_records(source, fmt, read_size), path, exclude, chunk_size, output=output)
+
+
+def iter_anchored_records(
+    data: Union[Mapping, List],
+    path: Union[str, JdiffPath],
+    exclude: Optional[List] = None,
+    inplace: bool = True,
+    separator: Optional[str] = None,
+) -> Iterator[Tuple[Union[Tuple[Hashable, ...], str], Dict]]:
+    """Walk data once and yield the reference keys of every anchor level with the values they refer to.
+
+    Unlike `extract_data_from_json`, reference keys are not evaluated by one jmespath search per anchor and joined
+    into strings: they are collected while walking the data and kept as a tuple, one element per anchor.
+    Like jmespath projections, elements missing a field along the way are skipped.
+
+    Args:
+        data: json data structure
+        path: anchored JMESPath made of keys, list indexes, `*`, `[*]` and `$*$` anchors, ending with a field or a
+            multiselect list of fields, i.e. "$*$.peers.$*$.*.ipv4.[accepted_prefixes]" or
+            "vrfs.$*$.peerList[*].[$peerAddress$,state]".
+        exclude: list of keys to exclude
+        inplace: remove excluded keys from data itself, see `extract_data_from_json`.
+        separator: when set, reference keys are joined into a string with it, i.e. "." as `extract_data_from_json`.
+
+    Returns:
+        Iterator over (reference keys, {field: value}) pairs, in data order.
+
+    Example:
+        >>> data = {"global": {"peers": {"10.1.0.0": {"is_up": True}}}, "vpn": {"peers": {"10.2.0.0": {"is_up": False}}}}
+        >>> list(iter_anchored_records(data, "$*$.peers.$*$.is_up"))
+        [(('global', '10.1.0.0'), {'is_up': True}), (('vpn', '10.2.0.0'), {'is_up': False})]
+        >>> list(iter_anchored_records(data, "$*$.peers.$*$.is_up", separator="."))
+        [('global.10.1.0.0', {'is_up': True}), ('vpn.10.2.0.0', {'is_up': False})]
+    """
+    path = _parse_path(path)
+    if path.nested_walker is None:
+        raise ValueError(
+            f"Path {path.path!r} is not supported, it must hold at least one anchor and no filter or function."
+        )
+    data = _apply_exclude(data, exclude, inplace)
+    return iter(path.nested_walker.pairs(data, separator))
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to 'size' items from 'iterable'."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def extract_paths(
+    data: Union[Mapping, List],
+    paths: Iterable[Union[str, JdiffPath]],
+    exclude: Optional[List] = None,
+    inplace: bool = True,
+    output: str = "list",
+) -> Dict[Union[str, JdiffPath], Any]:
+    """Run several paths against the same data, walking the keys they have in common only once.
+
+    Leading keys and list indexes of every path, i.e. "result[0].vrfs.default" in
+    "result[0].vrfs.default.peerList[*].[$peerAddress$,state]", are arranged in a trie. The trie is walked once
+    over the data and the rest of each path is evaluated against the sub-tree it selects, so the result of
+    each path is the same as `extract_data_from_json` would return.
+
+    Args:
+        data: json data structure
+        paths: JMESPaths to extract, either as strings or as JdiffPath parsed beforehand
+        exclude: list of keys to exclude, applied once before extracting any path
+        inplace: remove excluded keys from data itself, see `extract_data_from_json`.
+        output: "list", "mapping" or "columnar", see `extract_data_from_json`.
+
+    Returns:
+        Dictionary mapping each path, as provided, to its evaluated data.
+
+    Example:
+        >>> data = {"result": [{"peers": {"10.1.0.0": {"state": "Idle", "asn": 65001}}}]}
+        >>> extract_paths(data, ["result[0].peers.$*$.state", "result[0].peers.*.asn"])
+        {'result[0].peers.$*$.state': [{'10.1.0.0': {'state': 'Idle'}}], 'result[0].peers.*.asn': [65001]}
+    """
+    _validate_output(output)
+    data = _apply_exclude(data, exclude, inplace)
+    paths = list(paths)
+    # Trie node: (children by key or list index, paths whose prefix ends at this node).
+    root: Tuple[Dict, List] = ({}, [])
+    for path in paths:
+        node = root
+        for step in _parse_path(path).prefix:
+            node = node[0].setdefault(step, ({}, []))
+        node[1].append(path)
+
+    result: Dict[Union[str, JdiffPath], Any] = {}
+    stack = [(root, data)]
+    while stack:
+        (children, node_paths), sub_tree = stack.pop()
+        for path in node_paths:
+            result[path] = extract_data_from_json(
+                sub_tree, compile_path(_parse_path(path).relative_path), output=output
+            )
+        stack.extend((child, _walk_step(sub_tree, step)) for step, child in reversed(children.items()))
+
+    # Preserve the order paths were requested in.
+    return {path: result[path] for path in paths}
+
+
+def _walk_step(data: Any, step: Union[str, int]) -> Any:
+    """Return the child of 'data' selected by a key or list index, None when missing like jmespath does."""
+    if isinstance(step, int):
+        if not isinstance(data, list):
+            return None
+        try:
+            return data[step]
+        except IndexError:
+            return None
+    try:
+        return data.get(step)
+    except AttributeError:
+        return None
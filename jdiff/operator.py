@@ -1,22 +1,45 @@
 """Operator diff."""
 
 import operator
-from typing import Any, List, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Tuple, Union
 
 
 class Operator:
     """Operator class implementation."""
 
-    def __init__(self, reference_data: Any, value_to_compare: Any) -> None:
-        """__init__ method for Operator class."""
+    def __init__(self, reference_data: Any, value_to_compare: Any, fail_fast: bool = False) -> None:
+        """__init__ method for Operator class.
+
+        With fail_fast, evaluations stop at the first failing item, which is then the only one returned.
+        """
         # [{'7.7.7.7': {'peerGroup': 'EVPN-OVERLAY-SPINE', 'vrf': 'default', 'state': 'Idle'}},
         # {'10.1.0.0': {'peerGroup': 'IPv4-UNDERLAY-SPINE', 'vrf': 'default', 'state': 'Idle'}},
         # {'10.2.0.0': {'peerGroup': 'IPv4-UNDERLAY-SPINE', 'vrf': 'default', 'state': 'Idle'}},
         # {'10.64.207.255': {'peerGroup': 'IPv4-UNDERLAY-MLAG-PEER', 'vrf': 'default', 'state': 'Idle'}}]
         self.reference_data = reference_data
         self.value_to_compare = value_to_compare
+        self.fail_fast = fail_fast
+
+    def _iter_items(self) -> Iterator[Tuple[Any, Any]]:
+        """Yield (item, value) for each extracted item.
+
+        item identifies the value in the result: the single-key dict holding it when value_to_compare is a list,
+        its reference key when value_to_compare is a mapping.
+        """
+        if isinstance(self.value_to_compare, Mapping):
+            yield from self.value_to_compare.items()
+            return
+        for item in self.value_to_compare:
+            for value in item.values():
+                yield item, value
+
+    def _failed(self, items: List) -> Union[List, Dict]:
+        """Return the failed items in the shape of value_to_compare."""
+        if isinstance(self.value_to_compare, Mapping):
+            return {key: self.value_to_compare[key] for key in items}
+        return items
 
-    def _loop_through_wrapper(self, call_ops: str) -> Tuple[List, bool]:
+    def _loop_through_wrapper(self, call_ops: str) -> Tuple[Union[List, Dict], bool]:
         """Private wrapper method for operator evaluation based on 'operator' lib.
 
         Based on value passed to the method, the appropriate operator logic is triggered.
@@ -62,110 +85,114 @@ class Operator:
         }
 
         result = []  # type: List
-        for item in self.value_to_compare:
-            for value in item.values():
-                for evaluated_value in value.values():
-                    call_evaluation_logic()
+        for item, value in self._iter_items():
+            for evaluated_value in value.values():
+                call_evaluation_logic()
+            if self.fail_fast and result:
+                break
         if result:
-            return (result, False)
-        return (result, True)
+            return (self._failed(result), False)
+        return (self._failed(result), True)
 
     def all_same(self) -> Tuple[Any, bool]:
         """All same operator type implementation."""
-        list_of_values = []
         result = []
-        for item in self.value_to_compare:
-            # Create a list for compare values.
-            list_of_values.extend(iter(item.values()))
+        # Create a list for compare values.
+        list_of_values = [value for _, value in self._iter_items()]
         for element in list_of_values:
             if element != list_of_values[0]:
                 result.append(False)
+                # A single different value decides the result.
+                if self.fail_fast:
+                    break
             else:
                 result.append(True)
         if self.reference_data and not all(result):
             return (self.value_to_compare, False)
         if self.reference_data:
-            return ([], True)
+            return (self._failed([]), True)
         if not all(result):
-            return ([], True)
+            return (self._failed([]), True)
         return (self.value_to_compare, False)
 
-    def contains(self) -> Tuple[List, bool]:
+    def contains(self) -> Tuple[Union[List, Dict], bool]:
         """Contains operator caller."""
         return self._loop_through_wrapper("contains")
 
-    def not_contains(self) -> Tuple[List, bool]:
+    def not_contains(self) -> Tuple[Union[List, Dict], bool]:
         """Not contains operator caller."""
         return self._loop_through_wrapper("not_contains")
 
-    def is_gt(self) -> Tuple[List, bool]:
+    def is_gt(self) -> Tuple[Union[List, Dict], bool]:
         """Is greather than operator caller."""
         return self._loop_through_wrapper(">")
 
-    def is_ge(self) -> Tuple[List, bool]:
+    def is_ge(self) -> Tuple[Union[List, Dict], bool]:
         """Is greather or equal than operator caller."""
         return self._loop_through_wrapper(">=")
 
-    def is_lt(self) -> Tuple[List, bool]:
+    def is_lt(self) -> Tuple[Union[List, Dict], bool]:
         """Is lower than operator caller."""
         return self._loop_through_wrapper("<")
 
-    def is_le(self) -> Tuple[List, bool]:
+    def is_le(self) -> Tuple[Union[List, Dict], bool]:
         """Is lower or equal than operator caller."""
         return self._loop_through_wrapper("<=")
 
-    def is_in(self) -> Tuple[List, bool]:
+    def is_in(self) -> Tuple[Union[List, Dict], bool]:
         """Is in operator caller."""
         return self._loop_through_wrapper("is_in")
 
-    def not_in(self) -> Tuple[List, bool]:
+    def not_in(self) -> Tuple[Union[List, Dict], bool]:
         """Is not in operator caller."""
         return self._loop_through_wrapper("not_in")
 
-    def in_range(self) -> Tuple[List, bool]:
+    def in_range(self) -> Tuple[Union[List, Dict], bool]:
         """Is in range operator caller."""
         return self._loop_through_wrapper("in_range")
 
-    def not_in_range(self) -> Tuple[List, bool]:
+    def not_in_range(self) -> Tuple[Union[List, Dict], bool]:
         """Is not in range operator caller."""
         return self._loop_through_wrapper("not_in_range")
 
-    def is_subset(self) -> Tuple[List, bool]:
+    def is_subset(self) -> Tuple[Union[List, Dict], bool]:
         """Check whether each extracted list is a subset of the reference list."""
         result = []
         reference_set = set(self.reference_data)
 
-        for item in self.value_to_compare:
-            for value in item.values():
-                for evaluated_value in value.values():
-                    # Fail fast if the extracted value is not a list/tuple
-                    if not isinstance(evaluated_value, (list, tuple)):
-                        result.append(item)
-                        continue
+        for item, value in self._iter_items():
+            for evaluated_value in value.values():
+                # Fail fast if the extracted value is not a list/tuple
+                if not isinstance(evaluated_value, (list, tuple)):
+                    result.append(item)
+                    continue
 
-                    if not set(evaluated_value).issubset(reference_set):
-                        result.append(item)
+                if not set(evaluated_value).issubset(reference_set):
+                    result.append(item)
+            if self.fail_fast and result:
+                break
 
         if result:
-            return (result, False)
-        return ([], True)
+            return (self._failed(result), False)
+        return (self._failed([]), True)
 
-    def is_subset_ci(self) -> Tuple[List, bool]:
+    def is_subset_ci(self) -> Tuple[Union[List, Dict], bool]:
         """Check whether each extracted list is a subset of the reference list (case-insensitive)."""
         result = []
         reference_set = {str(item).lower() for item in self.reference_data}
 
-        for item in self.value_to_compare:
-            for value in item.values():
-                for evaluated_value in value.values():
-                    if not isinstance(evaluated_value, (list, tuple)):
-                        result.append(item)
-                        continue
+        for item, value in self._iter_items():
+            for evaluated_value in value.values():
+                if not isinstance(evaluated_value, (list, tuple)):
+                    result.append(item)
+                    continue
 
-                    normalized_value = {str(element).lower() for element in evaluated_value}
-                    if not normalized_value.issubset(reference_set):
-                        result.append(item)
+                normalized_value = {str(element).lower() for element in evaluated_value}
+                if not normalized_value.issubset(reference_set):
+                    result.append(item)
+            if self.fail_fast and result:
+                break
 
         if result:
-            return (result, False)
-        return ([], True)
+            return (self._failed(result), False)
+        return (self._failed([]), True)
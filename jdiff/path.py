@@ -0,0 +1,130 @@
+"""Pre-parsed jdiff path implementation."""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+from jmespath.parser import ParsedResult
+
+from .utils.anchor_walker import AnchorWalker, NestedAnchorWalker, compile_anchor_walker, compile_nested_anchor_walker
+from .utils.jmespath_parsers import (
+    compile_expression,
+    jmespath_refkey_parser,
+    jmespath_value_parser,
+    multi_reference_key_paths,
+    split_path_prefix,
+)
+from .utils.simple_path import SimplePath, list_depth
+
+# Cache size of compile_path(), one entry per distinct jdiff path.
+PATH_CACHE_SIZE = 1024
+
+
+class JdiffPath:
+    """Jdiff path parsed once into the jmespath expressions needed to extract data.
+
+    A jdiff path is a jmespath expression where reference keys may be anchored with `$`, i.e.
+    "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]". Parsing does not depend on the data,
+    so a JdiffPath can be built once and passed to `extract_data_from_json` in place of the string for every device.
+
+    Attributes:
+        path: original jdiff path.
+        anchors: names found between `$` anchors, in path order, i.e. ("peerAddress",).
+        anchor_positions: index of the "."-separated path segment holding each anchor.
+        flatten_depth: number of "| []" flattening steps applied to the values of a multi reference key path.
+        value_path: jmespath expression without anchors. Its last segment names the extracted fields.
+        value_expression: compiled expression returning the values to evaluate.
+        value_depth: number of nested list levels of the values, i.e. 2 for "peerList[*].[peerAddress,state]".
+            None when it depends on the data, or for multi reference key paths.
+        reference_key_expressions: compiled expressions returning the data reference keys are taken from.
+        prefix: leading keys and list indexes selecting a single sub-tree, i.e. ("result", 0, "vrfs", "default").
+        relative_path: rest of the path, evaluated against the sub-tree selected by prefix.
+        anchor_walker: single traversal extraction of reference keys and values, for the supported shapes of
+            anchored paths. None when the value and reference key expressions must be used.
+        nested_walker: single traversal returning the reference keys of every anchor level as a tuple, used by
+            `iter_anchored_records`. None when the shape of the path is not supported.
+    """
+
+    def __init__(self, path: str) -> None:
+        """__init__ method for JdiffPath class."""
+        if not isinstance(path, str):
+            raise TypeError(f"Path must be a string. You have {type(path)}")
+        self.path = path
+        self.anchors = tuple(anchor.strip("$") for anchor in re.findall(r"\$.*?\$", path))
+        self.anchor_positions = tuple(
+            index for index, element in enumerate(path.split(".")) if re.search(r"\$.*?\$", element)
+        )
+        self.flatten_depth = 0
+        self.value_path = path
+        self.value_expression: Optional[Union[SimplePath, ParsedResult]] = None
+        self.value_depth: Optional[int] = None
+        self.reference_key_expressions: Tuple[Union[SimplePath, ParsedResult], ...] = ()
+        self.anchor_walker: Optional[Union[AnchorWalker, NestedAnchorWalker]] = None
+        self.nested_walker: Optional[NestedAnchorWalker] = None
+        self.prefix, self.relative_path = split_path_prefix(path)
+
+        if self.is_raw:
+            return
+
+        if self.is_anchored:
+            self.nested_walker = compile_nested_anchor_walker(path)
+
+        if self.is_multi_reference:
+            self.value_path = path.replace("$", "")
+            self.flatten_depth = path.count("*") - 1
+            self.value_expression = compile_expression(f"{self.value_path}{' | []' * self.flatten_depth}")
+            self.reference_key_expressions = tuple(
+                compile_expression(key_path) for key_path in multi_reference_key_paths(path)
+            )
+            if self.nested_walker is not None and self.nested_walker.legacy_compatible:
+                self.anchor_walker = self.nested_walker
+            return
+
+        self.value_path = jmespath_value_parser(path)
+        self.value_expression = compile_expression(self.value_path)
+        self.value_depth = list_depth(self.value_expression.parsed)
+        if self.is_anchored:
+            self.reference_key_expressions = (compile_expression(jmespath_refkey_parser(path)),)
+            self.anchor_walker = compile_anchor_walker(path, self.value_path)
+
+    @property
+    def is_raw(self) -> bool:
+        """Return True when the path selects the whole data set."""
+        return self.path == "*"
+
+    @property
+    def is_anchored(self) -> bool:
+        """Return True when the path defines at least one reference key."""
+        return bool(self.anchors)
+
+    @property
+    def is_multi_reference(self) -> bool:
+        """Return True when reference keys are concatenated from more than one anchor."""
+        return len(self.anchors) > 1
+
+    def __repr__(self) -> str:
+        """Return the representation of the path."""
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def __eq__(self, other) -> bool:
+        """Paths are equal when built from the same string."""
+        if isinstance(other, JdiffPath):
+            return self.path == other.path
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash of the original path."""
+        return hash(self.path)
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_path(path: str) -> JdiffPath:
+    """Parse a jdiff path once and keep it in a process-wide LRU cache.
+
+    Args:
+        path: "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]"
+
+    Returns:
+        JdiffPath ready to be passed to `extract_data_from_json`.
+    """
+    return JdiffPath(path)
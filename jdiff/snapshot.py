@@ -0,0 +1,270 @@
+"""Snapshots persisted with a digest index.
+
+A snapshot is stored as two files: the data file holds the JSON text of subtrees no larger than a chunk size, one
+chunk per line, and the index file holds the digest of every chunk, with its position in the data file, and the keys
+and positions of the containers above the chunks.
+
+Diffing a snapshot against a new document only reads the index and the chunks whose digest differs from the digest
+of the same subtree in the new document. Unchanged subtrees are taken from the new document itself, so both diff
+engines skip them without walking them.
+
+Subtrees are compared by their JSON text: values that serialize to the same JSON are equal, like when the snapshot
+is read back with `json.load`.
+"""
+
+import hashlib
+import json
+import os
+from json.encoder import encode_basestring
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Union
+
+from .evaluators import diff_generator
+
+# Largest JSON text, in characters, stored as a single chunk. Larger dicts and lists are split into their children.
+CHUNK_SIZE = 4096
+
+INDEX_SUFFIX = ".index.json"
+
+INDEX_VERSION = 2
+
+# Built once: json.dumps builds a new encoder on every call with non-default options.
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# Index nodes, stored as JSON lists:
+# - chunk: [digest, offset, length], the JSON text of the subtree is at offset in the data file.
+# - dict: ["dict", [[key, node], ...]]
+# - list: ["list", [node, ...]]
+Node = List[Any]
+
+
+class LoadStats(NamedTuple):
+    """Chunks read from the data file of a snapshot."""
+
+    chunks: int
+    size: int
+
+
+def _digest(text: str) -> str:
+    """Return the digest of a text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _dumps(value: Any) -> str:
+    """Return the compact JSON text of a value."""
+    return _ENCODER.encode(value)
+
+
+def _scalar_dumps(value: Any) -> str:
+    """Return the compact JSON text of a scalar, with fast paths for strings and integers."""
+    kind = type(value)
+    if kind is str:
+        return encode_basestring(value)
+    if kind is int:
+        return int.__repr__(value)
+    return _dumps(value)
+
+
+def _is_chunk(node: Node) -> bool:
+    """Return True if node is a chunk node, False if it is a dict or list node."""
+    return len(node) == 3
+
+
+def _write_chunk(text: str, data_file: IO) -> Node:
+    """Write text as a chunk of data_file and return its chunk node."""
+    encoded = text.encode("utf-8")
+    offset = data_file.tell()
+    data_file.write(encoded + b"\n")
+    return [_digest(text), offset, len(encoded)]
+
+
+def _index(value: Any, chunk_size: int, data_file: IO) -> Node:
+    """Return the index node of a value, writing its chunks to data_file."""
+    node = _split(value, chunk_size, data_file)
+    return _write_chunk(node, data_file) if isinstance(node, str) else node
+
+
+def _split(value: Any, chunk_size: int, data_file: IO) -> Union[str, Node]:
+    """Return the JSON text of a value if it fits in a chunk, or its index node, writing the chunks of its children.
+
+    Texts are built from the texts of the children, so every subtree is serialized once: containers holding only
+    basic values are serialized whole, and other containers join the texts of their children while they fit in a
+    chunk. Scalars and empty containers are never split, whatever their length.
+    """
+    if not isinstance(value, (dict, list, tuple)):
+        return _scalar_dumps(value)
+    if not value:
+        return _dumps(value)
+    if isinstance(value, dict):
+        keys = list(value)
+        children = list(value.values())
+    else:
+        keys = None
+        children = list(value)
+
+    if all(not isinstance(child, (dict, list, tuple)) for child in children):
+        text = _dumps(value)
+        if len(text) <= chunk_size:
+            return text
+        nodes: List[Union[str, Node]] = [_scalar_dumps(child) for child in children]
+    else:
+        nodes = [_split(child, chunk_size, data_file) for child in children]
+        # The text of the container is longer than the texts of its children together.
+        if all(isinstance(node, str) for node in nodes) and sum(map(len, nodes)) <= chunk_size:
+            if keys is None:
+                text = "[" + ",".join(nodes) + "]"
+            else:
+                text = "{" + ",".join(_key_text(key) + ":" + node for key, node in zip(keys, nodes)) + "}"
+            if len(text) <= chunk_size:
+                return text
+
+    nodes = [_write_chunk(node, data_file) if isinstance(node, str) else node for node in nodes]
+    if keys is None:
+        return ["list", nodes]
+    return ["dict", [[key, node] for key, node in zip(keys, nodes)]]
+
+
+def _key_text(key: Any) -> str:
+    """Return the JSON text of a dict key, which JSON turns into a string."""
+    return _dumps(key if isinstance(key, str) else _dumps(key))
+
+
+class SnapshotIndex:
+    """Digest index of a snapshot persisted with save_snapshot.
+
+    Attributes:
+        path: path of the data file, the index is stored next to it with the ".index.json" suffix.
+        chunk_size: largest JSON text, in characters, stored as a single chunk.
+        root: index node of the whole snapshot.
+        stats: chunks read from the data file by the last load_data, load_changed or diff.
+
+    Example:
+        >>> import tempfile, os
+        >>> path = os.path.join(tempfile.mkdtemp(), "pre.json")
+        >>> pre = {"interfaces": {"Ethernet1": {"mtu": 1500}, "Ethernet2": {"mtu": 1500}}}
+        >>> snapshot = save_snapshot(pre, path, chunk_size=20)
+        >>> snapshot.diff({"interfaces": {"Ethernet1": {"mtu": 1500}, "Ethernet2": {"mtu": 9214}}})
+        {'interfaces': {'Ethernet2': {'mtu': {'new_value': 9214, 'old_value': 1500}}}}
+        >>> snapshot.stats
+        LoadStats(chunks=1, size=12)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], root: Node, chunk_size: int = CHUNK_SIZE) -> None:
+        """__init__ method for SnapshotIndex class."""
+        self.path = path
+        self.root = root
+        self.chunk_size = chunk_size
+        self.stats = LoadStats(0, 0)
+
+    def load_data(self) -> Any:
+        """Return the whole snapshot."""
+        counters = [0, 0]
+        with open(self.path, "rb") as data_file:
+            result = self._load(self.root, data_file, counters)
+        self.stats = LoadStats(*counters)
+        return result
+
+    def load_changed(self, data: Any) -> Any:
+        """Return the snapshot, with the subtrees equal to the same subtrees of data taken from data.
+
+        data is walked along the index: containers split in the index are walked key by key, and the subtrees
+        stored as chunks are serialized and compared to the digest of the chunk. Only the chunks that differ are
+        read from the data file.
+
+        Args:
+            data: document the snapshot is compared to.
+        """
+        counters = [0, 0]
+        with open(self.path, "rb") as data_file:
+            result = self._rebuild(self.root, data, data_file, counters)
+        self.stats = LoadStats(*counters)
+        return result
+
+    def diff(self, data: Any, engine: Optional[str] = None) -> Dict:
+        """Return the differences between the snapshot and data, like diff_generator(snapshot, data).
+
+        Args:
+            data: document to compare with the snapshot.
+            engine: diff engine, "deepdiff" or "native", see `diff_generator`.
+        """
+        return diff_generator(self.load_changed(data), data, engine=engine)
+
+    def _rebuild(self, node: Node, data: Any, data_file: IO, counters: List[int]) -> Any:
+        """Return the value of node, taken from data when they are equal, read from the data file otherwise."""
+        if _is_chunk(node):
+            try:
+                if _digest(_dumps(data)) == node[0]:
+                    return data
+            except (TypeError, ValueError):
+                # data is not JSON-serializable, so it differs from the chunk.
+                pass
+            return self._load(node, data_file, counters)
+
+        kind, children = node
+        if kind == "dict" and isinstance(data, dict):
+            return {
+                key: self._rebuild(child, data[key], data_file, counters)
+                if key in data
+                else self._load(child, data_file, counters)
+                for key, child in children
+            }
+        if kind == "list" and isinstance(data, (list, tuple)):
+            return [
+                self._rebuild(child, data[position], data_file, counters)
+                if position < len(data)
+                else self._load(child, data_file, counters)
+                for position, child in enumerate(children)
+            ]
+        return self._load(node, data_file, counters)
+
+    def _load(self, node: Node, data_file: IO, counters: List[int]) -> Any:
+        """Return the value of node, read from the data file."""
+        if not _is_chunk(node):
+            kind, children = node
+            if kind == "dict":
+                return {key: self._load(child, data_file, counters) for key, child in children}
+            return [self._load(child, data_file, counters) for child in children]
+
+        _, offset, length = node
+        data_file.seek(offset)
+        counters[0] += 1
+        counters[1] += length
+        return json.loads(data_file.read(length))
+
+
+def _index_path(path: Union[str, os.PathLike]) -> str:
+    """Return the path of the index of a snapshot."""
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def save_snapshot(data: Any, path: Union[str, os.PathLike], chunk_size: int = CHUNK_SIZE) -> SnapshotIndex:
+    """Persist a JSON-serializable document as a snapshot with its digest index.
+
+    Args:
+        data: document to persist.
+        path: path of the data file, the index is written next to it with the ".index.json" suffix.
+        chunk_size: largest JSON text, in characters, stored as a single chunk. Smaller chunks make the index larger
+            and diffs read less data.
+
+    Returns:
+        SnapshotIndex of the persisted snapshot.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"'chunk_size' must be a positive integer. You have: {chunk_size}.")
+    with open(path, "wb") as data_file:
+        root = _index(data, chunk_size, data_file)
+    with open(_index_path(path), "w", encoding="utf-8") as index_file:
+        json.dump({"version": INDEX_VERSION, "chunk_size": chunk_size, "root": root}, index_file, separators=(",", ":"))
+    return SnapshotIndex(path, root, chunk_size)
+
+
+def load_snapshot(path: Union[str, os.PathLike]) -> SnapshotIndex:
+    """Load the digest index of a snapshot persisted with save_snapshot, without reading its data.
+
+    Args:
+        path: path of the data file given to save_snapshot.
+    """
+    with open(_index_path(path), "r", encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"Snapshot index version {index.get('version')} is not supported, expected {INDEX_VERSION}.")
+    return SnapshotIndex(path, index["root"], index["chunk_size"])
@@ -0,0 +1,566 @@
+"""Single traversal extraction of reference keys and their values.
+
+For the most common shapes of paths with one `$` anchor, the reference key and the values of every element are
+read together while walking the data once, instead of evaluating a value expression and a reference key expression
+and zipping their results.
+"""
+
+import re
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from jmespath.parser import ParsedResult
+
+from .jmespath_parsers import compile_expression, keys_values_mapping, split_path_prefix
+from .simple_path import SimplePath
+
+IDENTIFIER_REGEX = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+ANCHORED_IDENTIFIER_REGEX = re.compile(r"\$(?P<name>[A-Za-z_][A-Za-z0-9_]*)\$")
+
+# Values the legacy extraction would flatten or reject, they are left to it.
+NON_SCALAR_TYPES = (dict, list)
+
+
+class AnchorWalker:
+    """Walker returning (reference key, {field: value}) pairs for a path with one anchor.
+
+    Two shapes of path are supported, where the collection is reached by keys and list indexes only:
+    - "result[0].vrfs.default.peerList[*].[$peerAddress$,state]": the key is a field of each element of a list,
+      or of each value of a mapping when the collection is followed by "*".
+    - "result[0].interfaces.$*$.interfaceStatus": the key is each key of a mapping, the values are one field
+      or a multiselect list of fields of the matching value.
+
+    Attributes:
+        collection: compiled expression returning the list or mapping elements are taken from.
+        key_field: anchored field of each element, None when reference keys are the mapping keys.
+        values: True when elements are the values of a mapping rather than the items of a list.
+        fields: (output name, field name) of each extracted field. Output names keep the spelling the legacy
+            extraction takes from the path, i.e. " state" for "[$peerAddress$, state]".
+        multiselect: False when a single field is extracted without brackets, i.e. "$*$.state".
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        collection: Union[SimplePath, ParsedResult],
+        key_field: Optional[str],
+        values: bool,
+        fields: Tuple[Tuple[str, str], ...],
+        multiselect: bool,
+    ) -> None:
+        """__init__ method for AnchorWalker class."""
+        self.collection = collection
+        self.key_field = key_field
+        self.values = values
+        self.fields = fields
+        self.multiselect = multiselect
+
+    def pairs(self, data: Any) -> Optional[List[Tuple[Hashable, Dict]]]:
+        """Return the (reference key, {field: value}) pairs found in data, in data order.
+
+        Returns:
+            List of pairs, or None when the data has a shape the legacy extraction handles differently, i.e.
+            elements without reference key or non-scalar values. The caller must then use the legacy extraction.
+        """
+        collected = self._collect(data)
+        if collected is None:
+            return None
+        keys, columns = collected
+        return list(zip(keys, self._records(columns)))
+
+    def columns(self, data: Any) -> Optional[Tuple[List[Hashable], Dict[str, List]]]:
+        """Return the reference keys and {field: values} found in data, in data order, without building records.
+
+        Returns:
+            Reference keys and one list of values per field, or None when the caller must use the legacy
+            extraction, see `pairs`.
+        """
+        collected = self._collect(data)
+        if collected is None:
+            return None
+        keys, columns = collected
+        return keys, {output_name: column for (output_name, _), column in zip(self.fields, columns)}
+
+    def extract(self, data: Any, output: str = "list") -> Optional[Union[List[Dict], Dict]]:
+        """Return [{reference key: {field: value}}] sorted by reference key, as the legacy extraction does.
+
+        Args:
+            data: json data structure.
+            output: "mapping" to return {reference key: {field: value}} in data order instead.
+
+        Returns:
+            Extracted data, or None when the caller must use the legacy extraction, see `pairs`.
+        """
+        collected = self._collect(data)
+        if collected is None:
+            return None
+        keys, columns = collected
+        records = self._records(columns)
+        if output == "mapping":
+            return keys_values_mapping(keys, records)
+        # Data between pre and post may come in different order, so it needs to be sorted.
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return [{keys[index]: records[index]} for index in order]
+
+    def _records(self, columns: List[List]) -> List[Dict]:
+        """Return the {field: value} record of each row of the columns."""
+        if len(self.fields) == 1:
+            output_name = self.fields[0][0]
+            return [{output_name: value} for value in columns[0]]
+        output_names = [output_name for output_name, _ in self.fields]
+        return [dict(zip(output_names, row)) for row in zip(*columns)]
+
+    def _collect(self, data: Any) -> Optional[Tuple[List[Hashable], List[List]]]:
+        """Return the reference keys and one list of values per field found in data, in data order."""
+        collection = self.collection.search(data)
+        if self.key_field is None:
+            return self._collect_mapping_keys(collection)
+
+        if self.values:
+            try:
+                elements = collection.values()
+            except AttributeError:
+                return None
+        elif isinstance(collection, list):
+            elements = collection
+        else:
+            return None
+
+        key_field = self.key_field
+        fields = [(field, []) for _, field in self.fields]
+        keys = []
+        for element in elements:
+            if element is None:
+                # Dropped by the jmespath projections of both the legacy expressions.
+                continue
+            try:
+                key = element.get(key_field)
+            except AttributeError:
+                return None
+            if key is None or isinstance(key, NON_SCALAR_TYPES):
+                return None
+            for field, column in fields:
+                value = element.get(field)
+                if isinstance(value, NON_SCALAR_TYPES):
+                    return None
+                column.append(value)
+            keys.append(key)
+        return keys, [column for _, column in fields]
+
+    def _collect_mapping_keys(self, collection: Any) -> Optional[Tuple[List[Hashable], List[List]]]:
+        """Return the keys of the collection mapping and the values of the fields of their values."""
+        if not isinstance(collection, dict):
+            return None
+        if not self.multiselect:
+            field = self.fields[0][1]
+            column = []
+            for element in collection.values():
+                try:
+                    value = element.get(field)
+                except AttributeError:
+                    return None
+                if value is None or isinstance(value, NON_SCALAR_TYPES):
+                    return None
+                column.append(value)
+            return list(collection), [column]
+
+        fields = [(field, []) for _, field in self.fields]
+        for element in collection.values():
+            if element is None:
+                return None
+            for field, column in fields:
+                try:
+                    value = element.get(field)
+                except AttributeError:
+                    value = None
+                if isinstance(value, NON_SCALAR_TYPES):
+                    return None
+                column.append(value)
+        return list(collection), [column for _, column in fields]
+
+
+def _lookup_expression(path: str) -> Optional[Union[SimplePath, ParsedResult]]:
+    """Return the compiled expression of a path made only of keys and list indexes, None otherwise."""
+    path = path or "@"
+    if split_path_prefix(path)[1] != "@":
+        return None
+    return compile_expression(path)
+
+
+def _output_names(value_path: str) -> List[str]:
+    """Return the names the legacy extraction gives to the extracted values."""
+    last_segment = value_path.split(".")[-1]
+    if last_segment.startswith("[") and last_segment.endswith("]"):
+        return last_segment.strip("[]").split(",")
+    return [last_segment]
+
+
+def compile_anchor_walker(path: str, value_path: str) -> Optional[AnchorWalker]:
+    """Return an AnchorWalker for a path with one anchor, None when the shape of the path is not supported.
+
+    Args:
+        path: "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]"
+        value_path: path without anchor, as returned by `jmespath_value_parser`.
+
+    Returns:
+        AnchorWalker, or None.
+
+    Example:
+        >>> walker = compile_anchor_walker("peers.$*$.state", "peers.*.state")
+        >>> walker.pairs({"peers": {"10.1.0.0": {"state": "Idle"}, "10.2.0.0": {"state": "Established"}}})
+        [('10.1.0.0', {'state': 'Idle'}), ('10.2.0.0', {'state': 'Established'})]
+    """
+    if path.count("$") != 2:
+        return None
+    segments = path.split(".")
+    last_segment = segments[-1]
+    output_names = _output_names(value_path)
+
+    if "$" in last_segment:
+        # result[0].vrfs.default.peerList[*].[$peerAddress$,state]
+        if not (last_segment.startswith("[") and last_segment.endswith("]")):
+            return None
+        items = [item.strip() for item in last_segment[1:-1].split(",")]
+        anchors = [ANCHORED_IDENTIFIER_REGEX.fullmatch(item) for item in items]
+        fields = [item for item, anchor in zip(items, anchors) if not anchor]
+        if len(fields) == len(items) or not fields or not all(IDENTIFIER_REGEX.fullmatch(field) for field in fields):
+            return None
+        key_field = next(anchor.group("name") for anchor in anchors if anchor)
+
+        base = ".".join(segments[:-1])
+        if base.endswith("[*]"):
+            collection, values = _lookup_expression(base[:-3]), False
+        elif base == "*" or base.endswith(".*"):
+            collection, values = _lookup_expression(base[:-2]), True
+        else:
+            return None
+        multiselect = True
+    else:
+        # result[0].interfaces.$*$.interfaceStatus or result[0].interfaces.$*$.[interfaceStatus,mtu]
+        if len(segments) < 2 or segments[-2] != "$*$":
+            return None
+        multiselect = last_segment.startswith("[") and last_segment.endswith("]")
+        fields = [item.strip() for item in last_segment.strip("[]").split(",")] if multiselect else [last_segment]
+        if not all(IDENTIFIER_REGEX.fullmatch(field) for field in fields):
+            return None
+        key_field, values = None, False
+        collection = _lookup_expression(".".join(segments[:-2]))
+
+    if collection is None or [name.strip() for name in output_names] != fields:
+        return None
+    return AnchorWalker(collection, key_field, values, tuple(zip(output_names, fields)), multiselect)
+
+
+# Segment of a path walked by NestedAnchorWalker, before the last one.
+SEGMENT_REGEX = re.compile(
+    r"(?P<anchor>\$\*\$)|(?P<values>\*)|(?P<key>[A-Za-z_][A-Za-z0-9_]*)?(?P<brackets>(?:\[(?:-?\d+|\*)\])*)"
+)
+BRACKET_REGEX = re.compile(r"\[(-?\d+|\*)\]")
+PROJECTION_NODES = frozenset(("projection", "value_projection", "flatten"))
+
+
+class _LegacyMismatch(Exception):
+    """Data has a shape the legacy extraction handles differently."""
+
+
+def join_reference_keys(keys: Tuple[Hashable, ...], separator: str = ".") -> str:
+    """Render the reference keys of every anchor level as one string, as the legacy extraction does.
+
+    Args:
+        keys: ("global", "10.1.0.0")
+        separator: string placed between the keys.
+
+    Returns:
+        "global.10.1.0.0"
+    """
+    return separator.join(map(str, keys))
+
+
+# Reference keys of every anchor level, as a tuple or joined into a string.
+ReferenceKeys = Union[Tuple[Hashable, ...], str, None]
+KeyBuilder = Callable[[ReferenceKeys, Hashable], ReferenceKeys]
+
+
+def _key_builder(separator: Optional[str]) -> Tuple[ReferenceKeys, KeyBuilder]:
+    """Return the reference keys above the first anchor and the function adding the key of an anchor to them.
+
+    Joined keys are built while walking, i.e. "global" then "global.10.1.0.0", as the legacy extraction does.
+    """
+    if separator is None:
+        return (), lambda keys, key: keys + (key,)
+    return None, lambda keys, key: str(key) if keys is None else f"{keys}{separator}{key}"
+
+
+class NestedAnchorWalker:
+    """Walker returning the reference keys of every anchor level together with the values they refer to.
+
+    The path is walked once: each `$*$` anchor iterates over the items of a mapping and adds its key to a tuple,
+    i.e. "$*$.peers.$*$.*.ipv4.[accepted_prefixes]" yields (("global", "10.1.0.0"), {"accepted_prefixes": 1000}).
+    The last segment may also be a multiselect list with an anchored field, i.e. "[$peerAddress$,state]".
+
+    Attributes:
+        steps: (kind, argument) pairs walked before the last segment. Kinds are "anchor", "values" for `*`,
+            "list" for `[*]`, "field" and "index".
+        fields: (output name, field name) of each extracted field.
+        multiselect: False when a single field is extracted without brackets, i.e. "$*$.state".
+        key_field: anchored field of the last segment, None when every anchor is `$*$`.
+        legacy_compatible: True when `extract` can return the result of the legacy multi reference extraction.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        steps: Tuple[Tuple[str, Any], ...],
+        fields: Tuple[Tuple[str, str], ...],
+        multiselect: bool,
+        key_field: Optional[str],
+        legacy_compatible: bool,
+    ) -> None:
+        """__init__ method for NestedAnchorWalker class."""
+        self.steps = steps
+        self.fields = fields
+        self.multiselect = multiselect
+        self.key_field = key_field
+        self.legacy_compatible = legacy_compatible
+        anchor_steps = [index for index, (kind, _) in enumerate(steps) if kind == "anchor"]
+        self._last_anchor = anchor_steps[-1] if anchor_steps else -1
+        # Position of the first anchor or projection at or after each step, len(steps) when there is none.
+        self._branches = [len(steps)] * (len(steps) + 1)
+        for index in range(len(steps) - 1, -1, -1):
+            self._branches[index] = (
+                index if steps[index][0] in ("anchor", "values", "list") else self._branches[index + 1]
+            )
+        # Keys and list indexes resolved from each step up to the next anchor or projection.
+        self._lookups = [steps[index : self._branches[index]] for index in range(len(steps) + 1)]
+
+    def pairs(self, data: Any, separator: Optional[str] = None) -> List[Tuple[ReferenceKeys, Dict]]:
+        """Return (reference keys, {field: value}) for every record found in data, in data order.
+
+        Like jmespath projections, elements missing a field along the way are skipped.
+
+        Args:
+            data: json data structure.
+            separator: when set, reference keys are joined into a string with it instead of kept as a tuple.
+        """
+        pairs: List[Tuple[ReferenceKeys, Dict]] = []
+        self._collect(data, 0, *_key_builder(separator), False, pairs)
+        return pairs
+
+    def extract(self, data: Any, output: str = "list") -> Optional[Union[List[Dict], Dict]]:
+        """Return [{"key1.key2": {field: value}}] as the legacy multi reference extraction does.
+
+        Args:
+            data: json data structure.
+            output: "mapping" to return {"key1.key2": {field: value}} instead.
+
+        Returns:
+            Extracted data, or None when the legacy extraction must be used: the path is not legacy compatible,
+            or the data has a shape it handles differently, i.e. anything but exactly one record per reference key.
+        """
+        if not self.legacy_compatible:
+            return None
+        pairs: List[Tuple[ReferenceKeys, Dict]] = []
+        try:
+            self._collect(data, 0, *_key_builder("."), True, pairs)
+        except _LegacyMismatch:
+            return None
+        if output == "mapping":
+            return keys_values_mapping([keys for keys, _ in pairs], [record for _, record in pairs])
+        return [{keys: record} for keys, record in pairs]
+
+    def _collect(  # pylint: disable=too-many-arguments
+        self, value: Any, position: int, keys: ReferenceKeys, add_key: KeyBuilder, strict: bool, pairs: List
+    ) -> None:
+        """Append to pairs the records below value, starting at steps[position].
+
+        In strict mode, _LegacyMismatch is raised when the legacy extraction would drop or misalign data.
+        """
+        steps = self.steps
+        branch = self._branches[position]
+        value = self._lookup(value, self._lookups[position])
+        if value is None:
+            if strict and branch <= self._last_anchor:
+                raise _LegacyMismatch
+            return
+        if branch == len(steps):
+            pair = self._leaf(value, keys, add_key, strict)
+            if pair is not None:
+                pairs.append(pair)
+            return
+
+        kind = steps[branch][0]
+        if kind == "anchor":
+            if not isinstance(value, dict):
+                if strict:
+                    raise _LegacyMismatch
+                return
+            last = strict and branch == self._last_anchor
+            if self._branches[branch + 1] == len(steps):
+                # Only keys and list indexes are left, records are resolved without recursing.
+                lookups = self._lookups[branch + 1]
+                for key, child in value.items():
+                    pair = self._leaf(self._lookup(child, lookups), add_key(keys, key), add_key, strict)
+                    if pair is not None:
+                        pairs.append(pair)
+                    elif last:
+                        raise _LegacyMismatch
+                return
+            for key, child in value.items():
+                count = len(pairs)
+                self._collect(child, branch + 1, add_key(keys, key), add_key, strict, pairs)
+                if last and len(pairs) != count + 1:
+                    raise _LegacyMismatch
+            return
+
+        if kind == "values":
+            try:
+                children = value.values()
+            except AttributeError:
+                return
+        elif isinstance(value, list):
+            children = value
+        else:
+            return
+        for child in children:
+            self._collect(child, branch + 1, keys, add_key, strict, pairs)
+
+    @staticmethod
+    def _lookup(value: Any, lookups: Tuple[Tuple[str, Any], ...]) -> Any:
+        """Resolve consecutive keys and list indexes, None when one is missing."""
+        for kind, argument in lookups:
+            if kind == "field":
+                try:
+                    value = value.get(argument)
+                except AttributeError:
+                    return None
+            elif isinstance(value, list) and -len(value) <= argument < len(value):
+                value = value[argument]
+            else:
+                return None
+            if value is None:
+                return None
+        return value
+
+    def _leaf(
+        self, value: Any, keys: ReferenceKeys, add_key: KeyBuilder, strict: bool
+    ) -> Optional[Tuple[ReferenceKeys, Dict]]:
+        """Return (reference keys, record) for the last segment, None when value has no record."""
+        if value is None:
+            return None
+        if self.key_field is not None:
+            try:
+                key = value.get(self.key_field)
+            except AttributeError:
+                return None
+            if key is None:
+                return None
+            keys = add_key(keys, key)
+        if not self.multiselect:
+            output_name, field = self.fields[0]
+            try:
+                field_value = value.get(field)
+            except AttributeError:
+                return None
+            if field_value is None:
+                return None
+            if strict and isinstance(field_value, NON_SCALAR_TYPES):
+                raise _LegacyMismatch
+            return keys, {output_name: field_value}
+        record = {}
+        for output_name, field in self.fields:
+            try:
+                field_value = value.get(field)
+            except AttributeError:
+                field_value = None
+            if strict and isinstance(field_value, NON_SCALAR_TYPES):
+                raise _LegacyMismatch
+            record[output_name] = field_value
+        return keys, record
+
+
+def _has_projection(node: Dict) -> bool:
+    """Return True when a jmespath syntax tree contains a projection or a flatten."""
+    return node["type"] in PROJECTION_NODES or any(_has_projection(child) for child in node["children"])
+
+
+def _projects_rest(node: Dict) -> bool:
+    """Return True when every projection of a jmespath syntax tree applies the rest of the expression to each element.
+
+    It is not the case for "a.*.b.c", evaluated by jmespath as "(a.*.b).c".
+    """
+    children = node["children"]
+    if node["type"] in ("projection", "value_projection"):
+        return not _has_projection(children[0]) and _projects_rest(children[1])
+    if node["type"] in ("subexpression", "index_expression") and children:
+        return not any(_has_projection(child) for child in children[:-1]) and _projects_rest(children[-1])
+    return not _has_projection(node)
+
+
+def compile_nested_anchor_walker(path: str) -> Optional[NestedAnchorWalker]:
+    """Return a NestedAnchorWalker for an anchored path, None when the shape of the path is not supported.
+
+    Supported paths are made of keys, list indexes, `*`, `[*]` and `$*$` anchors, and end with a field or a
+    multiselect list of fields, optionally holding one anchored field.
+
+    Args:
+        path: "$*$.peers.$*$.*.ipv4.[accepted_prefixes,received_prefixes]"
+
+    Returns:
+        NestedAnchorWalker, or None.
+
+    Example:
+        >>> walker = compile_nested_anchor_walker("$*$.peers.$*$.state")
+        >>> walker.pairs({"global": {"peers": {"10.1.0.0": {"state": "Idle"}}}})
+        [(('global', '10.1.0.0'), {'state': 'Idle'})]
+    """
+    segments = path.split(".")
+    if segments[0] == "@":
+        # The current node, as in the rest of a path split by `split_path_prefix`, i.e. "@.*.[$name$,state]".
+        segments = segments[1:]
+    steps: List[Tuple[str, Any]] = []
+    for segment in segments[:-1]:
+        match = SEGMENT_REGEX.fullmatch(segment)
+        if not match or not segment:
+            return None
+        if match.group("anchor"):
+            steps.append(("anchor", None))
+        elif match.group("values"):
+            steps.append(("values", None))
+        else:
+            if match.group("key"):
+                steps.append(("field", match.group("key")))
+            for bracket in BRACKET_REGEX.findall(match.group("brackets")):
+                steps.append(("list", None) if bracket == "*" else ("index", int(bracket)))
+
+    last_segment = segments[-1]
+    multiselect = last_segment.startswith("[") and last_segment.endswith("]")
+    items = [item.strip() for item in last_segment[1:-1].split(",")] if multiselect else [last_segment]
+    anchors = [ANCHORED_IDENTIFIER_REGEX.fullmatch(item) for item in items]
+    fields = [item for item, anchor in zip(items, anchors) if not anchor]
+    key_fields = [anchor.group("name") for anchor in anchors if anchor]
+    if not fields or len(key_fields) > 1 or not all(IDENTIFIER_REGEX.fullmatch(field) for field in fields):
+        return None
+    key_field = key_fields[0] if key_fields else None
+    anchor_count = sum(kind == "anchor" for kind, _ in steps) + len(key_fields)
+    if not anchor_count or path.count("$") != 2 * anchor_count:
+        return None
+
+    legacy_compatible = _is_legacy_compatible(path, steps, key_field)
+    output_names = _output_names(path.replace("$", "")) if legacy_compatible else fields
+    if [name.strip() for name in output_names] != fields:
+        return None
+    return NestedAnchorWalker(tuple(steps), tuple(zip(output_names, fields)), multiselect, key_field, legacy_compatible)
+
+
+def _is_legacy_compatible(path: str, steps: List[Tuple[str, Any]], key_field: Optional[str]) -> bool:
+    """Return True when the legacy multi reference extraction of path gives the records of the natural walk.
+
+    It requires more than one anchor, all of them `$*$`, no projection before the last anchor, and jmespath
+    applying each projection of the value and reference key expressions to the rest of the expression.
+    """
+    anchor_steps = [index for index, (kind, _) in enumerate(steps) if kind == "anchor"]
+    if key_field is not None or len(anchor_steps) < 2:
+        return False
+    if any(kind in ("values", "list") for kind, _ in steps[: anchor_steps[-1]]):
+        return False
+    segments = path.replace("$", "").split(".")
+    expressions = [".".join(segments[:index]) for index, segment in enumerate(path.split(".")) if segment == "$*$"]
+    expressions.append(path.replace("$", ""))
+    return all(_projects_rest(compile_expression(expression or "@").parsed) for expression in expressions)
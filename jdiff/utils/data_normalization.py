@@ -1,9 +1,9 @@
 """Data Normalization utilities."""
 
-from typing import Dict, Generator, List, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Union
 
 
-def flatten_list(my_list: List) -> List:
+def flatten_list(my_list: List, depth: Optional[int] = None) -> List:
     """
     Flatten a multi level nested list and returns a list of lists.
 
@@ -13,8 +13,15 @@ def flatten_list(my_list: List) -> List:
     Having a list of lists will help us to assert that we have the number of values we have, will
     match the number of reference keys found in json object.
 
+    Nested lists are visited once with an explicit stack, each list being scanned a single time to find
+    out whether it is flat, so deeply nested data does not hit the recursion limit. Empty dictionaries and
+    strings found next to nested lists are skipped, any other value mixed with lists raises TypeError.
+
     Args:
         my_list: nested list to be flattened.
+        depth: nesting level the flat lists are expected at, known from the path, i.e. 3 in the example below.
+            Levels above it are then merged without looking for flat lists. When the data has another shape,
+            it is flattened as if no depth was given.
 
     Return:
         [[-1, 0], [-1, 0], [-1, 0], ...]
@@ -23,32 +30,66 @@ def flatten_list(my_list: List) -> List:
         >>> my_list = [[[[-1, 0], [-1, 0]]]]
         >>> flatten_list(my_list)
         [[-1, 0], [-1, 0]]
+        >>> flatten_list(my_list, depth=3)
+        [[-1, 0], [-1, 0]]
     """
-
-    def iter_flatten_list(my_list: List) -> Generator[List, None, None]:
-        """Recursively yield all flat lists within a given list."""
-        if is_flat_list(my_list):
-            yield my_list
+    if not isinstance(my_list, list):
+        raise ValueError(f"Argument provided must be a list. You passed a {type(my_list)}")
+    if depth is not None:
+        flattened = _flatten_to_depth(my_list, depth)
+        if flattened is not None:
+            return flattened
+
+    flat_lists = []
+    stack = [my_list]
+    while stack:
+        current = stack.pop()
+        nested = sum(isinstance(item, list) for item in current)
+        if not nested:
+            if current is my_list:
+                return my_list
+            flat_lists.append(current)
+        elif nested == len(current) or all(
+            isinstance(item, list) or (isinstance(item, (dict, str)) and not item) for item in current
+        ):
+            # Empty dictionaries and strings mixed with lists hold no value, they are skipped.
+            stack.extend(item for item in reversed(current) if isinstance(item, list))
         else:
-            for item in my_list:
-                yield from iter_flatten_list(item)
+            raise TypeError(f"Lists can't be flattened when mixed with other values. You have {current}.")
+    return flat_lists
 
-    def is_flat_list(obj: List) -> bool:
-        """Return True is obj is a list that does not contain any lists as its first order elements."""
-        return isinstance(obj, list) and not any(isinstance(i, list) for i in obj)
 
-    if not isinstance(my_list, list):
-        raise ValueError(f"Argument provided must be a list. You passed a {type(my_list)}")
-    if is_flat_list(my_list):
-        return my_list
-    return list(iter_flatten_list(my_list))
+def _flatten_to_depth(my_list: List, depth: int) -> Optional[List]:
+    """Return the lists found at the given nesting level, None unless they are the only flat lists of my_list."""
+    level = [my_list]
+    for _ in range(depth):
+        merged = []
+        for sub_list in level:
+            # Empty lists and lists of values above depth are flat lists themselves.
+            if not sub_list or not all(isinstance(item, list) for item in sub_list):
+                return None
+            merged.extend(sub_list)
+        level = merged
+    for sub_list in level:
+        if any(isinstance(item, list) for item in sub_list):
+            return None
+    return level if depth else my_list
+
+
+class ExcludeStats(NamedTuple):
+    """Counters reported by exclude_filter."""
 
+    visited: int
+    removed: int
 
-def exclude_filter(data: Union[Dict, List], exclude: List):
+
+def exclude_filter(data: Union[Dict, List], exclude: List) -> ExcludeStats:
     """
-    Recusively look through all dict keys and pop out the one defined in "exclude".
+    Look through all dict keys and pop out the one defined in "exclude".
 
     Update in place existing dictionary. Look into unit test for example.
+    Containers are traversed with an explicit stack, so deeply nested data does not hit the recursion limit,
+    and keys are matched against a frozenset of "exclude" instead of trying to pop every excluded key.
 
     Args:
         data: {
@@ -65,19 +106,80 @@ def exclude_filter(data: Union[Dict, List], exclude: List):
                         "outPktsRate": 2.1111866059750692
                     },...
         exclude: ["interfaceStatistics", "interfaceCounters"]
+
+    Return:
+        ExcludeStats with the number of containers visited and the number of keys removed.
+    """
+    exclude_keys = frozenset(exclude)
+    visited = removed = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        visited += 1
+        if isinstance(node, dict):
+            for key in exclude_keys.intersection(node):
+                del node[key]
+                removed += 1
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(element for element in node if isinstance(element, (dict, list)))
+    return ExcludeStats(visited, removed)
+
+
+def exclude_filter_copy(data: Union[Dict, List], exclude: List) -> Union[Dict, List]:
+    """
+    Return data without the keys defined in "exclude", leaving the original object untouched.
+
+    The result shares structure with "data": only dictionaries holding excluded keys, and the containers
+    leading to them, are copied. Everything else is referenced from the original, so keeping a snapshot
+    around does not require a deep copy.
+
+    Args:
+        data: {"interfaces": {"Management1": {"name": "Management1", "interfaceStatistics": {...}}}}
+        exclude: ["interfaceStatistics", "interfaceCounters"]
+
+    Return:
+        {"interfaces": {"Management1": {"name": "Management1"}}}
+
+    Example:
+        >>> data = {"interfaces": {"Management1": {"name": "Management1", "counters": {}}}, "hostname": {}}
+        >>> pruned = exclude_filter_copy(data, ["counters"])
+        >>> pruned, "counters" in data["interfaces"]["Management1"], pruned["hostname"] is data["hostname"]
+        ({'interfaces': {'Management1': {'name': 'Management1'}}, 'hostname': {}}, True, True)
     """
-    if isinstance(data, dict):
-        for exclude_element in exclude:
-            try:
-                data.pop(exclude_element)
-            except KeyError:
-                pass
-
-        for key in data:
-            if isinstance(data[key], (dict, list)):
-                exclude_filter(data[key], exclude)
-
-    elif isinstance(data, list):
-        for element in data:
-            if isinstance(element, (dict, list)):
-                exclude_filter(element, exclude)
+    exclude_keys = frozenset(exclude)
+    # Stack entries are [node, parent entry, key or index in parent, copy of node once one is needed].
+    root: List[Any] = [data, None, None, None]
+    stack = [root]
+    while stack:
+        entry = stack.pop()
+        node = entry[0]
+        if isinstance(node, dict):
+            excluded = exclude_keys.intersection(node)
+            if excluded:
+                node_copy = _copy_with_parents(entry)
+                for key in excluded:
+                    del node_copy[key]
+            stack.extend(
+                [value, entry, key, None]
+                for key, value in node.items()
+                if isinstance(value, (dict, list)) and key not in excluded
+            )
+        elif isinstance(node, list):
+            stack.extend(
+                [element, entry, index, None] for index, element in enumerate(node) if isinstance(element, (dict, list))
+            )
+    return data if root[3] is None else root[3]
+
+
+def _copy_with_parents(entry: List) -> Any:
+    """Shallow copy the node of a stack entry, and its parents not copied yet, linking each copy to its parent's."""
+    chain = []
+    while entry is not None and entry[3] is None:
+        chain.append(entry)
+        entry = entry[1]
+    for item in reversed(chain):
+        item[3] = item[0].copy()
+        if item[1] is not None:
+            item[1][3][item[2]] = item[3]
+    return chain[0][3] if chain else entry[3]
@@ -0,0 +1,697 @@
+"""Native diff engine for JSON-compatible data.
+
+Compare two documents made of dicts (or any mapping), lists, tuples, strings, numbers, booleans and None, and
+report the differences exactly as the text view of `DeepDiff(t1, t2)` does for the report types used by
+`diff_generator`: "values_changed", "dictionary_item_added", "dictionary_item_removed", "iterable_item_added" and
+"iterable_item_removed". Type changes are detected, to pick the same list alignment as DeepDiff, but not reported.
+
+With a list key, lists of records holding the list key fields are aligned by identity instead, and with ignore_order
+every list is compared as a multiset of its items, see JsonDiff.
+
+Paths are kept as linked (parent, key) pairs during the walk. Reported differences are keyed either by path strings,
+such as `root['interfaces'][0]` in the "text" view, or by tuples of keys and indexes, such as `('interfaces', 0)` in
+the "paths" view, which `render_path` turns into path strings on demand.
+"""
+
+import datetime
+import difflib
+import uuid
+from collections import Counter, deque
+from decimal import Decimal
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Types compared as leaves. Values of the same type are compared with `!=`.
+SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Types DeepDiff treats as basic when choosing how to align lists. Values of these types that are not in
+# SCALAR_TYPES, like Decimal or datetime, are left to DeepDiff.
+BASIC_TYPES = (str, bytes, memoryview, int, float, complex, Decimal, bool, type(None), uuid.UUID) + (
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+)
+
+# Types allowed as dict keys, they render to the same path strings as in DeepDiff.
+KEY_TYPES = frozenset((str, int, bool, type(None)))
+
+# DeepDiff reports a whole dict as changed, instead of its keys, when less than this share of keys is common.
+THRESHOLD_TO_DIFF_DEEPER = 0.33
+
+# Report types, in the order DeepDiff's text view fills them.
+DICTIONARY_ITEM_ADDED = "dictionary_item_added"
+DICTIONARY_ITEM_REMOVED = "dictionary_item_removed"
+VALUES_CHANGED = "values_changed"
+ITERABLE_ITEM_ADDED = "iterable_item_added"
+ITERABLE_ITEM_REMOVED = "iterable_item_removed"
+# Only counted, to compare list alignments like DeepDiff does.
+TYPE_CHANGES = "type_changes"
+ITERABLE_ITEM_MOVED = "iterable_item_moved"
+# Items of lists matched by identity, reported as iterable items but never turned into changed values.
+KEYED_ITEM_ADDED = "keyed_item_added"
+KEYED_ITEM_REMOVED = "keyed_item_removed"
+# Recorded changes that show up in the result.
+REPORTED_TYPES = frozenset(
+    (
+        DICTIONARY_ITEM_ADDED,
+        DICTIONARY_ITEM_REMOVED,
+        VALUES_CHANGED,
+        ITERABLE_ITEM_ADDED,
+        ITERABLE_ITEM_REMOVED,
+        KEYED_ITEM_ADDED,
+        KEYED_ITEM_REMOVED,
+    )
+)
+# Count of the changes left out of a result bounded by max_diffs or max_bytes, by top-level subtree.
+TRUNCATED = "truncated"
+
+# Views of reported differences: keyed by DeepDiff path strings, or by tuples of keys and indexes.
+VIEWS = ("text", "paths")
+
+# A path is None for the root, or a (parent path, key or index) pair.
+Path = Optional[Tuple[Any, Hashable]]
+# (report type, path, old value, new value)
+Change = Tuple[str, Path, Any, Any]
+# Field, or fields, identifying the records of lists.
+ListKey = Union[str, Sequence[str]]
+# Function of the path keys, old value and new value of a changed value, returning True when it must not be reported.
+Accept = Callable[[Tuple[Hashable, ...], Any, Any], bool]
+
+_MISSING = object()
+
+
+class UnsupportedDataError(TypeError):
+    """Data holds values the native engine does not compare, they must be compared with DeepDiff."""
+
+
+class _FirstChange(Exception):
+    """Raised by JsonDiff.changed at the first reported change."""
+
+
+class _StreamedChanges(list):
+    """Changes handled one by one as they are recorded, instead of collected for the text view.
+
+    Changed values that accept(path keys, old value, new value) returns True for are not recorded.
+    """
+
+    def __init__(self, accept: Optional[Accept] = None) -> None:
+        """__init__ method for _StreamedChanges class."""
+        super().__init__()
+        self.accept = accept
+
+    def accepted(self, change: Change) -> bool:
+        """Return True if change is a changed value that accept returns True for."""
+        report_type, path, old_value, new_value = change
+        return (
+            report_type == VALUES_CHANGED
+            and self.accept is not None
+            and self.accept(path_keys(path), old_value, new_value)
+        )
+
+    def append(self, change: Change) -> None:
+        """Record change, unless it is accepted."""
+        if not self.accepted(change):
+            super().append(change)
+
+    def extend(self, changes: List[Change]) -> None:  # type: ignore[override]
+        """Append the changes of a list aligned with difflib.
+
+        Items added and removed at the same path are reported as a changed value, like in the text view.
+        """
+        added = {path: new_value for report_type, path, _, new_value in changes if report_type == ITERABLE_ITEM_ADDED}
+        removed = {path for report_type, path, _, _ in changes if report_type == ITERABLE_ITEM_REMOVED}
+        for report_type, path, old_value, new_value in changes:
+            if report_type == ITERABLE_ITEM_REMOVED and path in added:
+                self.append((VALUES_CHANGED, path, old_value, added[path]))
+            elif not (report_type == ITERABLE_ITEM_ADDED and path in removed):
+                self.append((report_type, path, old_value, new_value))
+
+
+class _FailFastChanges(_StreamedChanges):
+    """Changes recorded by JsonDiff.changed, raising _FirstChange at the first change that would be reported."""
+
+    def append(self, change: Change) -> None:
+        """Raise _FirstChange if change would be reported."""
+        if change[0] in REPORTED_TYPES and not self.accepted(change):
+            raise _FirstChange
+
+
+class _BoundedChanges(_StreamedChanges):
+    """Changes recorded by JsonDiff.diff with max_diffs or max_bytes.
+
+    Reported changes are kept until one of them would exceed a cap. From then on, changes are only counted by
+    top-level subtree, in truncated, so the memory held does not grow with the number of changes. Accepted changes
+    are neither kept nor counted, and neither are changes that are never reported, like type changes: only the
+    alignment of lists of basic values needs them, and it records them in a list of its own.
+    """
+
+    def __init__(self, max_diffs: Optional[int], max_bytes: Optional[int], accept: Optional[Accept] = None) -> None:
+        """__init__ method for _BoundedChanges class."""
+        super().__init__(accept)
+        self.max_diffs = max_diffs
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.recorded = 0
+        self.truncated: Counter = Counter()
+
+    def append(self, change: Change) -> None:
+        """Keep change, or count it if the result is full."""
+        report_type, path, old_value, new_value = change
+        if report_type not in REPORTED_TYPES or self.accepted(change):
+            return
+        self.recorded += 1
+        if not self.truncated and (self.max_diffs is None or self.recorded <= self.max_diffs):
+            if self.max_bytes is None:
+                list.append(self, change)
+                return
+            limit = self.max_bytes - self.size
+            size = sum(
+                json_size(part, limit) for part in (path_keys(path), old_value, new_value) if part is not _MISSING
+            )
+            if size <= limit:
+                self.size += size
+                list.append(self, change)
+                return
+        self.truncated[_top_path(path)] += 1
+
+
+class DiffStats(NamedTuple):
+    """Counters of a JsonDiff run."""
+
+    visited: int
+    pruned: int
+    changes: int
+
+
+class JsonDiff:
+    """Diff engine for JSON-compatible data.
+
+    With prune, pairs of values are compared with `==` before walking them, and equal pairs are skipped with their
+    whole subtree: Python compares equal dicts and lists at C speed, much faster than walking them. Lists of basic
+    values are only pruned as a whole, because the type changes of their items pick how DeepDiff aligns them.
+
+    With a list key, the items of lists holding records with the list key fields are matched by identity with a hash
+    join instead of by position: records by the values of these fields, other items by their content. Matched items
+    are compared wherever they moved, and reported at their reference index, while unmatched items are reported as
+    added or removed. Lists without such records, like wrappers around the records, are still compared by position.
+    Keyed lists are not reported like DeepDiff does, as it compares lists by position.
+
+    With ignore_order, the items of lists not aligned by a list key are matched by their content, hashed once, so
+    lists are compared as multisets in linear time: only the items whose count differs are reported, as added or removed.
+    Order is ignored in nested lists too, and items present more times in one list than in the other are reported.
+
+    With max_diffs or max_bytes, the result is bounded: reported changes are kept, in the order they are found, until
+    one of them would exceed a cap, then the rest are only counted by top-level subtree, under the "truncated" report
+    type. The size of a change is the length of its path and values in JSON, estimated without serializing them.
+
+    Attributes:
+        prune: skip subtrees equal with `==`.
+        list_key: fields identifying the records of lists, or None to compare lists by position.
+        ignore_order: compare lists as multisets of their items.
+        max_diffs: largest number of reported changes in a result, or None.
+        max_bytes: largest size of the reported changes in a result, or None.
+        stats: counters of the last run, the number of value pairs walked, the number of value pairs skipped
+            because they are equal, and the number of changes found.
+
+    Example:
+        >>> engine = JsonDiff()
+        >>> engine.diff({"Ethernet1": {"mtu": 1500}, "Ethernet2": {"mtu": 1500}}, {"Ethernet1": {"mtu": 1500}, "Ethernet2": {"mtu": 9214}})
+        {'values_changed': {"root['Ethernet2']['mtu']": {'new_value': 9214, 'old_value': 1500}}}
+        >>> engine.stats
+        DiffStats(visited=3, pruned=1, changes=1)
+        >>> engine.diff({"Ethernet1": {"mtu": 1500}}, {"Ethernet1": {"mtu": 9214}}, view="paths")
+        {'values_changed': {('Ethernet1', 'mtu'): {'new_value': 9214, 'old_value': 1500}}}
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        prune: bool = True,
+        list_key: Optional[ListKey] = None,
+        ignore_order: bool = False,
+        max_diffs: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """__init__ method for JsonDiff class."""
+        for name, value in (("max_diffs", max_diffs), ("max_bytes", max_bytes)):
+            if value is not None and (not isinstance(value, int) or value < 0):
+                raise ValueError(f"'{name}' must be a non-negative integer. You have: {value}.")
+        self.prune = prune
+        self.list_key = (list_key,) if isinstance(list_key, str) else None if list_key is None else tuple(list_key)
+        self.ignore_order = ignore_order
+        self.max_diffs = max_diffs
+        self.max_bytes = max_bytes
+        self.stats = DiffStats(0, 0, 0)
+        self._changes: List[Change] = []
+        self._visited = 0
+        self._pruned = 0
+
+    def diff(self, t1: Any, t2: Any, view: str = "text", accept: Optional[Accept] = None) -> Dict[str, Any]:
+        """Return the differences between two JSON-compatible documents, shaped like DeepDiff's text view.
+
+        Args:
+            t1: reference document.
+            t2: document to compare.
+            view: "text" to key differences by DeepDiff path strings, or "paths" to key them by tuples of keys and
+                indexes.
+            accept: function of the path keys, old value and new value of a changed value, returning True when the
+                change is accepted and must not be reported, like a change within tolerance. It is called as
+                changes are found, so accepted changes are never collected, nor counted against max_diffs.
+
+        Returns:
+            Dict: non-empty report types among "values_changed" ({path: {"new_value": ..., "old_value": ...}}),
+                "dictionary_item_added" and "dictionary_item_removed" ([path]), "iterable_item_added" and
+                "iterable_item_removed" ({path: value}), and "truncated" ({top-level path: count}) in a bounded
+                result.
+
+        Raises:
+            UnsupportedDataError: data holds a type the engine does not compare, like a set, a custom object, a
+                Decimal, or a dict key that is not a string, an integer, a boolean or None.
+            ValueError: view is not one of VIEWS.
+        """
+        if view not in VIEWS:
+            raise ValueError(f"'view' argument should be one of the following: {', '.join(VIEWS)}. You have: {view}")
+        bounded = self.max_diffs is not None or self.max_bytes is not None
+        if bounded:
+            self._changes = _BoundedChanges(self.max_diffs, self.max_bytes, accept)
+        else:
+            self._changes = [] if accept is None else _StreamedChanges(accept)
+        self._visited = self._pruned = 0
+        try:
+            if self.prune and is_equal(t1, t2):
+                self._pruned += 1
+            else:
+                self._diff(t1, t2, None)
+            if view == "paths":
+                return _text_view(self._changes, path_keys)
+            return _text_view(self._changes, lambda path: render_path(path_keys(path)))
+        finally:
+            changes = self._changes
+            self.stats = DiffStats(
+                self._visited, self._pruned, changes.recorded if isinstance(changes, _BoundedChanges) else len(changes)
+            )
+            self._changes = []
+
+    def changed(self, t1: Any, t2: Any, accept: Optional[Accept] = None) -> bool:
+        """Return True if diff would report a difference between t1 and t2, stopping at the first one.
+
+        Args:
+            t1: reference document.
+            t2: document to compare.
+            accept: function of the path keys, old value and new value of a changed value, returning True when the
+                change is accepted and must not be counted.
+
+        Raises:
+            UnsupportedDataError: data holds a type the engine does not compare, see diff.
+        """
+        self._changes = _FailFastChanges(accept)
+        self._visited = self._pruned = 0
+        found = False
+        try:
+            if self.prune and is_equal(t1, t2):
+                self._pruned += 1
+            else:
+                self._diff(t1, t2, None)
+        except _FirstChange:
+            found = True
+        finally:
+            self.stats = DiffStats(self._visited, self._pruned, int(found))
+            self._changes = []
+        return found
+
+    def _diff(self, t1: Any, t2: Any, path: Path) -> None:
+        """Record the changes between t1 and t2, found at path."""
+        self._visited += 1
+        if t1 is t2:
+            return
+        kind = type(t1)
+        if kind is not type(t2):
+            self._changes.append((TYPE_CHANGES, path, t1, t2))
+        elif kind in SCALAR_TYPES:
+            if t1 != t2:
+                self._changes.append((VALUES_CHANGED, path, t1, t2))
+        elif isinstance(t1, Mapping):
+            self._diff_mapping(t1, t2, path)
+        elif kind is list or kind is tuple:
+            self._diff_sequence(t1, t2, path)
+        else:
+            raise UnsupportedDataError(f"Values of type {kind} can't be compared by the native diff engine.")
+
+    def _diff_child(self, item1: Any, item2: Any, path: Path) -> None:
+        """Record the changes between two items of containers, unless they are pruned."""
+        if self.prune and item1 is not item2 and is_equal(item1, item2):
+            self._pruned += 1
+        else:
+            self._diff(item1, item2, path)
+
+    def _diff_mapping(self, t1: Mapping, t2: Mapping, path: Path) -> None:
+        """Record the changes between two mappings: added keys, removed keys, then changes of common keys."""
+        common = []
+        added = []
+        for key in t2:
+            if type(key) not in KEY_TYPES:
+                raise UnsupportedDataError(f"Keys of type {type(key)} can't be rendered by the native diff engine.")
+            if key in t1:
+                common.append(key)
+            else:
+                added.append(key)
+        removed = [key for key in t1 if key not in t2]
+
+        union = len(common) + len(added) + len(removed)
+        if union > 1 and len(common) / union < THRESHOLD_TO_DIFF_DEEPER:
+            self._changes.append((VALUES_CHANGED, path, t1, t2))
+            return
+
+        for key in added:
+            self._changes.append((DICTIONARY_ITEM_ADDED, (path, key), _MISSING, t2[key]))
+        for key in removed:
+            if type(key) not in KEY_TYPES:
+                raise UnsupportedDataError(f"Keys of type {type(key)} can't be rendered by the native diff engine.")
+            self._changes.append((DICTIONARY_ITEM_REMOVED, (path, key), t1[key], _MISSING))
+        for key in common:
+            self._diff_child(t1[key], t2[key], (path, key))
+
+    def _diff_sequence(self, t1: List, t2: List, path: Path) -> None:
+        """Record the changes between two lists.
+
+        Lists of basic values are aligned with difflib, unless comparing them position by position reports as few
+        changes. Other lists are compared position by position. With a list key, lists of records holding the list
+        key fields are aligned by identity, and with ignore_order all lists are.
+        """
+        if self.ignore_order or (
+            self.list_key is not None and (any(map(self._is_record, t1)) or any(map(self._is_record, t2)))
+        ):
+            self._diff_keyed(t1, t2, path)
+            return
+        if not (_all_basic(t1) and _all_basic(t2)):
+            self._diff_pairs(t1, t2, 0, 0, path, self.prune)
+            return
+
+        changes = self._changes
+        self._changes = aligned = []
+        matcher = difflib.SequenceMatcher(isjunk=None, a=t1, b=t2, autojunk=False)
+        for tag, t1_from, t1_to, t2_from, t2_to in matcher.get_opcodes():
+            if tag == "replace":
+                self._diff_pairs(t1[t1_from:t1_to], t2[t2_from:t2_to], t1_from, t2_from, path, False)
+            elif tag == "delete":
+                aligned.extend(
+                    (ITERABLE_ITEM_REMOVED, (path, index), t1[index], _MISSING) for index in range(t1_from, t1_to)
+                )
+            elif tag == "insert":
+                aligned.extend(
+                    (ITERABLE_ITEM_ADDED, (path, index), _MISSING, t2[index]) for index in range(t2_from, t2_to)
+                )
+
+        if len(aligned) > 1:
+            self._changes = paired = []
+            self._diff_pairs(t1, t2, 0, 0, path, False)
+            if len(aligned) >= len(paired):
+                aligned = paired
+        changes.extend(aligned)
+        self._changes = changes
+
+    def _diff_keyed(self, t1: List, t2: List, path: Path) -> None:
+        """Record the changes between two lists whose items are matched by identity.
+
+        Items of t1 are indexed by identity, then each item of t2 takes the first unmatched item of t1 with the same
+        identity, so duplicates are matched in order.
+        """
+        positions: Dict[Hashable, deque] = {}
+        for index, item in enumerate(t1):
+            positions.setdefault(self._identity(item), deque()).append(index)
+
+        partners: List[Optional[int]] = [None] * len(t1)
+        added = []
+        for index, item in enumerate(t2):
+            candidates = positions.get(self._identity(item))
+            if candidates:
+                partners[candidates.popleft()] = index
+            else:
+                added.append(index)
+
+        for index, partner in enumerate(partners):
+            if partner is None:
+                self._changes.append((KEYED_ITEM_REMOVED, (path, index), t1[index], _MISSING))
+            else:
+                self._diff_child(t1[index], t2[partner], (path, index))
+        for index in added:
+            self._changes.append((KEYED_ITEM_ADDED, (path, index), _MISSING, t2[index]))
+
+    def _is_record(self, item: Any) -> bool:
+        """Return True if item is a mapping holding the list key fields."""
+        return (
+            self.list_key is not None
+            and (type(item) is dict or isinstance(item, Mapping))
+            and all(field in item for field in self.list_key)
+        )
+
+    def _identity(self, item: Any) -> Hashable:
+        """Return the identity of a list item: the values of the list key fields, or its content."""
+        if self.list_key is None:
+            return _freeze(item, self.ignore_order)
+        if self._is_record(item):
+            return ("key", tuple(_freeze(item[field], self.ignore_order) for field in self.list_key))
+        return ("content", _freeze(item, self.ignore_order))
+
+    def _diff_pairs(  # pylint: disable=too-many-arguments
+        self, t1: List, t2: List, t1_from: int, t2_from: int, path: Path, prune: bool
+    ) -> None:
+        """Record the changes between the items of two lists taken position by position.
+
+        Items of t1 are at t1_from + position in the compared list, items of t2 at t2_from + position.
+        """
+        changes = self._changes
+        for position, (item1, item2) in enumerate(zip_longest(t1, t2, fillvalue=_MISSING)):
+            index1 = t1_from + position
+            index2 = t2_from + position
+            if item2 is _MISSING:
+                changes.append((ITERABLE_ITEM_REMOVED, (path, index1), item1, _MISSING))
+            elif item1 is _MISSING:
+                changes.append((ITERABLE_ITEM_ADDED, (path, index2), _MISSING, item2))
+            elif index1 != index2 and item1 == item2:
+                changes.append((ITERABLE_ITEM_MOVED, (path, index1), item1, item2))
+            elif prune:
+                self._diff_child(item1, item2, (path, index1))
+            else:
+                self._diff(item1, item2, (path, index1))
+
+
+def json_diff(  # pylint: disable=too-many-arguments
+    t1: Any,
+    t2: Any,
+    prune: bool = True,
+    view: str = "text",
+    list_key: Optional[ListKey] = None,
+    ignore_order: bool = False,
+    max_diffs: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    accept: Optional[Accept] = None,
+) -> Dict[str, Any]:
+    """Return the differences between two JSON-compatible documents, shaped like DeepDiff's text view.
+
+    Args:
+        t1: reference document.
+        t2: document to compare.
+        prune: skip subtrees equal with `==`, see JsonDiff.
+        view: "text" to key differences by DeepDiff path strings, or "paths" to key them by tuples of keys and
+            indexes.
+        list_key: field, or fields, identifying the records of lists, to align lists by identity instead of by
+            position, see JsonDiff.
+        ignore_order: compare lists as multisets of their items, see JsonDiff.
+        max_diffs: largest number of reported changes, the others are only counted by top-level subtree, see JsonDiff.
+        max_bytes: largest size, in characters of JSON, of the reported changes, see JsonDiff.
+        accept: function of the path keys, old value and new value of a changed value, returning True when the
+            change must not be reported, see JsonDiff.diff.
+
+    Returns:
+        Dict: non-empty report types among "values_changed" ({path: {"new_value": ..., "old_value": ...}}),
+            "dictionary_item_added" and "dictionary_item_removed" ([path]), "iterable_item_added" and
+            "iterable_item_removed" ({path: value}), and "truncated" ({top-level path: count}) in a bounded result.
+
+    Raises:
+        UnsupportedDataError: data holds a type the engine does not compare, see JsonDiff.diff.
+        ValueError: view is not one of VIEWS, or a cap is not a non-negative integer.
+
+    Example:
+        >>> json_diff({"mtu": 1500, "vlans": [10, 20]}, {"mtu": 9214, "vlans": [10, 20, 30]})
+        {'values_changed': {"root['mtu']": {'new_value': 9214, 'old_value': 1500}}, 'iterable_item_added': {"root['vlans'][2]": 30}}
+        >>> json_diff({"mtu": 1500, "vlans": [10, 20]}, {"mtu": 9214, "vlans": [10, 20, 30]}, max_diffs=1)
+        {'values_changed': {"root['mtu']": {'new_value': 9214, 'old_value': 1500}}, 'truncated': {"root['vlans']": 1}}
+    """
+    engine = JsonDiff(
+        prune=prune, list_key=list_key, ignore_order=ignore_order, max_diffs=max_diffs, max_bytes=max_bytes
+    )
+    return engine.diff(t1, t2, view=view, accept=accept)
+
+
+def is_equal(t1: Any, t2: Any) -> bool:
+    """Return True if t1 and t2 are equal with `==`, False when they differ or can't be compared as a whole."""
+    try:
+        return bool(t1 == t2)
+    except (TypeError, ValueError):
+        # Like NumPy arrays, which compare element-wise.
+        return False
+
+
+def _freeze(value: Any, ignore_order: bool = False) -> Hashable:
+    """Return a hashable value equal for values equal with `==`, to match list items by content.
+
+    With ignore_order, lists are frozen as multisets of their items.
+    """
+    kind = type(value)
+    if kind in SCALAR_TYPES:
+        return value
+    # Scalars are frozen inline, to save a call per leaf.
+    if kind is dict or isinstance(value, Mapping):
+        return frozenset(
+            [(key, item if type(item) in SCALAR_TYPES else _freeze(item, ignore_order)) for key, item in value.items()]
+        )
+    if kind is list or kind is tuple:
+        items = [item if type(item) in SCALAR_TYPES else _freeze(item, ignore_order) for item in value]
+        if ignore_order:
+            return ("list", frozenset(Counter(items).items()))
+        return tuple(items)
+    try:
+        hash(value)
+    except TypeError as error:
+        raise UnsupportedDataError(
+            f"Values of type {type(value)} can't be matched by the native diff engine."
+        ) from error
+    return value
+
+
+def _all_basic(items: List) -> bool:
+    """Return True if all items are basic values, that DeepDiff aligns with difflib."""
+    for item in items:
+        if type(item) not in SCALAR_TYPES:
+            if isinstance(item, BASIC_TYPES):
+                raise UnsupportedDataError(f"Values of type {type(item)} can't be compared by the native diff engine.")
+            return False
+    return True
+
+
+def _text_view(changes: List[Change], path_key: Callable[[Path], Hashable]) -> Dict[str, Any]:
+    """Shape changes like DeepDiff's text view, turning items added and removed at the same path into changes.
+
+    Changes are keyed by path_key(path).
+    """
+    values_changed: Dict[Hashable, Dict[str, Any]] = {}
+    added_keys: List[Hashable] = []
+    removed_keys: List[Hashable] = []
+    added_items: Dict[Hashable, Any] = {}
+    removed_items: Dict[Hashable, Any] = {}
+    # Items of lists aligned by a list key are different records, even when they share an index.
+    keyed_added: Dict[Hashable, Any] = {}
+    keyed_removed: Dict[Hashable, Any] = {}
+    for report_type, path, old_value, new_value in changes:
+        if report_type == VALUES_CHANGED:
+            values_changed[path_key(path)] = _value_change(old_value, new_value)
+        elif report_type == DICTIONARY_ITEM_ADDED:
+            added_keys.append(path_key(path))
+        elif report_type == DICTIONARY_ITEM_REMOVED:
+            removed_keys.append(path_key(path))
+        elif report_type == ITERABLE_ITEM_ADDED:
+            added_items[path_key(path)] = new_value
+        elif report_type == ITERABLE_ITEM_REMOVED:
+            removed_items[path_key(path)] = old_value
+        elif report_type == KEYED_ITEM_ADDED:
+            keyed_added[path_key(path)] = new_value
+        elif report_type == KEYED_ITEM_REMOVED:
+            keyed_removed[path_key(path)] = old_value
+
+    for path in [path for path in removed_items if path in added_items]:
+        values_changed[path] = {"new_value": added_items.pop(path), "old_value": removed_items.pop(path)}
+    added_items.update(keyed_added)
+    removed_items.update(keyed_removed)
+
+    view = {
+        DICTIONARY_ITEM_ADDED: added_keys,
+        DICTIONARY_ITEM_REMOVED: removed_keys,
+        VALUES_CHANGED: values_changed,
+        ITERABLE_ITEM_ADDED: added_items,
+        ITERABLE_ITEM_REMOVED: removed_items,
+        TRUNCATED: {path_key(path): count for path, count in getattr(changes, "truncated", {}).items()},
+    }
+    return {report_type: report for report_type, report in view.items() if report}
+
+
+def _top_path(path: Path) -> Path:
+    """Return the path of the top-level subtree holding path, or None for the root."""
+    while path is not None and path[0] is not None:
+        path = path[0]
+    return path
+
+
+def json_size(value: Any, limit: int) -> int:
+    """Return about the length of value in JSON, or a number above limit as soon as it is reached.
+
+    Containers are walked with iterators, so large values are neither serialized nor copied.
+    """
+    size = 0
+    # (iterator over the items of a container, True if the items are (key, value) pairs of a mapping)
+    iterators: List[Tuple[Iterator, bool]] = [(iter((value,)), False)]
+    while iterators and size <= limit:
+        items, pairs = iterators[-1]
+        item = next(items, _MISSING)
+        if item is _MISSING:
+            iterators.pop()
+            continue
+        if pairs:
+            key, item = item
+            size += len(str(key)) + 4
+        kind = type(item)
+        if kind is str:
+            size += len(item) + 2
+        elif kind is dict or isinstance(item, Mapping):
+            size += 2
+            iterators.append((iter(item.items()), True))
+        elif kind is list or kind is tuple:
+            size += 2
+            iterators.append((iter(item), False))
+        else:
+            size += len(str(item))
+    return size
+
+
+def _value_change(old_value: Any, new_value: Any) -> Dict[str, Any]:
+    """Return the report of a changed value, with a unified diff for multi-line strings."""
+    change = {"new_value": new_value, "old_value": old_value}
+    if isinstance(old_value, str) and isinstance(new_value, str) and ("\n" in old_value or "\n" in new_value):
+        diff = list(difflib.unified_diff(old_value.splitlines(), new_value.splitlines(), lineterm=""))
+        if diff:
+            change["diff"] = "\n".join(diff)
+    return change
+
+
+def path_keys(path: Path) -> Tuple[Hashable, ...]:
+    """Return the keys and indexes of a linked path, from the root.
+
+    Example:
+        >>> path_keys(((None, "interfaces"), 0))
+        ('interfaces', 0)
+    """
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return tuple(keys)
+
+
+def render_path(keys: Sequence[Hashable], root: str = "root") -> str:
+    """Render the keys and indexes of a path as a DeepDiff path string.
+
+    Example:
+        >>> render_path(("interfaces", 0))
+        "root['interfaces'][0]"
+    """
+    return root + "".join(_render_key(key) for key in keys)
+
+
+def _render_key(key: Hashable) -> str:
+    """Render a key or an index the way DeepDiff does."""
+    if not isinstance(key, str):
+        return f"[{key!r}]"
+    if "'" in key:
+        return f'["{key}"]'
+    return f"['{key}']"
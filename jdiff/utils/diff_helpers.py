@@ -4,10 +4,181 @@ import re
 from collections import defaultdict
 from functools import partial, reduce
 from operator import getitem
-from typing import DefaultDict, Dict, List, Mapping
+from typing import Any, DefaultDict, Dict, Hashable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from deepdiff.helper import notpresent
+
+from .diff_engine import (
+    BASIC_TYPES,
+    DICTIONARY_ITEM_ADDED,
+    DICTIONARY_ITEM_REMOVED,
+    ITERABLE_ITEM_ADDED,
+    ITERABLE_ITEM_REMOVED,
+    THRESHOLD_TO_DIFF_DEEPER,
+    TRUNCATED,
+    render_path,
+)
 
 REGEX_PATTERN_RELEVANT_KEYS = r"'([A-Za-z0-9_\./\\-]*)'"
 
+# Key of the count of differences left out of a bounded result, by top-level key.
+TRUNCATED_KEY = "_truncated"
+
+_MISSING = object()
+
+
+def tree_paths(tree: Mapping) -> Dict:
+    """Return the differences of a DeepDiff tree view keyed by tuples of keys and indexes.
+
+    The result has the same report types and values as DeepDiff's text view, like json_diff(t1, t2, view="paths").
+
+    Args:
+        tree: result of DeepDiff(t1, t2, view="tree").
+    """
+    result = {}  # type: Dict[str, Any]
+    for level in tree.get("values_changed", ()):
+        change = {"new_value": level.t2, "old_value": level.t1}
+        if "diff" in level.additional:
+            change["diff"] = level.additional["diff"]
+        result.setdefault("values_changed", {})[tuple(level.path(output_format="list"))] = change
+    for report_type in ("dictionary_item_added", "dictionary_item_removed"):
+        if tree.get(report_type):
+            result[report_type] = [tuple(level.path(output_format="list")) for level in tree[report_type]]
+    for report_type in ("iterable_item_added", "iterable_item_removed"):
+        if tree.get(report_type):
+            result[report_type] = {
+                tuple(level.path(output_format="list")): level.t2 if level.t2 is not notpresent else level.t1
+                for level in tree[report_type]
+            }
+    return result
+
+
+def group_diff_paths(diff_paths: Mapping) -> Dict:
+    """Return the differences keyed by tuples of keys and indexes as nested dicts, the output of diff_generator.
+
+    Each difference is nested under the string keys of its path, list indexes and other keys are left out. Items
+    added to or removed from a list are gathered under the path of the list, in "new" and "missing" lists. A path
+    without string keys is rendered as a single key, such as "index_element[0]". The differences left out of a
+    bounded result are counted under the "_truncated" key, by top-level key.
+
+    Args:
+        diff_paths: differences from json_diff(t1, t2, view="paths") or tree_paths.
+
+    Example:
+        >>> group_diff_paths({"dictionary_item_removed": [("Ethernet1", "ip address")]})
+        {'Ethernet1': {'ip address': 'missing'}}
+    """
+    result = {}  # type: Dict
+    borrowed = set()  # type: Set[int]
+    for path, change in diff_paths.get("values_changed", {}).items():
+        _merge_path(result, path, change, borrowed)
+    for path in diff_paths.get("dictionary_item_removed", ()):
+        _merge_path(result, path, "missing", borrowed)
+    for path in diff_paths.get("dictionary_item_added", ()):
+        _merge_path(result, path, "new", borrowed)
+
+    defaultdict_list = partial(defaultdict, list)  # type: partial
+    items = defaultdict(defaultdict_list)  # type: DefaultDict
+    for report_type, status in (("iterable_item_removed", "missing"), ("iterable_item_added", "new")):
+        for path, value in diff_paths.get(report_type, {}).items():
+            parent = path[:-1]
+            # Items of lists at the root, or nested in lists only, stay keyed by their own path.
+            items[parent if _string_keys(parent) else path][status].append(value)
+    for path, value in items.items():
+        _merge_path(result, path, value, borrowed)
+    for path, count in diff_paths.get(TRUNCATED, {}).items():
+        key = path[0] if path and isinstance(path[0], str) else render_path(path, root="index_element")
+        result.setdefault(TRUNCATED_KEY, {})[key] = count
+    return result
+
+
+def _string_keys(path: Sequence[Hashable]) -> List[str]:
+    """Return the string keys of a path."""
+    return [key for key in path if isinstance(key, str)]
+
+
+def _merge_path(result: Dict, path: Sequence[Hashable], value: Any, borrowed: Set[int]) -> None:
+    """Merge value into result, nested under the string keys of path, see dict_merger for borrowed."""
+    keys = _string_keys(path) or [render_path(path, root="index_element")]
+    dict_merger(result, group_value(keys, value), borrowed)
+
+
+def split_dicts(pre: Dict, post: Dict, path: Tuple[Hashable, ...] = ()) -> Optional[Tuple[Dict, List[str]]]:
+    """Return the keys added to and removed from a dict the engines walk key by key, and the keys it kept.
+
+    The engines compare the values of the kept keys one by one, so their differences can be computed apart and
+    merged after the keys added and removed, see merge_diff_paths.
+
+    Args:
+        pre: reference dict.
+        post: dict to compare.
+        path: keys and indexes leading to the dicts, prepended to the paths of the differences.
+
+    Returns:
+        The keys added and removed, keyed by report type like json_diff(t1, t2, view="paths"), and the keys of
+        post also in pre. None when the engines report the dicts as a whole: pre has keys that are not strings, or
+        too few keys are kept.
+    """
+    if not all(type(key) is str for key in pre):
+        return None
+    common = [key for key in post if key in pre]
+    added = [key for key in post if key not in pre]
+    removed = [key for key in pre if key not in post]
+    union = len(common) + len(added) + len(removed)
+    if union > 1 and len(common) / union < THRESHOLD_TO_DIFF_DEEPER:
+        return None
+    diff_paths = {}
+    if removed:
+        diff_paths[DICTIONARY_ITEM_REMOVED] = [path + (key,) for key in removed]
+    if added:
+        diff_paths[DICTIONARY_ITEM_ADDED] = [path + (key,) for key in added]
+    return diff_paths, common
+
+
+def split_lists(pre: List, post: List, path: Tuple[Hashable, ...] = ()) -> Optional[Tuple[Dict, range]]:
+    """Return the items added to or removed from the end of a list the engines compare position by position.
+
+    Without list_key and ignore_order, the engines compare the items at the same position one by one, so their
+    differences can be computed apart and merged before the items added or removed, see merge_diff_paths.
+
+    Args:
+        pre: reference list.
+        post: list to compare.
+        path: keys and indexes leading to the lists, prepended to the paths of the differences.
+
+    Returns:
+        The items added or removed, keyed by report type like json_diff(t1, t2, view="paths"), and the positions
+        in both lists. None when all items are basic values, as the engines then align the lists with difflib.
+    """
+    if all(isinstance(item, BASIC_TYPES) for item in pre) and all(isinstance(item, BASIC_TYPES) for item in post):
+        return None
+    diff_paths = {}
+    if len(pre) > len(post):
+        diff_paths[ITERABLE_ITEM_REMOVED] = {path + (index,): pre[index] for index in range(len(post), len(pre))}
+    elif len(post) > len(pre):
+        diff_paths[ITERABLE_ITEM_ADDED] = {path + (index,): post[index] for index in range(len(pre), len(post))}
+    return diff_paths, range(min(len(pre), len(post)))
+
+
+def prefix_diff_paths(diff_paths: Mapping, prefix: Tuple[Hashable, ...]) -> Dict:
+    """Return differences keyed by tuples of keys and indexes, with prefix prepended to their paths."""
+    result = {}  # type: Dict[str, Any]
+    for report_type, report in diff_paths.items():
+        if isinstance(report, dict):
+            result[report_type] = {prefix + path: value for path, value in report.items()}
+        else:
+            result[report_type] = [prefix + path for path in report]
+    return result
+
+
+def merge_diff_paths(diff_paths: Dict, other: Mapping) -> None:
+    """Merge the differences of other into diff_paths, both keyed by tuples of keys and indexes, after its own."""
+    for report_type, report in other.items():
+        if isinstance(report, dict):
+            diff_paths.setdefault(report_type, {}).update(report)
+        else:
+            diff_paths.setdefault(report_type, []).extend(report)
+
 
 def get_diff_iterables_items(diff_result: Mapping) -> DefaultDict:
     """Helper function for diff_generator to postprocess changes reported by DeepDiff for iterables.
@@ -64,12 +235,13 @@ def fix_deepdiff_key_names(obj: Mapping) -> Dict:
                                                 'is_up': {'new_value': False, 'old_value': True}}}
     """
     result = {}  # type: Dict
+    borrowed = set()  # type: Set[int]
     for key, value in obj.items():
         key_parts = re.findall(REGEX_PATTERN_RELEVANT_KEYS, key)
         if not key_parts:  # If key parts can't be find, keep original key so data is not lost.
             key_parts = [key.replace("root", "index_element")]  # replace root from DeepDiff with more meaningful name.
         partial_res = group_value(key_parts, value)
-        dict_merger(result, partial_res)
+        dict_merger(result, partial_res, borrowed)
     return result
 
 
@@ -80,15 +252,28 @@ def group_value(tree_list: List, value: Dict) -> Dict:
     return value
 
 
-def dict_merger(original_dict: Dict, dict_to_merge: Dict):
-    """Function to merge a dictionary (dict_to_merge) recursively into the original_dict."""
-    for key in dict_to_merge.keys():
-        if key in original_dict and isinstance(original_dict[key], dict) and isinstance(dict_to_merge[key], dict):
-            dict_merger(original_dict[key], dict_to_merge[key])
-        elif key in original_dict.keys():
-            original_dict[key + "_dup!"] = dict_to_merge[key]  # avoid overwriting existing keys.
-        else:
-            original_dict[key] = dict_to_merge[key]
+def dict_merger(original_dict: Dict, dict_to_merge: Dict, borrowed: Optional[Set[int]] = None):
+    """Function to merge a dictionary (dict_to_merge) recursively into the original_dict.
+
+    Values of dict_to_merge are added to original_dict without copying them, and their ids are kept in borrowed:
+    a dict added this way is copied before anything is merged into it, so the merged values, often the compared
+    data itself, are never modified. Pass the same borrowed set to successive merges into the same original_dict.
+    """
+    if borrowed is None:
+        borrowed = set()
+    for key, value in dict_to_merge.items():
+        existing = original_dict.get(key, _MISSING)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            if id(existing) in borrowed:
+                existing = original_dict[key] = dict(existing)
+                borrowed.update(id(child) for child in existing.values() if isinstance(child, dict))
+            dict_merger(existing, value, borrowed)
+            continue
+        if existing is not _MISSING:
+            key = key + "_dup!"  # avoid overwriting existing keys.
+        original_dict[key] = value
+        if isinstance(value, dict):
+            borrowed.add(id(value))
 
 
 def _parse_index_element_string(index_element_string):
@@ -145,6 +330,9 @@ def parse_diff(jdiff_evaluate_response, actual, intended, match_config):
     def process_diff(_map, extra_map, missing_map, previous_key=None):
         """Process the diff recursively."""
         for key, value in _map.items():
+            if key == TRUNCATED_KEY and previous_key is None:
+                # Differences left out of a bounded result can't be put back together.
+                continue
             if isinstance(value, dict) and all(nested_key in value for nested_key in ("new_value", "old_value")):
                 extra_map[key] = value["new_value"]
                 missing_map[key] = value["old_value"]
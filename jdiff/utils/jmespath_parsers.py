@@ -7,9 +7,87 @@ evaluated bit of it, the second will target the reference key relative to the va
 """
 
 import re
-from typing import List, Mapping, Union
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
 
 import jmespath
+from jmespath.parser import ParsedResult
+
+from .simple_path import SimplePath, compile_simple_path
+
+# Upper bound of distinct expressions kept compiled by compile_expression().
+EXPRESSION_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str) -> Union[SimplePath, ParsedResult]:
+    """
+    Compile a jmespath expression and keep it in a process-wide LRU cache.
+
+    The same handful of expressions is usually evaluated against many devices, so lexing and parsing
+    happens only the first time an expression is seen. Least recently used expressions are evicted once
+    EXPRESSION_CACHE_SIZE distinct expressions have been compiled.
+
+    Hit/miss counters are available via `compile_expression.cache_info()` and the cache can be reset
+    with `compile_expression.cache_clear()`.
+
+    Expressions made only of keys, `[index]`, `[*]`, `*`, multiselect lists, `[]` and pipes are evaluated by
+    a `SimplePath` walker built from the jmespath syntax tree, returning the same result as the jmespath
+    interpreter. Anything else, i.e. filters or functions, is evaluated by jmespath.
+
+    Args:
+        expression: "result[0].vrfs.default.peerList[*].[prefixesReceived]"
+
+    Return:
+        Compiled expression exposing a `search(data)` method.
+    """
+    parsed = jmespath.compile(expression)
+    return compile_simple_path(parsed) or parsed
+
+
+# Leading path segment made of a plain or quoted key, optionally followed by list indexes, i.e. 'result[0]'.
+# Quoted keys containing '.' are left out, as the other parsers split paths on '.'.
+PREFIX_SEGMENT_REGEX = re.compile(
+    r'(?P<key>[A-Za-z_][A-Za-z0-9_]*|"[^".\\$]*")?(?P<indexes>(?:\[-?\d+\])*)(?:\.(?=[^.])|$)'
+)
+# Operators evaluating an operand against the current node, i.e. 'a.b || c', make a path unsplittable.
+UNSPLITTABLE_PATH_REGEX = re.compile(r"[|&=<>!(]")
+
+
+def split_path_prefix(path: str) -> Tuple[Tuple[Union[str, int], ...], str]:
+    """
+    Split the leading keys and list indexes of a path from the rest of the expression.
+
+    The prefix selects a single sub-tree of the data, so it can be walked once and shared by every path
+    starting with it. The remainder gives the same result when evaluated against that sub-tree.
+    Paths using pipes, logical or comparison operators or functions are never split.
+
+    Args:
+        path: "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]"
+
+    Return:
+        (("result", 0, "vrfs", "default"), "peerList[*].[$peerAddress$,prefixesReceived]")
+    """
+    prefix = []  # type: List[Union[str, int]]
+    position = 0
+    if UNSPLITTABLE_PATH_REGEX.search(path):
+        return (), path
+    while position < len(path):
+        match = PREFIX_SEGMENT_REGEX.match(path, position)
+        if not match or match.end() == position or not (match.group("key") or match.group("indexes")):
+            break
+        key = match.group("key")
+        if key:
+            prefix.append(key.strip('"'))
+        prefix.extend(int(index) for index in re.findall(r"-?\d+", match.group("indexes")))
+        position = match.end()
+    remainder = path[position:] or "@"
+    if prefix and remainder.startswith(("*", "$*")):
+        # A leading "*" binds the rest of the expression differently from "a.*", i.e. "*.b.[c]" projects "[c]"
+        # while "a.*.b.[c]" applies it to the projection. A bare "*" also means the whole data set in jdiff.
+        remainder = "@." + remainder
+    return tuple(prefix), remainder
 
 
 def jmespath_value_parser(path: str) -> str:
@@ -135,38 +213,99 @@ def keys_values_zipper(list_of_reference_keys: List, wanted_value_with_key: List
     return final_result
 
 
-def multi_reference_keys(jmspath: str, data):
-    """Build a list of concatenated reference keys.
+def keys_values_mapping(list_of_reference_keys: List, wanted_value_with_key: List) -> Dict:
+    """Build a dictionary mapping each reference key to its values, in data order.
+
+    Args:
+        list_of_reference_keys: ["10.1.0.0", "10.2.0.0"]
+        wanted_value_with_key: [{"state": "Idle"}, {"state": "Established"}]
+
+    Returns:
+        {"10.1.0.0": {"state": "Idle"}, "10.2.0.0": {"state": "Established"}}
+    """
+    if len(list_of_reference_keys) != len(wanted_value_with_key):
+        raise ValueError("Keys len != from Values len")
+
+    final_result = dict(zip(list_of_reference_keys, wanted_value_with_key))
+    if len(final_result) != len(list_of_reference_keys):
+        check_unique_keys(list_of_reference_keys)
+    return final_result
+
+
+def check_unique_keys(list_of_reference_keys: List) -> None:
+    """Raise ValueError when reference keys hold duplicates, which a mapping can't hold.
+
+    Args:
+        list_of_reference_keys: ["10.1.0.0", "10.2.0.0"]
+    """
+    counts = Counter(list_of_reference_keys)
+    if len(counts) != len(list_of_reference_keys):
+        duplicates = sorted({str(key) for key, count in counts.items() if count > 1})
+        raise ValueError(
+            f"Reference keys must be unique to build a mapping, use a list output. Duplicates: {duplicates}"
+        )
+
+
+def multi_reference_key_paths(jmspath: str) -> List[str]:
+    """Build the jmespath expressions returning the data each reference key anchor is taken from.
 
     Args:
         jmspath (str): "$*$.peers.$*$.*.ipv4.[accepted_prefixes]"
-        data (dict): tests/mock/napalm_get_bgp_neighbors/multi_vrf.json
 
-    Returns (str):
-        ["global.10.1.0.0", "global.10.2.0.0", "global.10.64.207.255", "global.7.7.7.7", "vpn.10.1.0.0", "vpn.10.2.0.0"]
+    Returns (list):
+        ["@", "*.peers | []"]
     """
     ref_key_regex = re.compile(r"\$.*?\$")
-    mapping = []
+    key_paths = []
     split_path = jmspath.split(".")
 
-    ref_key_index = -1  # -1 as the starting value, so it will match split path list indexes
     for index, element in enumerate(split_path):
         if ref_key_regex.search(element):
-            ref_key_index += 1
             key_path = (
                 ".".join(split_path[:index]).replace("$", "") or "@"
             )  # @ is for top keys, as they are stripped with "*"
-            flat_path = f"{key_path}{' | []' * key_path.count('*')}"  # | [] to flatten the data, nesting level is eq to "*" count
-            sub_data = jmespath.search(flat_path, data)  # extract sub-data with up to the ref key
-            if isinstance(sub_data, dict):
-                keys = list(sub_data.keys())
-            elif isinstance(sub_data, list):
-                keys = []
-                for parent, children in zip(
-                    mapping[ref_key_index - 1], sub_data
-                ):  # refer to previous keys as they are already present in mapping
-                    keys.extend(f"{parent}.{child}" for child in children.keys())  # concatenate keys
-            else:
-                raise ValueError("Ref key anchor must return either a dict or a list.")
-            mapping.append(keys)
+            key_paths.append(
+                f"{key_path}{' | []' * key_path.count('*')}"
+            )  # | [] to flatten the data, nesting level is eq to "*" count
+    return key_paths
+
+
+def concatenate_reference_keys(sub_data_per_anchor: Iterable) -> List:
+    """Build a list of concatenated reference keys from the data extracted for each anchor.
+
+    Args:
+        sub_data_per_anchor: data returned by each expression of `multi_reference_key_paths`, in order.
+
+    Returns (list):
+        ["global.10.1.0.0", "global.10.2.0.0", "global.10.64.207.255", "global.7.7.7.7", "vpn.10.1.0.0", "vpn.10.2.0.0"]
+    """
+    mapping = []  # type: List[List]
+    for ref_key_index, sub_data in enumerate(sub_data_per_anchor):
+        if isinstance(sub_data, dict):
+            keys = list(sub_data.keys())
+        elif isinstance(sub_data, list):
+            keys = []
+            for parent, children in zip(
+                mapping[ref_key_index - 1], sub_data
+            ):  # refer to previous keys as they are already present in mapping
+                keys.extend(f"{parent}.{child}" for child in children.keys())  # concatenate keys
+        else:
+            raise ValueError("Ref key anchor must return either a dict or a list.")
+        mapping.append(keys)
     return mapping[-1]  # return last element as it has all previous ref_keys concatenated.
+
+
+def multi_reference_keys(jmspath: str, data):
+    """Build a list of concatenated reference keys.
+
+    Args:
+        jmspath (str): "$*$.peers.$*$.*.ipv4.[accepted_prefixes]"
+        data (dict): tests/mock/napalm_get_bgp_neighbors/multi_vrf.json
+
+    Returns (str):
+        ["global.10.1.0.0", "global.10.2.0.0", "global.10.64.207.255", "global.7.7.7.7", "vpn.10.1.0.0", "vpn.10.2.0.0"]
+    """
+    return concatenate_reference_keys(
+        compile_expression(key_path).search(data)  # extract sub-data with up to the ref key
+        for key_path in multi_reference_key_paths(jmspath)
+    )
@@ -0,0 +1,182 @@
+"""Incremental JSON reading utilities.
+
+Read NDJSON (one JSON document per line) or a top-level JSON array record by record, so memory usage is bounded
+by the largest single record instead of the whole file.
+"""
+
+import codecs
+import json
+import os
+from typing import IO, Any, Iterator, Optional, Union
+
+# Number of characters requested from the stream per read.
+DEFAULT_READ_SIZE = 64 * 1024
+
+STREAM_FORMATS = ("auto", "array", "ndjson")
+
+WHITESPACE = " \t\n\r"
+
+NUMBER_CHARACTERS = "0123456789+-.eE"
+
+
+class _StreamBuffer:
+    """Text buffer over a text or binary stream, keeping only the part not consumed yet."""
+
+    def __init__(self, stream: IO, read_size: int) -> None:
+        """__init__ method for _StreamBuffer class."""
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder: Optional[codecs.IncrementalDecoder] = None
+        self.text = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self, size: Optional[int] = None) -> None:
+        """Drop consumed text and append at least one more chunk from the stream."""
+        chunk = self.stream.read(size or self.read_size)
+        if not chunk:
+            self.eof = True
+        if isinstance(chunk, bytes):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            # A multi-byte character split between two reads is held back by the decoder until completed.
+            chunk = self.decoder.decode(chunk, final=self.eof)
+        self.text = self.text[self.position :] + chunk
+        self.position = 0
+
+    def skip_whitespace(self) -> Optional[str]:
+        """Move past whitespace and return the next character, None at the end of the stream."""
+        while True:
+            while self.position < len(self.text) and self.text[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if self.eof:
+                return None
+            self.fill()
+
+
+def iter_json_records(
+    source: Union[str, os.PathLike, IO], fmt: str = "auto", read_size: int = DEFAULT_READ_SIZE
+) -> Iterator[Any]:
+    r"""Yield the records of an NDJSON file or of a top-level JSON array, one at a time.
+
+    Args:
+        source: path of the file to read, or a text or binary stream opened for reading.
+        fmt: "ndjson" for one JSON document per line, "array" for a top-level JSON array, "auto" to detect
+            the format from the first character, "[" meaning array.
+        read_size: number of characters requested from the stream per read.
+
+    Returns:
+        Iterator over the decoded records. The file, when a path is given, is closed once the iterator is exhausted.
+
+    Example:
+        >>> import io
+        >>> list(iter_json_records(io.StringIO('[{"state": "Idle"}, {"state": "Established"}]')))
+        [{'state': 'Idle'}, {'state': 'Established'}]
+        >>> list(iter_json_records(io.StringIO('{"state": "Idle"}\n{"state": "Established"}\n')))
+        [{'state': 'Idle'}, {'state': 'Established'}]
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"'fmt' argument should be one of the following: {', '.join(STREAM_FORMATS)}. You have: {fmt}")
+    if not isinstance(read_size, int) or read_size < 1:
+        raise ValueError(f"read_size must be a positive integer. You have {read_size}")
+    return _iter_source_records(source, fmt, read_size)
+
+
+def _iter_source_records(source: Union[str, os.PathLike, IO], fmt: str, read_size: int) -> Iterator[Any]:
+    """Yield records from a path or an open stream, opening the file only once iteration starts."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield from _iter_stream_records(stream, fmt, read_size)
+    else:
+        yield from _iter_stream_records(source, fmt, read_size)
+
+
+def _iter_stream_records(stream: IO, fmt: str, read_size: int) -> Iterator[Any]:
+    """Yield records from an open stream."""
+    buffer = _StreamBuffer(stream, read_size)
+    first_character = buffer.skip_whitespace()
+    if first_character is None:
+        if fmt == "array":
+            raise ValueError("Expecting a JSON array, the stream is empty.")
+        return
+    if fmt == "array" or (fmt == "auto" and first_character == "["):
+        yield from _iter_array_records(buffer)
+    else:
+        yield from _iter_ndjson_records(buffer)
+
+
+def _iter_ndjson_records(buffer: _StreamBuffer) -> Iterator[Any]:
+    """Yield one record per non-blank line."""
+    line_number = 0
+    while True:
+        end = buffer.text.find("\n", buffer.position)
+        while end == -1 and not buffer.eof:
+            searched = len(buffer.text) - buffer.position
+            # Read at least as much again, so a long line is copied a logarithmic number of times.
+            buffer.fill(max(buffer.read_size, searched))
+            end = buffer.text.find("\n", searched)
+        if end == -1:
+            # Last line, without a trailing newline.
+            if buffer.position >= len(buffer.text):
+                return
+            end = len(buffer.text)
+        line = buffer.text[buffer.position : end]
+        buffer.position = end + 1
+        line_number += 1
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"Invalid JSON on line {line_number}: {error}") from error
+
+
+def _is_number(value: Any) -> bool:
+    """Return True for JSON numbers, booleans excluded."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _iter_array_records(buffer: _StreamBuffer) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    if buffer.skip_whitespace() != "[":
+        raise ValueError("Expecting a JSON array, the stream does not start with '['.")
+    buffer.position += 1
+
+    expect_separator = False
+    while True:
+        character = buffer.skip_whitespace()
+        if character is None:
+            raise ValueError("Unterminated JSON array, the stream ended before ']'.")
+        if character == "]":
+            buffer.position += 1
+            if buffer.skip_whitespace() is not None:
+                raise ValueError("Unexpected data after the end of the JSON array.")
+            return
+        if expect_separator:
+            if character != ",":
+                raise ValueError(f"Expecting ',' or ']' between array elements, found {character!r}.")
+            buffer.position += 1
+            buffer.skip_whitespace()
+
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer.text, buffer.position)
+            except json.JSONDecodeError:
+                if buffer.eof:
+                    raise
+                # The record is not complete yet: read at least as much again, so a large record is
+                # decoded a logarithmic number of times.
+                buffer.fill(max(buffer.read_size, len(buffer.text) - buffer.position))
+                continue
+            if not buffer.eof and (
+                end == len(buffer.text) or (_is_number(record) and buffer.text[end] in NUMBER_CHARACTERS)
+            ):
+                # A number at the end of the buffer may continue in the next chunk, i.e. "-1" then ".5".
+                buffer.fill()
+                continue
+            break
+        buffer.position = end
+        expect_separator = True
+        yield record
@@ -0,0 +1,279 @@
+"""Fast evaluation of the jmespath subset most jdiff paths are written in.
+
+Expressions made only of keys, list indexes `[0]`, list projections `[*]`, object projections `*`, multiselect
+lists `[a,b]`, flattening `[]` and pipes are compiled once into a chain of plain Python functions. The functions
+are built from the syntax tree jmespath parses, so they evaluate exactly like `jmespath.search` without going
+through the visitor dispatch of the jmespath interpreter.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+Walker = Callable[[Any], Any]
+
+# jmespath syntax tree nodes applying their children one after the other.
+CHAIN_NODES = frozenset(("subexpression", "index_expression", "pipe"))
+SUPPORTED_NODES = CHAIN_NODES | frozenset(
+    (
+        "field",
+        "index",
+        "projection",
+        "value_projection",
+        "multi_select_list",
+        "flatten",
+        "identity",
+        "current",
+    )
+)
+
+
+class SimplePath:
+    """Compiled simple path, exposing the same `search(data)` method as a compiled jmespath expression.
+
+    Attributes:
+        expression: original expression.
+        parsed: jmespath syntax tree the walker is built from.
+    """
+
+    def __init__(self, expression: str, parsed: Dict) -> None:
+        """__init__ method for SimplePath class."""
+        self.expression = expression
+        self.parsed = parsed
+        self._walk = _compile_node(parsed)
+
+    def search(self, data: Any) -> Any:
+        """Evaluate the expression against data."""
+        return self._walk(data)
+
+    def __repr__(self) -> str:
+        """Return the representation of the path."""
+        return f"{self.__class__.__name__}({self.expression!r})"
+
+
+def is_simple_path(parsed: Dict) -> bool:
+    """Return True when every node of a jmespath syntax tree can be evaluated by SimplePath."""
+    stack = [parsed]
+    while stack:
+        node = stack.pop()
+        if node["type"] not in SUPPORTED_NODES:
+            return False
+        stack.extend(node["children"])
+    return True
+
+
+def compile_simple_path(expression: Union[str, ParsedResult]) -> Optional[SimplePath]:
+    """Return a SimplePath for expression, None when the expression needs the full jmespath interpreter.
+
+    Args:
+        expression: "result[0].vrfs.default.peerList[*].[peerAddress,prefixesReceived]", or the same
+            expression already compiled by `jmespath.compile`.
+
+    Returns:
+        SimplePath evaluating the expression, or None.
+
+    Example:
+        >>> compile_simple_path("peers[*].state").search({"peers": [{"state": "Idle"}, {"state": "Active"}]})
+        ['Idle', 'Active']
+        >>> compile_simple_path("peers[?state=='Idle']") is None
+        True
+    """
+    if isinstance(expression, str):
+        expression = jmespath.compile(expression)
+    if not is_simple_path(expression.parsed):
+        return None
+    return SimplePath(expression.expression, expression.parsed)
+
+
+def list_depth(parsed: Dict) -> Optional[int]:
+    """Return the number of nested list levels of the result of a jmespath syntax tree.
+
+    Each projection applied to the rest of the expression and each multiselect list add one level, i.e. 2 for
+    "peerList[*].[peerAddress,state]". Leaf values are not counted, as they depend on the data.
+
+    Returns:
+        Number of list levels, or None when it can not be known from the syntax tree alone.
+    """
+    node_type = parsed["type"]
+    children = parsed["children"]
+    if node_type in ("projection", "value_projection", "filter_projection"):
+        if list_depth(children[0]) != 0:
+            # A projection applied to the result of another projection, i.e. "a.*.b.*.c".
+            return None
+        rest = list_depth(children[1])
+        return None if rest is None else rest + 1
+    if node_type in CHAIN_NODES:
+        if any(list_depth(child) != 0 for child in children[:-1]):
+            return None
+        return list_depth(children[-1]) if children else 0
+    if node_type == "multi_select_list":
+        return 1
+    if node_type in ("field", "index", "identity", "current", "literal"):
+        return 0
+    return None
+
+
+def _identity(value: Any) -> Any:
+    """Return value unchanged."""
+    return value
+
+
+def _compile_node(node: Dict) -> Walker:
+    """Build the function evaluating a jmespath syntax tree node.
+
+    Every supported node evaluates to None when applied to None, so chains stop at the first None.
+    """
+    node_type = node["type"]
+    if node_type in CHAIN_NODES:
+        return _compile_chain(node)
+    if node_type in ("field", "index"):
+        return _compile_lookups([node])
+    if node_type == "projection":
+        return _compile_projection(node, values=False)
+    if node_type == "value_projection":
+        return _compile_projection(node, values=True)
+    if node_type == "multi_select_list":
+        return _compile_multiselect(node)
+    if node_type == "flatten":
+        return _compile_flatten(node)
+    # identity and current node
+    return _identity
+
+
+def _chain_nodes(node: Dict) -> List[Dict]:
+    """Return the nodes a chain applies in order, with nested chains expanded."""
+    if node["type"] not in CHAIN_NODES:
+        return [node]
+    nodes = []
+    for child in node["children"]:
+        nodes.extend(_chain_nodes(child))
+    return [child for child in nodes if child["type"] not in ("identity", "current")]
+
+
+def _compile_chain(node: Dict) -> Walker:
+    """Build the function applying each node of a chain to the result of the previous one."""
+    walkers: List[Walker] = []
+    lookups: List[Dict] = []
+    for child in _chain_nodes(node):
+        if child["type"] in ("field", "index"):
+            # Consecutive keys and list indexes are resolved by a single loop.
+            lookups.append(child)
+            continue
+        if lookups:
+            walkers.append(_compile_lookups(lookups))
+            lookups = []
+        walkers.append(_compile_node(child))
+    if lookups:
+        walkers.append(_compile_lookups(lookups))
+
+    if not walkers:
+        return _identity
+    if len(walkers) == 1:
+        return walkers[0]
+
+    def chain(value: Any) -> Any:
+        for walker in walkers:
+            value = walker(value)
+            if value is None:
+                return None
+        return value
+
+    return chain
+
+
+def _compile_lookups(nodes: List[Dict]) -> Walker:
+    """Build the function resolving consecutive keys and list indexes.
+
+    Keys of anything but a mapping and indexes of anything but a list are None.
+    """
+    steps = tuple((node["type"] == "field", node["value"]) for node in nodes)
+
+    def lookup(value: Any) -> Any:
+        for is_field, argument in steps:
+            if is_field:
+                try:
+                    value = value.get(argument)
+                except AttributeError:
+                    return None
+            else:
+                if not isinstance(value, list):
+                    return None
+                try:
+                    value = value[argument]
+                except IndexError:
+                    return None
+            if value is None:
+                return None
+        return value
+
+    return lookup
+
+
+def _compile_projection(node: Dict, values: bool) -> Walker:
+    """Build the function applying the right side to each element of a list, or each value of a mapping.
+
+    Projections applied to the wrong type are None, and None results are dropped.
+    """
+    left = _compile_node(node["children"][0])
+    right = _compile_node(node["children"][1])
+
+    def project(value: Any) -> Any:
+        base = left(value)
+        if values:
+            try:
+                base = base.values()
+            except AttributeError:
+                return None
+        elif not isinstance(base, list):
+            return None
+        if right is _identity:
+            return [element for element in base if element is not None]
+        return [result for result in map(right, base) if result is not None]
+
+    return project
+
+
+def _compile_multiselect(node: Dict) -> Walker:
+    """Build the function returning the list of the selected values, None when applied to None."""
+    children = node["children"]
+    if all(child["type"] == "field" for child in children):
+        names = tuple(child["value"] for child in children)
+
+        def select_fields(value: Any) -> Any:
+            if value is None:
+                return None
+            try:
+                return [value.get(name) for name in names]
+            except AttributeError:
+                return [None] * len(names)
+
+        return select_fields
+
+    walkers = tuple(_compile_node(child) for child in children)
+
+    def select(value: Any) -> Any:
+        if value is None:
+            return None
+        return [walker(value) for walker in walkers]
+
+    return select
+
+
+def _compile_flatten(node: Dict) -> Walker:
+    """Build the function merging nested lists one level, None when applied to anything but a list."""
+    child = _compile_node(node["children"][0])
+
+    def flatten(value: Any) -> Any:
+        base = child(value)
+        if not isinstance(base, list):
+            return None
+        merged: List[Any] = []
+        for element in base:
+            if isinstance(element, list):
+                merged.extend(element)
+            else:
+                merged.append(element)
+        return merged
+
+    return flatten
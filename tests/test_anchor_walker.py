@@ -0,0 +1,240 @@
+"""Test single traversal extraction of anchored paths against the legacy extraction."""
+
+import pytest
+
+from jdiff import JdiffPath, extract_data_from_json, iter_anchored_records
+from jdiff.utils.anchor_walker import compile_anchor_walker, compile_nested_anchor_walker
+
+from .utility import ASSERT_FAIL_MESSAGE, load_json_file, load_mocks
+
+
+def legacy_extract(data, path):
+    """Return the result of the legacy extraction, or the exception it raises."""
+    legacy_path = JdiffPath(path)
+    legacy_path.anchor_walker = None
+    try:
+        return extract_data_from_json(data, legacy_path)
+    except (TypeError, ValueError) as error:
+        return type(error), str(error)
+
+
+def walker_extract(data, path):
+    """Return the result of the extraction using the anchor walker, or the exception it raises."""
+    try:
+        return extract_data_from_json(data, JdiffPath(path))
+    except (TypeError, ValueError) as error:
+        return type(error), str(error)
+
+
+peers = {
+    "peerList": [
+        {"peerAddress": "10.2.0.0", "state": "Established", "prefixesReceived": 10, "peerGroup": None},
+        {"peerAddress": "10.1.0.0", "state": "Idle", "prefixesReceived": 0},
+        None,
+        {"peerAddress": "10.1.0.0", "state": "Active", "prefixesReceived": 2},
+    ],
+    "peers": {
+        "10.2.0.0": {"state": "Established", "asn": 65002},
+        "10.1.0.0": {"state": "Idle", "asn": 65001, "extra": None},
+    },
+}
+
+edge_cases = [
+    (peers, "peerList[*].[$peerAddress$,state]"),
+    (peers, "peerList[*].[$peerAddress$, state, prefixesReceived]"),
+    (peers, "peerList[*].[state,$peerAddress$,peerGroup]"),
+    (peers, "peerList[*].[$prefixesReceived$,peerAddress]"),
+    (peers, "peerList[*].[$peerAddress$,missing]"),
+    (peers, "peers.$*$.state"),
+    (peers, "peers.$*$.[state,asn]"),
+    (peers, "peers.$*$.[extra]"),
+    (peers, "peers.$*$.extra"),
+    (peers, "peers.*.[$state$,asn]"),
+    (peers, "$*$.state"),
+    (peers["peers"], "$*$.state"),
+    (peers["peerList"], "[*].[$peerAddress$,state]"),
+    (peers, "missing[*].[$peerAddress$,state]"),
+    (peers, "missing.$*$.state"),
+    (peers, "peers[*].[$peerAddress$,state]"),
+    (peers, "peerList.$*$.state"),
+    ({"peerList": [{"state": "Idle"}]}, "peerList[*].[$peerAddress$,state]"),
+    ({"peerList": ["10.1.0.0"]}, "peerList[*].[$peerAddress$,state]"),
+    ({"peerList": [{"peerAddress": "10.1.0.0", "state": ["Idle"]}]}, "peerList[*].[$peerAddress$,state]"),
+    ({"peerList": [{"peerAddress": "10.1.0.0", "state": {"a": 1}}]}, "peerList[*].[$peerAddress$,state]"),
+    ({"peerList": [{"peerAddress": ["10.1.0.0"], "state": "Idle"}]}, "peerList[*].[$peerAddress$,state]"),
+    (
+        {"peerList": [{"peerAddress": 1, "state": "Idle"}, {"peerAddress": "a", "state": "Idle"}]},
+        "peerList[*].[$peerAddress$,state]",
+    ),
+    ({"peers": {"a": {"state": {"b": 1}}}}, "peers.$*$.state"),
+    ({"peers": {"a": {"state": [1, 2]}}}, "peers.$*$.state"),
+    ({"peers": {"a": None, "b": {"state": 1}}}, "peers.$*$.state"),
+    ({"peers": {"a": "text", "b": {"state": 1}}}, "peers.$*$.[state]"),
+    ({"peers": {}}, "peers.$*$.state"),
+    ({"peerList": []}, "peerList[*].[$peerAddress$,state]"),
+]
+
+
+@pytest.mark.parametrize("data, path", edge_cases)
+def test_anchor_walker_matches_legacy(data, path):
+    """Assert the anchor walker returns, or raises, what the legacy extraction does."""
+    output = walker_extract(data, path)
+    expected_output = legacy_extract(data, path)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+mock_cases = [
+    ("napalm_get_bgp_neighbors", "pre.json", "global.peers.$*$.is_enabled"),
+    ("napalm_get_bgp_neighbors", "pre.json", "global.peers.$*$.[is_enabled,is_up]"),
+    ("napalm_get_bgp_neighbors", "multi_vrf.json", "$*$.router_id"),
+    ("api", "pre.json", "result[0].vrfs.default.peerList[*].[$peerAddress$,state]"),
+    ("api", "pre.json", "result[0].vrfs.default.peerList[*].[$peerAddress$,peerGroup,vrf,state]"),
+    ("api", "pre.json", "result[0].vrfs.default.peerList[*].[$peerAddress$,state,bgpPeerCaps]"),
+    ("textfsm", "pre.json", "result[*].[$bgp_neigh$,state]"),
+    ("textfsm_ospf_int_br", "pre.json", "[*].[$interface$,area,ip_address_mask,cost,state,neighbors_fc]"),
+    ("napalm_get_lldp_neighbors", "pre.json", "*.[$hostname$,port]"),
+]
+
+
+@pytest.mark.parametrize("folder, filename, path", mock_cases)
+def test_anchor_walker_mock(folder, filename, path):
+    """Assert the anchor walker matches the legacy extraction on device output."""
+    data = load_json_file(folder, filename)
+    output = walker_extract(data, path)
+    expected_output = legacy_extract(data, path)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize(
+    "path, supported",
+    [
+        ("result[0].vrfs.default.peerList[*].[$peerAddress$,state]", True),
+        ("result[0].interfaces.*.[$name$,interfaceStatus]", True),
+        ("result[0].interfaces.$*$.interfaceStatus", True),
+        ("global.peers.$*$.[is_enabled,is_up]", True),
+        ("[*].[$interface$,link_status]", True),
+        ("result[*].interfaces.*.[$name$,interfaceStatus]", False),
+        ("global.peers.$*$.*.ipv4.[accepted_prefixes]", False),
+        ("global.$peers$.*.*.ipv4.[accepted_prefixes]", False),
+        ("result[0].$vrfs$.default.peerList[*].[peerAddress,prefixesReceived]", False),
+        ("result[0].vrfs.default.peerList[0].[$peerAddress$,state]", False),
+    ],
+)
+def test_compile_anchor_walker(path, supported):
+    """Assert which shapes of path are extracted in a single traversal."""
+    walker = compile_anchor_walker(path, JdiffPath(path).value_path) if path.count("$") == 2 else None
+    assert (walker is not None) == supported
+    assert (JdiffPath(path).anchor_walker is not None) == supported
+
+
+def test_anchor_walker_pairs():
+    """Assert pairs are returned in data order, before sorting."""
+    _, post = load_mocks("napalm_getter_changed_peer")
+    path = JdiffPath("global.peers.$*$.[is_enabled,is_up]")
+
+    output = path.anchor_walker.pairs(post)
+
+    expected_output = [
+        (key, {"is_enabled": peer["is_enabled"], "is_up": peer["is_up"]})
+        for key, peer in post["global"]["peers"].items()
+    ]
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+vrfs = {
+    "global": {"peers": {"10.2.0.0": {"af": {"ipv4": {"rx": 2}}}, "10.1.0.0": {"af": {"ipv4": {"rx": 1}}}}},
+    "vpn": {"peers": {"10.3.0.0": {"af": {"ipv4": {"rx": 3}, "ipv6": {"rx": 4}}}}},
+}
+
+nested_edge_cases = [
+    (vrfs, "$*$.peers.$*$.af.ipv4.rx"),
+    (vrfs, "$*$.peers.$*$.af.ipv4.[rx]"),
+    (vrfs, "$*$.peers.$*$.*.ipv4.[rx]"),
+    (vrfs, "$*$.peers.$*$.af.*.[rx]"),
+    (vrfs, "$*$.peers.$*$.af.*.ipv4.[rx]"),
+    (vrfs, "$*$.peers.$*$.af.$*$.rx"),
+    (vrfs, "$*$.peers.$*$.af.ipv6.[rx]"),
+    (vrfs, "$*$.peers.$*$.af.ipv4.[rx,missing]"),
+    (vrfs, "$*$.peers.$*$.af"),
+    (vrfs, "$*$.missing.$*$.af.ipv4.[rx]"),
+    ({"global": {"peers": {}}}, "$*$.peers.$*$.af.ipv4.[rx]"),
+    ({"global": {"peers": {"a": {"rx": None}}}}, "$*$.peers.$*$.rx"),
+    ({"global": {"peers": {"a": {"rx": [1]}}}}, "$*$.peers.$*$.[rx]"),
+    ({"global": None, "vpn": {"peers": {"a": {"rx": 1}}}}, "$*$.peers.$*$.[rx]"),
+]
+
+
+@pytest.mark.parametrize("data, path", nested_edge_cases)
+def test_nested_anchor_walker_matches_legacy(data, path):
+    """Assert multi reference paths return, or raise, what the legacy extraction does."""
+    output = walker_extract(data, path)
+    expected_output = legacy_extract(data, path)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+nested_mock_cases = [
+    "$*$.peers.$*$.*.ipv4.[accepted_prefixes,received_prefixes,sent_prefixes]",
+    "$*$.peers.$*$.*.ipv6.[accepted_prefixes,received_prefixes,sent_prefixes]",
+    "$*$.peers.$*$.[is_enabled,is_up,remote_as]",
+    "$*$.peers.$*$.description",
+]
+
+
+@pytest.mark.parametrize("path", nested_mock_cases)
+def test_nested_anchor_walker_mock(path):
+    """Assert multi reference paths are extracted in a single traversal, with the legacy result."""
+    data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    assert JdiffPath(path).anchor_walker is not None
+    output = walker_extract(data, path)
+    expected_output = legacy_extract(data, path)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize(
+    "path, supported, legacy_compatible",
+    [
+        ("$*$.peers.$*$.*.ipv4.[accepted_prefixes]", True, True),
+        ("$*$.peers.$*$.is_up", True, True),
+        ("$*$.peers.$*$.address_family.$*$.[accepted_prefixes]", True, False),
+        ("$*$.peers.$*$.*.ipv4.accepted_prefixes.value", True, True),
+        ("$*$.peers.$*$.af.*.ipv4.[rx]", True, False),
+        ("*.$*$.peers.$*$.[is_up]", True, False),
+        ("global.peers.$*$.[is_up]", True, False),
+        ("vrfs.$*$.peerList[*].[$peerAddress$,state]", True, False),
+        ("$*$.peers.$*$.*", False, False),
+        ("$*$.peers[?is_up].$*$.[is_up]", False, False),
+        ("$*$.peers.$*$.[$a$,$b$]", False, False),
+        ("$*$.peers.$*$.[length(a)]", False, False),
+    ],
+)
+def test_compile_nested_anchor_walker(path, supported, legacy_compatible):
+    """Assert which shapes of path are walked, and which give the legacy multi reference result."""
+    walker = compile_nested_anchor_walker(path)
+    assert (walker is not None) == supported
+    assert (walker is not None and walker.legacy_compatible) == legacy_compatible
+
+
+def test_iter_anchored_records():
+    """Assert reference keys of every anchor level are returned as tuples, in data order."""
+    output = list(iter_anchored_records(vrfs, "$*$.peers.$*$.af.$*$.[rx]"))
+    expected_output = [
+        (("global", "10.2.0.0", "ipv4"), {"rx": 2}),
+        (("global", "10.1.0.0", "ipv4"), {"rx": 1}),
+        (("vpn", "10.3.0.0", "ipv4"), {"rx": 3}),
+        (("vpn", "10.3.0.0", "ipv6"), {"rx": 4}),
+    ]
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_iter_anchored_records_separator():
+    """Assert reference keys are joined only when a separator is given, anchored fields included."""
+    data = {"vrfs": {"default": {"peerList": [{"peerAddress": "10.1.0.0", "state": "Idle"}, {"state": "Active"}]}}}
+    output = list(iter_anchored_records(data, "vrfs.$*$.peerList[*].[$peerAddress$,state]", separator="/"))
+    expected_output = [("default/10.1.0.0", {"state": "Idle"})]
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_iter_anchored_records_unsupported():
+    """Assert paths the walker cannot handle are rejected before iterating."""
+    with pytest.raises(ValueError, match="is not supported"):
+        iter_anchored_records(vrfs, "global.peers")
@@ -0,0 +1,141 @@
+"""Baseline comparator tests."""
+
+import copy
+import random
+
+import pytest
+
+from jdiff import BaselineComparator, DiffResult
+from jdiff.baseline import RefreshStats
+from jdiff.evaluators import DIFF_ENGINES, diff_generator
+
+from .utility import ASSERT_FAIL_MESSAGE, MOCK_FOLDERS, load_mocks, random_change, random_value
+
+
+def random_operation(rand, document):
+    """Return a random JSON-patch operation on document."""
+    pointer = ""
+    value = document
+    while isinstance(value, (dict, list)) and value and rand.random() < 0.7:
+        key = rand.choice(list(value)) if isinstance(value, dict) else rand.randrange(len(value))
+        pointer += "/" + str(key).replace("~", "~0").replace("/", "~1")
+        value = value[key]
+    if isinstance(value, dict) and rand.random() < 0.5:
+        return {"op": "add", "path": pointer + "/" + rand.choice("abcdef"), "value": random_value(rand, 1)}
+    if isinstance(value, list) and rand.random() < 0.5:
+        return {"op": "add", "path": pointer + "/" + rand.choice(["-", "0"]), "value": random_value(rand, 1)}
+    if pointer and rand.random() < 0.3:
+        return {"op": "remove", "path": pointer}
+    return {"op": "replace", "path": pointer, "value": random_change(rand, value)}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 4096])
+@pytest.mark.parametrize("engine", DIFF_ENGINES)
+@pytest.mark.parametrize("folder_name", MOCK_FOLDERS)
+def test_baseline_comparator_mocks(folder_name, engine, chunk_size):
+    """Assert updates against a baseline diff like diff_generator on every mock, whatever the chunk size."""
+    pre, post = load_mocks(folder_name)
+    comparator = BaselineComparator(pre, engine=engine, chunk_size=chunk_size)
+    assert comparator.differences() == {}
+    expected_output = diff_generator(pre, post, engine=engine)
+    output = comparator.update(post)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    assert comparator.update(pre) == {}
+
+
+@pytest.mark.parametrize("seed", range(0, 500, 100))
+def test_baseline_comparator_random_documents(seed):
+    """Assert successive updates of random documents diff like diff_generator."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        comparator = BaselineComparator(pre, chunk_size=rand.choice([1, 8, 32]))
+        post = pre
+        for _ in range(3):
+            post = random_change(rand, post)
+            expected_output = diff_generator(pre, post)
+            output = comparator.update(post)
+            assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("seed", range(0, 500, 100))
+def test_baseline_comparator_random_patches(seed):
+    """Assert random patches diff like diff_generator and leave the baseline untouched."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        saved_pre = copy.deepcopy(pre)
+        comparator = BaselineComparator(pre, chunk_size=rand.choice([1, 8, 32]))
+        for _ in range(3):
+            operations = [random_operation(rand, comparator.document) for _ in range(rand.randint(1, 2))]
+            try:
+                output = comparator.apply_patch(operations)
+            except ValueError:
+                # A second operation may target a path removed by the first one.
+                continue
+            expected_output = diff_generator(pre, comparator.document)
+            assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+        assert pre == saved_pre
+
+
+interfaces = {
+    "interfaces": {
+        f"Ethernet{index}": {"status": "connected", "mtu": 1500, "vlans": [10, 20], "counters": {"in": index}}
+        for index in range(100)
+    }
+}
+
+
+def test_baseline_comparator_reuse():
+    """Assert unchanged chunks reuse their differences, on updates and on patches."""
+    comparator = BaselineComparator(interfaces, chunk_size=128)
+    post = copy.deepcopy(interfaces)
+    post["interfaces"]["Ethernet5"]["status"] = "notconnect"
+    assert comparator.update(post) == {
+        "interfaces": {"Ethernet5": {"status": {"new_value": "notconnect", "old_value": "connected"}}}
+    }
+    assert comparator.stats == RefreshStats(rediffed=1, reused=99)
+
+    output = comparator.apply_patch(
+        [
+            {"op": "replace", "path": "/interfaces/Ethernet7/mtu", "value": 9214},
+            {"op": "remove", "path": "/interfaces/Ethernet9"},
+            {"op": "add", "path": "/interfaces/Ethernet9~11", "value": {}},
+        ],
+        lazy=True,
+    )
+    assert isinstance(output, DiffResult)
+    assert output == diff_generator(interfaces, comparator.document)
+    assert comparator.stats == RefreshStats(rediffed=1, reused=0)
+    assert "Ethernet9/1" in comparator.document["interfaces"]
+
+
+def test_baseline_comparator_repeated_update():
+    """Assert differences leave the baseline and the compared document unchanged, so polls return the same result."""
+    pre = {"k0": [{"a": 1, "b": 2}, {"c": 3, "d": 4}]}
+    post = {"k0": [{"x": 1}, {"y": 2}]}
+    saved_pre = copy.deepcopy(pre)
+    saved_post = copy.deepcopy(post)
+    comparator = BaselineComparator(pre)
+    expected_output = {"k0": {"new_value": {"x": 1, "y": 2}, "old_value": {"a": 1, "b": 2, "c": 3, "d": 4}}}
+    for _ in range(3):
+        output = comparator.update(post)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+        assert pre == saved_pre and post == saved_post
+    assert comparator.differences(lazy=True).to_dict() == expected_output
+    assert pre == saved_pre and post == saved_post
+
+
+def test_baseline_comparator_validation():
+    """Assert invalid chunk sizes and patch operations are rejected."""
+    with pytest.raises(ValueError, match="'chunk_size' must be a positive integer. You have: 0."):
+        BaselineComparator({}, chunk_size=0)
+    comparator = BaselineComparator({"mtu": 1500, "vlans": [10]})
+    with pytest.raises(ValueError, match="'op' should be one of the following: add, remove, replace. You have: move"):
+        comparator.apply_patch([{"op": "move", "from": "/mtu", "path": "/size"}])
+    for path in ("/vlans/1", "/speed", "/mtu/1", "/vlans/-1"):
+        with pytest.raises(ValueError, match=f"Path {path} of the 'replace' operation doesn't exist in the document."):
+            comparator.apply_patch([{"op": "replace", "path": path, "value": 1}])
+    with pytest.raises(ValueError, match="The whole document can't be removed."):
+        comparator.apply_patch([{"op": "remove", "path": ""}])
+    assert comparator.apply_patch([{"op": "replace", "path": "", "value": {"mtu": 1500}}]) == {"vlans": "missing"}
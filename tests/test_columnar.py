@@ -0,0 +1,188 @@
+"""Test the columnar extraction result."""
+
+import re
+import sys
+from array import array
+
+import pytest
+
+from jdiff import CheckType, ColumnarResult, extract_data_from_json
+
+from .utility import ASSERT_FAIL_MESSAGE, load_json_file, load_mocks
+
+
+@pytest.mark.parametrize(
+    "values, expected_column",
+    [
+        ([1, 2, -3], array("q", [1, 2, -3])),
+        ([1.5, 2.0], array("d", [1.5, 2.0])),
+        ([1, 2.5], [1, 2.5]),
+        ([True, False], [True, False]),
+        ([1, None], [1, None]),
+        (["Idle", "Established"], ["Idle", "Established"]),
+        ([2**63, 1], [2**63, 1]),
+        ([[1], [2]], [[1], [2]]),
+    ],
+)
+def test_columnar_column_types(values, expected_column):
+    """Assert only columns of ints or of floats are packed into arrays, so values read back unchanged."""
+    result = ColumnarResult.from_mapping({str(index): {"field": value} for index, value in enumerate(values)})
+    output = result.column("field")
+    assert output == expected_column, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_column)
+    assert type(output) is type(expected_column)
+    assert [record["field"] for record in result.values()] == values
+
+
+def test_columnar_mapping():
+    """Assert the columnar result reads back as the mapping it was built from."""
+    mapping = {
+        "10.1.0.0": {"state": "Idle", "prefixesReceived": 0},
+        "10.2.0.0": {"state": "Established", "prefixesReceived": 10},
+        "10.3.0.0": {"state": "Established"},
+    }
+    result = ColumnarResult.from_mapping(mapping)
+
+    assert result.reference_keys == ["10.1.0.0", "10.2.0.0", "10.3.0.0"]
+    assert list(result.columns) == ["state", "prefixesReceived"]
+    assert result.column("prefixesReceived") == [0, 10, None]
+    assert result.missing == {2: ("prefixesReceived",)}
+    assert result["10.3.0.0"] == {"state": "Established"}
+    assert len(result) == 3
+    assert dict(result.items()) == mapping
+    assert result == mapping
+    with pytest.raises(KeyError):
+        result["10.4.0.0"]  # pylint: disable=pointless-statement
+
+
+def test_columnar_heterogeneous_records():
+    """Assert records holding different fields read back unchanged, fields absent from the first record included."""
+    mapping = {
+        "10.1.0.0": {"state": "Idle"},
+        "10.2.0.0": {"prefixesReceived": 10, "state": "Established"},
+        "10.3.0.0": {},
+        "10.4.0.0": {"prefixesReceived": None, "state": "Established"},
+    }
+    result = ColumnarResult.from_mapping(mapping)
+
+    assert list(result.columns) == ["state", "prefixesReceived"]
+    assert result.missing == {0: ("prefixesReceived",), 2: ("state", "prefixesReceived")}
+    assert list(result.values()) == list(mapping.values())
+    assert {key: result[key] for key in mapping} == mapping
+    assert result == mapping
+
+
+def test_columnar_length_validation():
+    """Assert every column must hold one value per reference key."""
+    with pytest.raises(ValueError, match="Column 'state' has 1 values for 2 reference keys."):
+        ColumnarResult(["10.1.0.0", "10.2.0.0"], {"state": ["Idle"]})
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived,state]",
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,peerGroup]",
+    ],
+)
+def test_extract_data_from_json_columnar(path):
+    """Assert the columnar output holds the same data as the mapping output."""
+    data = load_json_file("api", "pre.json")
+    output = extract_data_from_json(data, path, output="columnar")
+    expected_output = extract_data_from_json(data, path, output="mapping")
+
+    assert isinstance(output, ColumnarResult)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived,state]",
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]",
+        "result[0].vrfs.default.peers.$*$.[prefixesReceived,state]",
+        "result[0].vrfs.default.peers.$*$.prefixesReceived",
+    ],
+)
+def test_extract_data_from_json_columnar_direct(monkeypatch, path):
+    """Assert single anchor paths fill the columns without building the mapping output first."""
+    peers = {f"10.1.0.{index}": {"prefixesReceived": index, "state": "Established"} for index in range(3)}
+    data = {
+        "result": [
+            {
+                "vrfs": {
+                    "default": {
+                        "peerList": [{"peerAddress": key, **peer} for key, peer in peers.items()],
+                        "peers": peers,
+                    }
+                }
+            }
+        ]
+    }
+    expected_output = extract_data_from_json(data, path, output="mapping")
+    monkeypatch.setattr(ColumnarResult, "from_mapping", None)
+    output = extract_data_from_json(data, path, output="columnar")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    assert output.columns["prefixesReceived"] == array("q", [0, 1, 2])
+
+    data["result"][0]["vrfs"]["default"]["peerList"].append({"peerAddress": "10.1.0.1", "prefixesReceived": 5})
+    with pytest.raises(ValueError, match=re.escape("Duplicates: ['10.1.0.1']")):
+        extract_data_from_json(
+            data, "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]", output="columnar"
+        )
+
+
+def test_extract_data_from_json_columnar_not_anchored():
+    """Assert paths without reference key return their values unchanged."""
+    data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    output = extract_data_from_json(data, "global.peers.*.is_enabled", output="columnar")
+    expected_output = extract_data_from_json(data, "global.peers.*.is_enabled")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_columnar_check_types():
+    """Assert check types evaluate columnar results as they evaluate the mapping output."""
+    pre, post = load_mocks("api")
+    path = "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived,state]"
+    pre_columnar = extract_data_from_json(pre, path, output="columnar")
+    post_columnar = extract_data_from_json(post, path, output="columnar")
+    pre_mapping = extract_data_from_json(pre, path, output="mapping")
+    post_mapping = extract_data_from_json(post, path, output="mapping")
+
+    for check_type, args in (
+        ("exact_match", ()),
+        ("tolerance", (10,)),
+    ):
+        check = CheckType.create(check_type)
+        output = check.evaluate(pre_columnar, post_columnar, *args)
+        expected_output = check.evaluate(pre_mapping, post_mapping, *args)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+    operator_args = {"params": {"mode": "in-range", "operator_data": (50, 100)}}
+    output = CheckType.create("operator").evaluate(
+        operator_args, extract_data_from_json(pre, path.replace(",state", ""), output="columnar")
+    )
+    expected_output = CheckType.create("operator").evaluate(
+        operator_args, extract_data_from_json(pre, path.replace(",state", ""), output="mapping")
+    )
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    assert output[1] is False
+
+
+def test_columnar_to_numpy():
+    """Assert numeric columns are shared with NumPy arrays."""
+    numpy = pytest.importorskip("numpy")
+    result = ColumnarResult.from_mapping({"a": {"count": 1, "level": -2.5, "state": "Up"}})
+    columns = result.to_numpy()
+
+    assert columns["count"].dtype == numpy.int64
+    assert columns["level"].dtype == numpy.float64
+    assert columns["state"].dtype == object
+    result.columns["count"][0] = 5
+    assert columns["count"][0] == 5
+
+
+def test_columnar_to_numpy_missing(monkeypatch):
+    """Assert a clear error is raised when NumPy is not installed."""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(ImportError, match="NumPy must be installed"):
+        ColumnarResult.from_mapping({"a": {"count": 1}}).to_numpy()
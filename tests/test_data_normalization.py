@@ -1,18 +1,38 @@
 "Flatten list unit test"
 
+import copy
+
 import pytest
 
-from jdiff.utils.data_normalization import flatten_list
+from jdiff.utils.data_normalization import ExcludeStats, exclude_filter, exclude_filter_copy, flatten_list
 
-from .utility import ASSERT_FAIL_MESSAGE
+from .utility import ASSERT_FAIL_MESSAGE, load_mocks
 
 flatten_list_case_1 = (
     [[[[-1, 0], [-1, 0]]]],
     [[-1, 0], [-1, 0]],
 )
 
+flatten_list_case_2 = (
+    [[[["a", 1], ["b", 2]], [["c", 3]]], [[["d", 4]]]],
+    [["a", 1], ["b", 2], ["c", 3], ["d", 4]],
+)
+
+flatten_list_case_3 = (
+    [[[], [["a", 1]]], [["b", 2]]],
+    [[], ["a", 1], ["b", 2]],
+)
+
+flatten_list_case_4 = (
+    [["a", 1], [[["b", 2]]]],
+    [["a", 1], ["b", 2]],
+)
+
 flatten_list_tests = [
     flatten_list_case_1,
+    flatten_list_case_2,
+    flatten_list_case_3,
+    flatten_list_case_4,
 ]
 
 
@@ -21,3 +41,114 @@ def test_value_parser(data, expected_output):
     """Assert that flatten_list function flat a multiple nested list into a list of lists."""
     output = flatten_list(data)
     assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("data, expected_output", flatten_list_tests)
+@pytest.mark.parametrize("depth", [0, 1, 2, 3, 4])
+def test_flatten_list_depth(data, expected_output, depth):
+    """Assert the depth known from the path gives the same result, whether or not it matches the data."""
+    output = flatten_list(data, depth)
+    assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_flatten_list_flat():
+    """Assert a flat list is returned as is."""
+    data = [["a", 1], ["b", 2]][0]
+    assert flatten_list(data) is data
+    assert flatten_list(data, 0) is data
+
+
+def test_flatten_list_deep():
+    """Assert deeply nested lists do not hit the recursion limit."""
+    data = [["a", 1]]
+    for _ in range(5000):
+        data = [data]
+    assert flatten_list(data) == [["a", 1]]
+
+
+flatten_list_skip_empty_tests = [
+    ([{}, [[3.5, 2]]], [[3.5, 2]]),
+    ([[["a", 1]], [], {}, ""], [["a", 1], []]),
+    ([[{"a": 1}], ["b"], {}], [[{"a": 1}], ["b"]]),
+]
+
+
+@pytest.mark.parametrize("data, expected_output", flatten_list_skip_empty_tests)
+@pytest.mark.parametrize("depth", [None, 1, 2])
+def test_flatten_list_skip_empty(data, expected_output, depth):
+    """Assert empty dictionaries and strings mixed with lists are skipped."""
+    output = flatten_list(data, depth)
+    assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("data", [[["a", 1], "b"], [[["a"]], {"b": 1}], [[["a"]], None], [["a"], 0]])
+def test_flatten_list_mixed(data):
+    """Assert lists mixed with other values can not be flattened."""
+    with pytest.raises(TypeError, match="Lists can't be flattened when mixed with other values"):
+        flatten_list(data)
+
+
+@pytest.mark.parametrize("folder", ["raw_value_exclude", "raw_novalue_exclude", "napalm_get_lldp_neighbors"])
+def test_exclude_filter_copy(folder):
+    """Assert that exclude_filter_copy returns what exclude_filter leaves in place, without touching the input."""
+    data, _ = load_mocks(folder)
+    exclude = ["interfaceStatistics", "interfaceCounters", "port"]
+    original = copy.deepcopy(data)
+    expected_output = copy.deepcopy(data)
+    exclude_filter(expected_output, exclude)
+
+    output = exclude_filter_copy(data, exclude)
+
+    assert data == original
+    assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_exclude_filter_copy_structural_sharing():
+    """Assert that only containers on the path to an excluded key are copied."""
+    untouched = {"name": "Management1", "mtu": 1500}
+    data = {
+        "interfaces": [untouched, {"name": "Ethernet1", "interfaceCounters": {"inOctets": 10}}],
+        "version": {"image": "4.26"},
+    }
+
+    output = exclude_filter_copy(data, ["interfaceCounters"])
+
+    assert output == {"interfaces": [untouched, {"name": "Ethernet1"}], "version": {"image": "4.26"}}
+    assert output is not data and output["interfaces"] is not data["interfaces"]
+    assert output["interfaces"][0] is untouched
+    assert output["version"] is data["version"]
+    assert data["interfaces"][1]["interfaceCounters"] == {"inOctets": 10}
+    assert exclude_filter_copy(data, ["unknown"]) is data
+
+
+def test_exclude_filter_stats():
+    """Assert that exclude_filter reports visited containers and removed keys."""
+    data = {
+        "interfaces": [
+            {"name": "Ethernet1", "interfaceCounters": {"inOctets": 10}},
+            {"name": "Ethernet2", "interfaceCounters": {"inOctets": 20}, "interfaceStatistics": {}},
+        ]
+    }
+
+    stats = exclude_filter(data, ["interfaceCounters", "interfaceStatistics", "unknown"])
+
+    assert data == {"interfaces": [{"name": "Ethernet1"}, {"name": "Ethernet2"}]}
+    assert stats == ExcludeStats(visited=4, removed=3)
+
+
+def test_exclude_filter_deep_nesting():
+    """Assert that deeply nested data does not hit the recursion limit."""
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = {"counters": 0}
+        leaf = leaf["child"]
+
+    pruned = exclude_filter_copy(data, ["counters"])
+    stats = exclude_filter(data, ["counters"])
+
+    assert stats.removed == 5000
+    depth = 0
+    while pruned:
+        assert list(pruned) == ["child"]
+        pruned, depth = pruned["child"], depth + 1
+    assert depth == 5000
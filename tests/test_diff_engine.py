@@ -0,0 +1,546 @@
+"""Native diff engine tests, checked against DeepDiff."""
+
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+from deepdiff import DeepDiff
+
+from jdiff import CheckType, evaluators, extract_data_from_json, set_diff_engine
+from jdiff.evaluators import diff_generator, get_diff_engine, has_diff
+from jdiff.utils import diff_engine
+from jdiff.utils.diff_engine import (
+    DiffStats,
+    JsonDiff,
+    UnsupportedDataError,
+    _freeze,
+    json_diff,
+    path_keys,
+    render_path,
+)
+from jdiff.utils.diff_helpers import tree_paths
+
+from .utility import ASSERT_FAIL_MESSAGE, MOCK_FOLDERS, load_mocks, random_change, random_value
+
+REPORT_TYPES = (
+    "dictionary_item_added",
+    "dictionary_item_removed",
+    "values_changed",
+    "iterable_item_added",
+    "iterable_item_removed",
+)
+
+
+def deepdiff_view(pre, post):
+    """Return the report types of DeepDiff's text view used by diff_generator, in the same containers as json_diff."""
+    diff = DeepDiff(pre, post)
+    return {
+        report_type: list(diff[report_type]) if report_type.startswith("dictionary") else dict(diff[report_type])
+        for report_type in REPORT_TYPES
+        if diff.get(report_type)
+    }
+
+
+json_diff_cases = [
+    # Same document.
+    ({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}),
+    # Scalar at root.
+    (1, 2),
+    # Type changes are not reported.
+    ({"a": 1, "b": None}, {"a": 1.0, "b": "up"}),
+    # Added and removed keys, in data order.
+    ({"a": 1, "b": 2, "c": 3}, {"d": 4, "b": 2, "c": 30, "a": 1}),
+    # Less than a third of keys in common: the whole dict is changed.
+    ({"a": 1, "b": 2, "c": 3}, {"a": 1, "x": 2, "y": 3}),
+    ({"peers": {"a": 1, "b": 2}}, {"peers": {"c": 1, "d": 2}}),
+    # Lists of basic values aligned with difflib.
+    ({"vlans": [10, 20, 30, 40]}, {"vlans": [5, 10, 20, 30, 40]}),
+    # Lists of basic values where comparing by position reports fewer changes.
+    ([1, 2, 3], [4, 5, 6, 7]),
+    # Items added and removed at the same position become changed values.
+    (["a", "b", "c"], ["a", "x", "c"]),
+    # Lists of records compared by position.
+    ([{"name": "eth0", "mtu": 1500}, {"name": "eth1"}], [{"name": "eth0", "mtu": 9214}]),
+    # Multi-line strings.
+    ({"config": "hostname a\nntp 1.1.1.1"}, {"config": "hostname b\nntp 1.1.1.1"}),
+    # Keys rendered with quotes, integers, booleans and None.
+    ({"it's": 1, 'say "hi"': 1, 5: 1, True: 1, None: 1}, {"it's": 2, 'say "hi"': 2, 5: 2, True: 2, None: 2}),
+    # Tuples compare like lists.
+    ({"a": (1, 2)}, {"a": (1, 3, 4)}),
+]
+
+
+@pytest.mark.parametrize("pre, post", json_diff_cases)
+def test_json_diff_matches_deepdiff(pre, post):
+    """Assert the native engine reports the same differences as DeepDiff's text view."""
+    expected_output = deepdiff_view(pre, post)
+    output = json_diff(pre, post)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@pytest.mark.parametrize("seed", range(0, 1000, 100))
+def test_json_diff_random_documents(seed, prune):
+    """Assert the native engine matches DeepDiff on random documents, with and without pruning."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        expected_output = deepdiff_view(pre, post)
+        output = json_diff(pre, post, prune=prune)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("folder_name", MOCK_FOLDERS)
+def test_diff_generator_engines_mocks(folder_name):
+    """Assert diff_generator returns the same result with both engines on every mock."""
+    pre, post = load_mocks(folder_name)
+    expected_output = diff_generator(pre, post, engine="deepdiff")
+    output = diff_generator(pre, post, engine="native")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_diff_generator_engines_mapping_output():
+    """Assert both engines return the same result on mapping extraction outputs."""
+    pre, post = load_mocks("api")
+    path = "result[0].vrfs.default.peerList[*].[$peerAddress$,state,prefixesReceived]"
+    pre_value = extract_data_from_json(pre, path, output="mapping")
+    post_value = extract_data_from_json(post, path, output="mapping")
+    expected_output = diff_generator(pre_value, post_value, engine="deepdiff")
+    output = diff_generator(pre_value, post_value, engine="native")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize(
+    "pre, post",
+    [
+        ({"members": {1, 2}}, {"members": {1, 3}}),
+        ({"amount": Decimal("1.0")}, {"amount": Decimal("2.0")}),
+        ({("a", 1): 1}, {("a", 1): 2}),
+        ([Decimal("1.0"), 2], [Decimal("2.0"), 2]),
+    ],
+)
+def test_native_engine_unsupported_data(pre, post):
+    """Assert data the native engine does not compare is diffed with DeepDiff instead."""
+    with pytest.raises(UnsupportedDataError):
+        json_diff(pre, post)
+    expected_output = diff_generator(pre, post, engine="deepdiff")
+    output = diff_generator(pre, post, engine="native")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_json_diff_stats():
+    """Assert stats count the value pairs walked and pruned and the changes found."""
+    pre = {"Ethernet1": {"mtu": 1500, "vlans": [10, 20]}, "Ethernet2": {"mtu": 1500, "vlans": [10]}}
+    post = {"Ethernet1": {"mtu": 1500, "vlans": [10, 20]}, "Ethernet2": {"mtu": 9214, "vlans": [10]}}
+    engine = JsonDiff()
+    engine.diff(pre, post)
+    assert engine.stats == DiffStats(visited=3, pruned=2, changes=1)
+    engine.diff(pre, pre.copy())
+    assert engine.stats == DiffStats(visited=0, pruned=1, changes=0)
+    engine = JsonDiff(prune=False)
+    engine.diff(pre, post)
+    assert engine.stats == DiffStats(visited=7, pruned=0, changes=1)
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_json_diff_changed(seed):
+    """Assert changed returns True exactly when diff reports a difference."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        output = json_diff(pre, post, view="paths")
+        assert JsonDiff().changed(pre, post) == bool(output)
+        # Accepting every changed value leaves the other report types.
+        assert JsonDiff().changed(pre, post, accept=lambda path, old, new: True) == bool(
+            set(output) - {"values_changed"}
+        )
+        output = json_diff(pre, post, list_key="a", ignore_order=True)
+        assert JsonDiff(list_key="a", ignore_order=True).changed(pre, post) == bool(output)
+
+
+def test_json_diff_changed_stops_at_first_change():
+    """Assert changed stops walking at the first change that is not accepted."""
+    pre = {f"Ethernet{index}": {"mtu": 1500} for index in range(100)}
+    post = {f"Ethernet{index}": {"mtu": 9214} for index in range(100)}
+    engine = JsonDiff()
+    assert engine.changed(pre, post)
+    assert engine.stats == DiffStats(visited=3, pruned=0, changes=1)
+    assert not engine.changed(pre, post, accept=lambda path, old, new: new < old * 10)
+    assert engine.stats == DiffStats(visited=201, pruned=0, changes=0)
+
+
+@pytest.mark.parametrize(
+    "pre, post",
+    [
+        ({"members": {1, 2}}, {"members": {1, 3}}),
+        ({"members": {1, 2}}, {"members": {1, 2}, "mtu": 1500}),
+        ({"amount": Decimal("1.0")}, {"amount": Decimal("1.0")}),
+    ],
+)
+def test_has_diff_unsupported_data(pre, post):
+    """Assert has_diff falls back to DeepDiff on data the native engine does not compare."""
+    assert has_diff(pre, post) == bool(diff_generator(pre, post, engine="deepdiff"))
+
+
+def test_has_diff_validation():
+    """Assert has_diff rejects unsupported data and options requiring the native engine."""
+    with pytest.raises(UnsupportedDataError):
+        has_diff({"members": {1, 2}}, {"members": {1, 3}}, ignore_order=True)
+    with pytest.raises(ValueError) as error:
+        has_diff({}, {}, engine="deepdiff", list_key="name")
+    assert "'list_key' argument requires the native engine. You have: deepdiff" in str(error.value)
+
+
+def count_differences(output):
+    """Return the number of differences in a json_diff result."""
+    return sum(len(report) for report_type, report in output.items() if report_type != "truncated")
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_json_diff_bounded(seed):
+    """Assert bounded results keep max_diffs differences of the full result and count the others."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        expected_output = json_diff(pre, post, view="paths")
+        total = count_differences(expected_output)
+        for max_diffs in range(total + 1):
+            output = json_diff(pre, post, view="paths", max_diffs=max_diffs)
+            # Kept differences are differences of the unbounded result, the others are counted.
+            for report_type, report in output.items():
+                if report_type != "truncated":
+                    assert all(path in expected_output[report_type] for path in report)
+            assert count_differences(output) == max_diffs
+            assert sum(output.get("truncated", {}).values()) == total - max_diffs
+            assert all(len(path) <= 1 for path in output.get("truncated", {}))
+        output = json_diff(pre, post, view="paths", max_diffs=total, max_bytes=10**6)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_json_diff_max_bytes():
+    """Assert max_bytes bounds the size of the differences kept, and negative caps are rejected."""
+    pre = {"interfaces": {f"Ethernet{index}": {"description": "x" * 100} for index in range(10)}, "mtu": 1500}
+    post = {"interfaces": {f"Ethernet{index}": {"description": "y" * 100} for index in range(10)}, "mtu": 9214}
+    output = json_diff(pre, post, max_bytes=500)
+    assert len(output["values_changed"]) == 2
+    assert output["truncated"] == {"root['interfaces']": 8, "root['mtu']": 1}
+    # A whole document replaced is a single large change.
+    output = json_diff(pre, {"ifaces": pre["interfaces"]}, max_bytes=500)
+    assert output == {"truncated": {"root": 1}}
+    engine = JsonDiff(max_diffs=0)
+    assert engine.diff(pre, post) == {"truncated": {"root['interfaces']": 10, "root['mtu']": 1}}
+    assert engine.stats.changes == 11
+
+    for name in ("max_diffs", "max_bytes"):
+        with pytest.raises(ValueError) as error:
+            json_diff(pre, post, **{name: -1})
+        assert f"'{name}' must be a non-negative integer. You have: -1." in str(error.value)
+
+
+def test_json_diff_bounded_memory(monkeypatch):
+    """Assert a bounded diff holds at most max_diffs changes, whatever the number of changes found."""
+    peaks = []
+
+    class PeakChanges(diff_engine._BoundedChanges):  # pylint: disable=protected-access
+        def append(self, change):
+            super().append(change)
+            peaks.append(len(self))
+
+    monkeypatch.setattr(diff_engine, "_BoundedChanges", PeakChanges)
+    # A schema change: every value changes type, and every tenth value changes too.
+    pre = {f"key{index}": index for index in range(100_000)}
+    post = {f"key{index}": index + 1 if index % 10 == 0 else str(index) for index in range(100_000)}
+    engine = JsonDiff(max_diffs=10)
+    output = engine.diff(pre, post)
+    assert len(output["values_changed"]) == 10
+    assert sum(output["truncated"].values()) == 9_990
+    assert len(peaks) == 100_000 and max(peaks) == 10
+    assert engine.stats.changes == 10_000
+    peaks.clear()
+    assert not engine.diff(pre, {key: str(value) for key, value in pre.items()})
+    assert max(peaks) == 0
+
+
+def test_diff_generator_bounded():
+    """Assert diff_generator and exact_match report truncated differences under '_truncated'."""
+    pre = {"interfaces": {f"Ethernet{index}": {"mtu": 1500} for index in range(10)}, "vlans": [10, 20]}
+    post = {"interfaces": {f"Ethernet{index}": {"mtu": 9214} for index in range(10)}, "vlans": [10, 20, 30, 40]}
+    expected_output = {
+        "interfaces": {
+            "Ethernet0": {"mtu": {"new_value": 9214, "old_value": 1500}},
+            "Ethernet1": {"mtu": {"new_value": 9214, "old_value": 1500}},
+        },
+        "_truncated": {"interfaces": 8, "vlans": 2},
+    }
+    output = diff_generator(pre, post, max_diffs=2)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    output, passed = CheckType.create("exact_match").evaluate(pre, post, max_diffs=2)
+    assert output == expected_output and not passed
+    assert diff_generator([1, 2], [3, 4], max_diffs=0) == {"_truncated": {"index_element[0]": 1, "index_element[1]": 1}}
+
+    with pytest.raises(ValueError) as error:
+        diff_generator(pre, post, engine="deepdiff", max_bytes=100)
+    assert "'max_bytes' argument requires the native engine. You have: deepdiff" in str(error.value)
+
+
+@pytest.mark.parametrize("engine", ["deepdiff", "native"])
+def test_diff_generator_equal_data(engine):
+    """Assert equal data has no differences with either engine."""
+    assert not diff_generator({"mtu": 1500, "up": True}, {"mtu": 1500.0, "up": 1}, engine=engine)
+
+
+def test_render_path():
+    """Assert path keys render as DeepDiff path strings."""
+    assert render_path(()) == "root"
+    assert render_path(path_keys((((None, "interfaces"), "it's"), 0))) == "root['interfaces'][\"it's\"][0]"
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_json_diff_paths_view(seed):
+    """Assert the paths view matches DeepDiff's tree view and renders to the text view."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        expected_output = tree_paths(DeepDiff(pre, post, view="tree"))
+        output = json_diff(pre, post, view="paths")
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+        text_view = {
+            report_type: [render_path(path) for path in report]
+            if isinstance(report, list)
+            else {render_path(path): value for path, value in report.items()}
+            for report_type, report in output.items()
+        }
+        assert text_view == json_diff(pre, post)
+
+
+@pytest.fixture
+def native_engine():
+    """Set the native engine as the default diff engine for the test."""
+    engine = get_diff_engine()
+    set_diff_engine("native")
+    yield
+    set_diff_engine(engine)
+
+
+def test_set_diff_engine(native_engine):
+    """Assert set_diff_engine changes the engine used when none is given."""
+    assert get_diff_engine() == "native"
+    pre, post = load_mocks("tolerance")
+    expected_output = CheckType.create("tolerance").evaluate(pre, post, 10, engine="deepdiff")
+    output = CheckType.create("tolerance").evaluate(pre, post, 10)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_diff_engine_validation():
+    """Assert unknown engines and views are rejected."""
+    with pytest.raises(ValueError) as error:
+        diff_generator({}, {}, engine="fast")
+    assert "'engine' argument should be one of the following: deepdiff, native. You have: fast" in str(error.value)
+    with pytest.raises(ValueError):
+        set_diff_engine("fast")
+    with pytest.raises(ValueError) as error:
+        json_diff({}, {}, view="tree")
+    assert "'view' argument should be one of the following: text, paths. You have: tree" in str(error.value)
+
+
+peers = [{"ip": "10.0.0.1", "state": "up"}, {"ip": "10.0.0.2", "state": "up"}, {"ip": "10.0.0.3", "state": "up"}]
+
+list_key_cases = [
+    # A record inserted at the top, one changed and one removed.
+    (
+        {"peers": peers},
+        {"peers": [{"ip": "10.0.0.9", "state": "up"}, peers[0], {"ip": "10.0.0.2", "state": "down"}]},
+        "ip",
+        {
+            "values_changed": {("peers", 1, "state"): {"new_value": "down", "old_value": "up"}},
+            "iterable_item_removed": {("peers", 2): {"ip": "10.0.0.3", "state": "up"}},
+            "iterable_item_added": {("peers", 0): {"ip": "10.0.0.9", "state": "up"}},
+        },
+    ),
+    # Moved records are not reported.
+    ([peers], [peers[::-1]], "ip", {}),
+    # Records identified by several fields, duplicates matched in order.
+    (
+        [{"vrf": "a", "ip": 1, "up": 1}, {"vrf": "b", "ip": 1, "up": 1}, {"vrf": "b", "ip": 1, "up": 2}],
+        [{"vrf": "b", "ip": 1, "up": 3}, {"vrf": "a", "ip": 1, "up": 1}],
+        ["vrf", "ip"],
+        {
+            "values_changed": {(1, "up"): {"new_value": 3, "old_value": 1}},
+            "iterable_item_removed": {(2,): {"vrf": "b", "ip": 1, "up": 2}},
+        },
+    ),
+    # Items without the list key fields are matched by content.
+    (
+        [{"ip": "10.0.0.1"}, {"any": 1}, "x", [1]],
+        [[1], "y", {"any": 1}, {"ip": "10.0.0.1"}],
+        "ip",
+        {"iterable_item_removed": {(2,): "x"}, "iterable_item_added": {(1,): "y"}},
+    ),
+    # Lists without records holding the list key fields are compared by position.
+    (
+        {"vlans": [10, 20]},
+        {"vlans": [20, 10]},
+        "ip",
+        {
+            "values_changed": {
+                ("vlans", 0): {"new_value": 20, "old_value": 10},
+                ("vlans", 1): {"new_value": 10, "old_value": 20},
+            }
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize("pre, post, list_key, expected_output", list_key_cases)
+def test_json_diff_list_key(pre, post, list_key, expected_output):
+    """Assert lists of records are aligned by their list key fields."""
+    for prune in (True, False):
+        output = json_diff(pre, post, prune=prune, view="paths", list_key=list_key)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_diff_generator_list_key():
+    """Assert diff_generator and exact_match accept list_key, with the native engine only."""
+    pre, post = list_key_cases[0][:2]
+    expected_output = {
+        "peers": {
+            "state": {"new_value": "down", "old_value": "up"},
+            "missing": [{"ip": "10.0.0.3", "state": "up"}],
+            "new": [{"ip": "10.0.0.9", "state": "up"}],
+        }
+    }
+    output = diff_generator(pre, post, list_key="ip")
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    output, passed = CheckType.create("exact_match").evaluate(pre, post, list_key="ip")
+    assert output == expected_output and not passed
+
+    with pytest.raises(ValueError) as error:
+        diff_generator(pre, post, engine="deepdiff", list_key="ip")
+    assert "'list_key' argument requires the native engine. You have: deepdiff" in str(error.value)
+    with pytest.raises(UnsupportedDataError):
+        diff_generator({"peers": [{"ip": {1}}]}, {"peers": []}, list_key="ip")
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_json_diff_ignore_order(seed):
+    """Assert lists compared ignoring order report their multiset differences."""
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = [random_value(rand, 2) for _ in range(rand.randint(0, 8))]
+        post = random_change(rand, pre)
+        if not isinstance(post, list):
+            continue
+        shuffled = rand.sample(post, len(post))
+        output = json_diff({"items": pre}, {"items": shuffled}, view="paths", ignore_order=True)
+        removed = list(output.get("iterable_item_removed", {}).values())
+        added = list(output.get("iterable_item_added", {}).values())
+        # Items reported as removed and added are the multiset differences of the lists, compared ignoring order.
+        pre_counts = Counter(_freeze(item, True) for item in pre)
+        post_counts = Counter(_freeze(item, True) for item in post)
+        assert Counter(_freeze(item, True) for item in removed) == pre_counts - post_counts
+        assert Counter(_freeze(item, True) for item in added) == post_counts - pre_counts
+        assert set(output) <= {"iterable_item_removed", "iterable_item_added"}
+
+
+def test_diff_generator_ignore_order():
+    """Assert diff_generator and exact_match accept ignore_order, with the native engine only."""
+    pre = {"vlans": [10, 20, 30, 30], "ntp": [{"servers": ["a", "b"]}, {"prefer": True}]}
+    post = {"vlans": [30, 5, 10, 20], "ntp": [{"prefer": True}, {"servers": ["b", "a"]}]}
+    expected_output = {"vlans": {"missing": [30], "new": [5]}}
+    output = diff_generator(pre, post, ignore_order=True)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    output, passed = CheckType.create("exact_match").evaluate(pre, post, ignore_order=True)
+    assert output == expected_output and not passed
+
+    pre = {"peers": [{"ip": "10.0.0.1", "groups": ["a", "b"]}, {"ip": "10.0.0.2", "groups": ["c"]}]}
+    post = {"peers": [{"ip": "10.0.0.2", "groups": ["d"]}, {"ip": "10.0.0.1", "groups": ["b", "a"]}]}
+    expected_output = {"peers": {"groups": {"missing": ["c"], "new": ["d"]}}}
+    output = diff_generator(pre, post, list_key="ip", ignore_order=True)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+    with pytest.raises(ValueError) as error:
+        diff_generator(pre, post, engine="deepdiff", ignore_order=True)
+    assert "'ignore_order' argument requires the native engine. You have: deepdiff" in str(error.value)
+
+
+@pytest.mark.parametrize("engine", ["deepdiff", "native"])
+@pytest.mark.parametrize("folder_name", MOCK_FOLDERS)
+def test_diff_generator_parallel_mocks(monkeypatch, folder_name, engine):
+    """Assert parallel diffs of every mock match serial diffs, with both engines."""
+    pre, post = load_mocks(folder_name)
+    monkeypatch.setattr(evaluators, "PARALLEL_MIN_SIZE", 0)
+    expected_output = diff_generator(pre, post, engine=engine)
+    output = diff_generator(pre, post, engine=engine, workers=2)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_diff_generator_parallel_random_documents(monkeypatch, seed):
+    """Assert parallel diffs of random documents match serial diffs, with every option."""
+    # Threads run the same partitions and merge as processes, without starting a pool per document.
+    monkeypatch.setattr(evaluators, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(evaluators, "PARALLEL_MIN_SIZE", 0)
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        for options in (
+            {},
+            {"list_key": "a"},
+            {"ignore_order": True},
+            {"accept": lambda path, old_value, new_value: len(path) % 2 == 0},
+        ):
+            expected_output = diff_generator(pre, post, engine="native", **options)
+            output = diff_generator(pre, post, engine="native", workers=3, **options)
+            assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_diff_generator_parallel_serial(monkeypatch):
+    """Assert small, bounded and single worker diffs stay serial, and workers is validated."""
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("The diff should stay serial.")
+
+    monkeypatch.setattr(evaluators, "ProcessPoolExecutor", no_pool)
+    pre = {"interfaces": {f"Ethernet{index}": {"mtu": 1500} for index in range(10)}}
+    post = {"interfaces": {f"Ethernet{index}": {"mtu": 9214} for index in range(10)}}
+    assert diff_generator(pre, post, workers=4) == diff_generator(pre, post)
+    monkeypatch.setattr(evaluators, "PARALLEL_MIN_SIZE", 0)
+    assert diff_generator(pre, post, workers=4, max_diffs=2) == diff_generator(pre, post, max_diffs=2)
+    assert diff_generator(pre, post, workers=1) == diff_generator(pre, post)
+    assert diff_generator({"a": 1}, {"b": 1}, workers=4) == diff_generator({"a": 1}, {"b": 1})
+
+    with pytest.raises(ValueError) as error:
+        diff_generator(pre, post, workers=0)
+    assert "'workers' must be a positive integer. You have: 0." in str(error.value)
+
+
+@pytest.mark.parametrize("seed", range(0, 1000, 250))
+def test_json_diff_accept(seed):
+    """Assert accepted changes are left out as they are found, like filtering the full result."""
+
+    def accept(path, old_value, new_value):
+        return len(path) % 2 == 0 or old_value == 1
+
+    for case in range(seed, seed + 100):
+        rand = random.Random(case)
+        pre = random_value(rand, 4)
+        post = random_change(rand, pre)
+        expected_output = json_diff(pre, post, view="paths")
+        values_changed = {
+            path: change
+            for path, change in expected_output.pop("values_changed", {}).items()
+            if not accept(path, change["old_value"], change["new_value"])
+        }
+        if values_changed:
+            expected_output["values_changed"] = values_changed
+        output = json_diff(pre, post, view="paths", accept=accept)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+        bounded_output = json_diff(pre, post, view="paths", accept=accept, max_diffs=1000)
+        assert bounded_output == expected_output
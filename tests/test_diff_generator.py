@@ -3,7 +3,7 @@
 import pytest
 
 from jdiff import extract_data_from_json
-from jdiff.evaluators import diff_generator
+from jdiff.evaluators import DIFF_ENGINES, diff_generator
 
 from .utility import ASSERT_FAIL_MESSAGE, load_mocks
 
@@ -198,12 +198,13 @@ eval_tests = [
 ]
 
 
+@pytest.mark.parametrize("engine", DIFF_ENGINES)
 @pytest.mark.parametrize("folder_name, path, exclude, expected_output", eval_tests)
-def test_eval(folder_name, path, exclude, expected_output):
+def test_eval(folder_name, path, exclude, expected_output, engine):
     """Run tests."""
     pre_data, post_data = load_mocks(folder_name)
     pre_value = extract_data_from_json(pre_data, path, exclude)
     post_value = extract_data_from_json(post_data, path, exclude)
-    output = diff_generator(pre_value, post_value)
+    output = diff_generator(pre_value, post_value, engine=engine)
 
     assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
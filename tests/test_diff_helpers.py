@@ -1,5 +1,7 @@
 """DIff helpers unit tests."""
 
+import copy
+
 import pytest
 
 from jdiff import extract_data_from_json
@@ -9,6 +11,7 @@ from jdiff.utils.diff_helpers import (
     dict_merger,
     fix_deepdiff_key_names,
     get_diff_iterables_items,
+    group_diff_paths,
     group_value,
     parse_diff,
 )
@@ -61,6 +64,54 @@ def test_get_diff_iterables_items():
     assert list(list(dict(result).values())[0].values())[0] == [{"hostname": "ios-xrv-unittest", "port": "Gi0/0/0/0"}]
 
 
+def test_group_diff_paths():
+    """Tests that differences keyed by path tuples are nested under their string keys."""
+    diff_paths = {
+        "values_changed": {(0, "10.1.0.0", "is_enabled"): {"new_value": False, "old_value": True}},
+        "dictionary_item_removed": [("10.1.0.0", "ip name"), ("it's",)],
+        "dictionary_item_added": [("10.1.0.0", "peer:as")],
+        "iterable_item_added": {("Ethernet3", 1): {"port": "Gi0/0/0/0"}, ("Ethernet3", 2): {"port": "Gi0/0/0/1"}},
+        "iterable_item_removed": {(2,): "x", (3,): "y"},
+    }
+    result = group_diff_paths(diff_paths)
+    assert result == {
+        "10.1.0.0": {"is_enabled": {"new_value": False, "old_value": True}, "ip name": "missing", "peer:as": "new"},
+        "it's": "missing",
+        "index_element[2]": {"missing": ["x"]},
+        "index_element[3]": {"missing": ["y"]},
+        "Ethernet3": {"new": [{"port": "Gi0/0/0/0"}, {"port": "Gi0/0/0/1"}]},
+    }
+
+
+def test_group_diff_paths_leaves_values_unchanged():
+    """Tests that merging differences sharing their string keys copies the values instead of modifying them."""
+    old_values = [{"a": 1, "b": {"c": 2}}, {"d": 3, "b": {"e": 4}}]
+    diff_paths = {
+        "values_changed": {
+            ("k0", index): {"new_value": {"x": index}, "old_value": old_value}
+            for index, old_value in enumerate(old_values)
+        },
+        "iterable_item_added": {("k0", 2): {"y": 5}},
+    }
+    expected_diff_paths = copy.deepcopy(diff_paths)
+    result = group_diff_paths(diff_paths)
+    assert result == {
+        "k0": {
+            "new_value": {"x": 0, "x_dup!": 1},
+            "old_value": {"a": 1, "b": {"c": 2, "e": 4}, "d": 3},
+            "new": [{"y": 5}],
+        }
+    }
+    assert diff_paths == expected_diff_paths
+    assert group_diff_paths(diff_paths) == result
+
+
+def test_parse_diff_bounded_result():
+    """Tests that differences left out of a bounded result are skipped."""
+    jdiff_evaluate_response = {"hostname": {"new_value": "veos-0", "old_value": "veos"}, "_truncated": {"vlans": 10}}
+    assert parse_diff(jdiff_evaluate_response, {}, {}, "") == ({"hostname": "veos-0"}, {"hostname": "veos"})
+
+
 index_element_case_1 = (
     "index_element['foo']['ip name']",
     {"ip name": ""},
@@ -0,0 +1,69 @@
+"""Test the lazy diff result."""
+
+import pytest
+
+from jdiff import CheckType, DiffResult, extract_data_from_json
+from jdiff.diff_result import Difference
+from jdiff.evaluators import DIFF_ENGINES, diff_generator
+
+from .test_type_checks import check_tests
+from .utility import ASSERT_FAIL_MESSAGE, MOCK_FOLDERS, load_mocks
+
+
+@pytest.mark.parametrize("engine", DIFF_ENGINES)
+@pytest.mark.parametrize("folder_name", MOCK_FOLDERS)
+def test_diff_result_mocks(folder_name, engine):
+    """Assert the lazy result builds the nested output of diff_generator."""
+    pre, post = load_mocks(folder_name)
+    expected_output = diff_generator(pre, post, engine=engine)
+    output = diff_generator(pre, post, engine=engine, lazy=True)
+    assert isinstance(output, DiffResult)
+    assert bool(output) == bool(expected_output)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(
+        output=output.to_dict(), expected_output=expected_output
+    )
+
+
+@pytest.mark.parametrize("folder_name, check_type_str, evaluate_args, path, expected_result", check_tests)
+def test_diff_result_checks(folder_name, check_type_str, evaluate_args, path, expected_result):
+    """Assert exact_match and tolerance return the same result, lazy or not."""
+    check = CheckType.create(check_type_str)
+    pre_data, post_data = load_mocks(folder_name)
+    pre_value = extract_data_from_json(pre_data, path)
+    post_value = extract_data_from_json(post_data, path)
+    output, passed = check.evaluate(pre_value, post_value, lazy=True, **evaluate_args)
+    assert isinstance(output, DiffResult)
+    assert (output, passed) == expected_result, ASSERT_FAIL_MESSAGE.format(
+        output=(output.to_dict(), passed), expected_output=expected_result
+    )
+
+
+def test_diff_result_lazy():
+    """Assert checking, counting and iterating over differences does not build the nested output."""
+    pre = {"interfaces": {"Ethernet1": {"mtu": 1500, "vlans": [10]}, "Ethernet2": {"mtu": 1500}}, "hostname": "a"}
+    post = {"interfaces": {"Ethernet1": {"mtu": 9214, "vlans": [10, 20]}}, "hostname": "a", "domain": "b"}
+    result = diff_generator(pre, post, lazy=True)
+    assert result and len(result) == 4
+    assert list(result.iter_prefix(("interfaces", "Ethernet1"))) == [
+        Difference("changed", ("interfaces", "Ethernet1", "mtu"), {"new_value": 9214, "old_value": 1500}),
+        Difference("new", ("interfaces", "Ethernet1", "vlans", 1), 20),
+    ]
+    assert [difference.kind for difference in result] == ["changed", "missing", "new", "new"]
+    assert not result.truncated
+    assert result._nested is None  # pylint: disable=protected-access
+
+    nested = result.to_dict()
+    assert result.to_dict() is nested
+    assert repr(result) == "DiffResult(differences=4, truncated=0)"
+
+    result = diff_generator(pre, pre.copy(), lazy=True)
+    assert not result and len(result) == 0 and result == {}
+
+
+def test_diff_result_bounded():
+    """Assert a bounded result is truthy when all its differences were left out."""
+    result = diff_generator({"mtu": 1500, "vlans": [10]}, {"mtu": 9214, "vlans": []}, max_diffs=0, lazy=True)
+    assert result and len(result) == 0
+    assert result.truncated == {("mtu",): 1, ("vlans",): 1}
+    assert result == {"_truncated": {"mtu": 1, "vlans": 1}}
+    assert not CheckType.create("exact_match").evaluate({"mtu": 1500}, {"mtu": 9214}, max_diffs=0, lazy=True)[1]
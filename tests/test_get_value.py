@@ -1,10 +1,13 @@
 """Test extract_data_from_json."""
 
+import io
+import json
+
 import pytest
 
-from jdiff import extract_data_from_json
+from jdiff import JdiffPath, compile_path, extract_data_from_json, extract_many, extract_paths, extract_stream
 
-from .utility import ASSERT_FAIL_MESSAGE, load_json_file
+from .utility import ASSERT_FAIL_MESSAGE, load_json_file, load_mocks
 
 test_cases_extract_data_none = [
     "global[*]",
@@ -106,6 +109,169 @@ def test_extract_data_from_json(jmspath, expected_value):
     assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
 
 
+@pytest.mark.parametrize(
+    "jmspath, expected_value", test_cases_extract_data_no_ref_key + test_cases_extract_data_with_ref_key
+)
+def test_extract_data_from_json_with_parsed_path(jmspath, expected_value):
+    """Test a path parsed once with compile_path returns the same value as the string path."""
+    data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    value = extract_data_from_json(data=data, path=compile_path(jmspath))
+
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+def test_compile_path():
+    """Test anchors and expressions are parsed once and cached."""
+    path = compile_path("$*$.peers.$*$.*.ipv4.[accepted_prefixes]")
+
+    assert path is compile_path("$*$.peers.$*$.*.ipv4.[accepted_prefixes]")
+    assert path == JdiffPath("$*$.peers.$*$.*.ipv4.[accepted_prefixes]")
+    assert path.anchors == ("*", "*")
+    assert path.anchor_positions == (0, 2)
+    assert path.flatten_depth == 2
+    assert path.value_path == "*.peers.*.*.ipv4.[accepted_prefixes]"
+    assert len(path.reference_key_expressions) == 2
+
+
+def test_extract_many():
+    """Test extract_many returns one result per document, lazily and in input order."""
+    consumed = []
+
+    def documents():
+        for state in ("Idle", "Established", "Active"):
+            consumed.append(state)
+            yield {"peers": {"10.1.0.0": {"state": state}}}
+
+    results = extract_many(documents(), "peers.$*$.state")
+    assert not consumed
+    assert next(results) == [{"10.1.0.0": {"state": "Idle"}}]
+    assert consumed == ["Idle"]
+    assert list(results) == [[{"10.1.0.0": {"state": "Established"}}], [{"10.1.0.0": {"state": "Active"}}]]
+
+
+def test_extract_many_chunk_size():
+    """Test extract_many groups results in chunks of chunk_size."""
+    documents = [{"peers": {"10.1.0.0": {"state": state}}} for state in ("Idle", "Established", "Active")]
+
+    chunks = list(extract_many(documents, compile_path("peers.*.state"), chunk_size=2))
+
+    assert chunks == [[["Idle"], ["Established"]], [["Active"]]]
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1, "2"])
+def test_extract_many_chunk_size_validation(chunk_size):
+    """Test extract_many rejects chunk_size values that are not positive integers."""
+    with pytest.raises(ValueError) as error:
+        extract_many([], "peers.*.state", chunk_size=chunk_size)
+
+    assert "chunk_size must be a positive integer" in str(error.value)
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "array"])
+def test_extract_stream(fmt):
+    """Test extract_stream returns what extract_many returns for the same records."""
+    records = [
+        {"peers": {"10.1.0.0": {"state": state, "uptime": uptime}}}
+        for state, uptime in (("Idle", 1), ("Established", 2), ("Active", 3))
+    ]
+    if fmt == "ndjson":
+        text = "\n".join(json.dumps(record) for record in records)
+    else:
+        text = json.dumps(records, indent=2)
+    expected_output = list(extract_many(records, "peers.$*$.state", exclude=["uptime"], chunk_size=2))
+
+    output = list(extract_stream(io.StringIO(text), "peers.$*$.state", exclude=["uptime"], chunk_size=2, read_size=5))
+
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_extract_paths_multi_vrf():
+    """Test extract_paths returns what extract_data_from_json returns for each path."""
+    data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    paths = [case[0] for case in test_cases_extract_data_no_ref_key + test_cases_extract_data_with_ref_key[:4]]
+
+    value = extract_paths(data, paths)
+
+    expected_value = {path: extract_data_from_json(data, path) for path in paths}
+    assert list(value) == paths
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+def test_extract_paths_shared_prefix():
+    """Test paths sharing a prefix, with and without reference keys, as strings or JdiffPath."""
+    data, _ = load_mocks("api")
+    paths = [
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,state,bgpPeerCaps]",
+        compile_path("result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesSent]"),
+        "result[0].vrfs.default.peerList[*].peerAddress",
+        "result[0].vrfs.default.peerList[0].localAsn",
+        "result[0].vrfs.*.peerList[*].state",
+        "result[*].vrfs.default.peerList[*].[$peerAddress$,localAsn]",
+    ]
+
+    value = extract_paths(data, paths, exclude=["inMessageStats"])
+
+    expected_value = {path: extract_data_from_json(data, path) for path in paths}
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+def test_extract_paths_missing_prefix():
+    """Test a prefix missing from the data fails like extract_data_from_json does."""
+    data = {"global": {"peers": {"10.1.0.0": "peer1"}}}
+
+    with pytest.raises(TypeError) as error:
+        extract_paths(data, ["global.peers.*", "global.neighbors.*"])
+
+    assert "JMSPath returned 'None'. Please, verify your JMSPath regex." in str(error.value)
+
+
+test_cases_extract_paths_projection = [
+    ("*", {"a": {"b": 1}, "c": {"d": 2}}),
+    ("*", {"a": {"b": 1}, "c": 2}),
+    ("a.*.b.[x]", {"a": {"k": {"b": [{"x": 1}]}}}),
+    ("a.*.[$x$,state]", {"a": {"k": {"x": 1, "state": "Idle"}}}),
+]
+
+
+@pytest.mark.parametrize("path, data", test_cases_extract_paths_projection)
+def test_extract_paths_projection(path, data):
+    """Test paths starting with a projection, or selecting the whole data, give what extract_data_from_json gives."""
+    value = extract_paths(data, [path])
+
+    expected_value = {path: extract_data_from_json(data, path)}
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+test_cases_extract_paths_invalid = [
+    ("a.*.b.[$x$,state]", {"a": {"k": {"b": [{"x": 1, "state": "Idle"}]}}}),
+    ("a.$*$.peers.$*$.state", {"a": {"g": {"peers": {"10.1.0.0": {"state": "Idle"}}}}}),
+]
+
+
+@pytest.mark.parametrize("path, data", test_cases_extract_paths_invalid)
+def test_extract_paths_invalid_path(path, data):
+    """Test an invalid path raises the same exception as extract_data_from_json does."""
+    with pytest.raises(TypeError) as expected_error:
+        extract_data_from_json(data, path)
+    with pytest.raises(TypeError) as error:
+        extract_paths(data, [path])
+
+    assert str(error.value) == str(expected_error.value)
+
+
+def test_extract_data_from_json_exclude_not_inplace():
+    """Test excluding keys with inplace=False leaves the input data untouched."""
+    data, _ = load_mocks("raw_value_exclude")
+    exclude = ["interfaceStatistics", "interfaceCounters"]
+
+    value = extract_data_from_json(data, "result[*]", exclude=exclude, inplace=False)
+
+    assert "interfaceStatistics" in data["result"][0]["interfaces"]["Management1"]
+    expected_value = extract_data_from_json(data, "result[*]", exclude=exclude)
+    assert "interfaceStatistics" not in data["result"][0]["interfaces"]["Management1"]
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
 test_cases_top_key_anchor = [
     ("$*$.is_enabled", [{".local.": {"is_enabled": True}}, {".local..0": {"is_enabled": True}}]),
     ("$*$.is_up", [{".local.": {"is_up": True}}, {".local..0": {"is_up": True}}]),
@@ -173,3 +339,71 @@ def test_extract_data_from_json_with_ref_key_and_list_value():
     value = extract_data_from_json(data=data, path="[*].[$id$,include_trusted_domains]")
 
     assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+@pytest.mark.parametrize(
+    "jmspath, expected_value", [case for case in test_cases_extract_data_with_ref_key if "$" in case[0]]
+)
+def test_extract_data_from_json_mapping_output(jmspath, expected_value):
+    """Test the mapping output holds the same reference keys and values as the list output."""
+    data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    legacy_path = JdiffPath(jmspath)
+    legacy_path.anchor_walker = None
+
+    for path in (jmspath, legacy_path):
+        value = extract_data_from_json(data=data, path=path, output="mapping")
+        expected_mapping = {key: item[key] for item in expected_value for key in item}
+        assert value == expected_mapping, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_mapping)
+
+
+def test_extract_data_from_json_mapping_output_data_order():
+    """Test the mapping output keeps data order instead of sorting reference keys."""
+    data = {"peerList": [{"peerAddress": "10.2.0.0", "state": "Idle"}, {"peerAddress": "10.1.0.0", "state": "Up"}]}
+    value = extract_data_from_json(data, "peerList[*].[$peerAddress$,state]", output="mapping")
+
+    assert list(value) == ["10.2.0.0", "10.1.0.0"]
+
+
+def test_extract_data_from_json_mapping_output_duplicate_keys():
+    """Test duplicated reference keys cannot be turned into a mapping."""
+    data = {"peerList": [{"peerAddress": "10.1.0.0", "state": "Idle"}, {"peerAddress": "10.1.0.0", "state": "Up"}]}
+    with pytest.raises(ValueError, match=r"Reference keys must be unique.*10\.1\.0\.0"):
+        extract_data_from_json(data, "peerList[*].[$peerAddress$,state]", output="mapping")
+
+
+def test_extract_data_from_json_output_validation():
+    """Test unknown output formats are rejected."""
+    with pytest.raises(ValueError, match="'output' argument should be one of the following: list, mapping"):
+        extract_data_from_json({}, "peers.$*$.state", output="dict")
+
+
+def test_extract_data_from_json_four_level_nesting():
+    """Test values of paths with several projections are flattened to a list of lists."""
+    data = {
+        "sites": [
+            {"racks": [{"devices": [{"name": "r1d1", "state": "up"}, {"name": "r1d2", "state": "down"}]}]},
+            {"racks": [{"devices": [{"name": "r2d1", "state": "up"}]}, {"devices": []}]},
+        ]
+    }
+    path = "sites[*].racks[*].devices[*].[name,state]"
+    assert compile_path(path).value_depth == 4
+
+    value = extract_data_from_json(data, path)
+    # The rack without devices gives an empty list, as it does without knowing the depth.
+    expected_value = [["r1d1", "up"], ["r1d2", "down"], ["r2d1", "up"], []]
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
+
+
+test_cases_extract_data_empty_values = [
+    ("a[*]", {"a": [{}, None, [[3.5, 2]]]}, [[3.5, 2]]),
+    ("a[*].[b]", {"a": [{"b": [{"k1": 3.5}]}, {"c": 1}, {"b": None}]}, [[{"k1": 3.5}], [None], [None]]),
+    ("a.*.[b]", {"a": {"k": {"b": [{}, ["s"]]}}}, [["s"]]),
+    ("a.*.$*$.b", {"a": {"k": [{}, [], ""]}}, []),
+]
+
+
+@pytest.mark.parametrize("jmspath, data, expected_value", test_cases_extract_data_empty_values)
+def test_extract_data_empty_values(jmspath, data, expected_value):
+    """Test empty values next to nested lists are skipped when the values are flattened."""
+    value = extract_data_from_json(data, jmspath)
+    assert value == expected_value, ASSERT_FAIL_MESSAGE.format(output=value, expected_output=expected_value)
@@ -4,10 +4,13 @@ import pytest
 
 from jdiff.utils.jmespath_parsers import (
     associate_key_of_my_value,
+    compile_expression,
     jmespath_refkey_parser,
     jmespath_value_parser,
+    keys_values_mapping,
     keys_values_zipper,
     multi_reference_keys,
+    split_path_prefix,
 )
 
 from .utility import ASSERT_FAIL_MESSAGE, load_json_file
@@ -99,6 +102,25 @@ def test_keys_zipper(ref_keys, wanted_values, expected_output):
     assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
 
 
+def test_keys_mapping():
+    output = keys_values_mapping(["10.2.0.0", "10.1.0.0"], [{"is_up": True}, {"is_up": False}])
+    expected_output = {"10.2.0.0": {"is_up": True}, "10.1.0.0": {"is_up": False}}
+    assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    assert list(output) == ["10.2.0.0", "10.1.0.0"]
+
+
+@pytest.mark.parametrize(
+    "ref_keys, wanted_values, error",
+    [
+        (["10.1.0.0"], [{"is_up": True}, {"is_up": False}], "Keys len != from Values len"),
+        (["10.1.0.0", "10.1.0.0"], [{"is_up": True}, {"is_up": False}], "Reference keys must be unique"),
+    ],
+)
+def test_keys_mapping_errors(ref_keys, wanted_values, error):
+    with pytest.raises(ValueError, match=error):
+        keys_values_mapping(ref_keys, wanted_values)
+
+
 keys_association_case_1 = (
     "global.peers.*.[is_enabled,is_up]",
     [[True, False], [True, False]],
@@ -153,3 +175,42 @@ def test_multi_ref_key(path, expected_output):
     data = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
     output = multi_reference_keys(path, data)
     assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_compile_expression_cache():
+    """Compile each distinct expression once and serve repeated lookups from the cache."""
+    compile_expression.cache_clear()
+    data = {"peers": [{"state": "Idle"}, {"state": "Established"}]}
+
+    first = compile_expression("peers[*].state")
+    second = compile_expression("peers[*].state")
+    compile_expression("peers[0].state")
+
+    assert first is second
+    assert first.search(data) == ["Idle", "Established"]
+    cache_info = compile_expression.cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (1, 2, 2)
+
+
+split_path_prefix_test_cases = [
+    (
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,prefixesReceived]",
+        (("result", 0, "vrfs", "default"), "peerList[*].[$peerAddress$,prefixesReceived]"),
+    ),
+    ("global.peers.$*$.is_enabled", (("global", "peers"), "@.$*$.is_enabled")),
+    ('global.peers."neighbor-1".state', (("global", "peers", "neighbor-1", "state"), "@")),
+    ('global.peers."10.1.0.0".state', (("global", "peers"), '"10.1.0.0".state')),
+    ("$*$.peers.$*$.*.ipv4.[accepted_prefixes]", ((), "$*$.peers.$*$.*.ipv4.[accepted_prefixes]")),
+    ("result[*].interfaces", ((), "result[*].interfaces")),
+    ("result[0].*", (("result", 0), "@.*")),
+    ("result[0].*.peers.[$name$,state]", (("result", 0), "@.*.peers.[$name$,state]")),
+    ("global.$*$.peers.$*$.state", (("global",), "@.$*$.peers.$*$.state")),
+    ("*", ((), "*")),
+    ("result[0].state || result[1].state", ((), "result[0].state || result[1].state")),
+]
+
+
+@pytest.mark.parametrize("path, expected_output", split_path_prefix_test_cases)
+def test_split_path_prefix(path, expected_output):
+    output = split_path_prefix(path)
+    assert expected_output == output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
@@ -0,0 +1,119 @@
+"""Test incremental JSON reading."""
+
+import io
+import json
+
+import pytest
+
+from jdiff.utils.json_stream import iter_json_records
+
+from .utility import ASSERT_FAIL_MESSAGE
+
+records = [
+    {"interface": "Ethernet1", "counters": {"inOctets": 1234567890123, "outOctets": 0.5}},
+    {"interface": "Ethernet2 é", "description": "with ] and , and \\n inside", "counters": None},
+    [1, 2, [3, {"deep": True}]],
+    "plain string",
+    12345678901234567890,
+    -1.5e-10,
+    None,
+]
+
+json_array = "  [\n" + ",\n  ".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n]\n"
+ndjson = "\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n\n"
+
+stream_cases = [
+    (json_array, "auto"),
+    (json_array, "array"),
+    (ndjson, "auto"),
+    (ndjson, "ndjson"),
+    (ndjson.rstrip("\n"), "ndjson"),
+]
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("text, fmt", stream_cases)
+def test_iter_json_records(text, fmt, read_size):
+    """Assert records are decoded the same whatever the read size, from text and binary streams."""
+    for stream in (io.StringIO(text), io.BytesIO(text.encode("utf-8"))):
+        output = list(iter_json_records(stream, fmt, read_size))
+        assert output == records, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=records)
+
+
+def test_iter_json_records_from_path(tmp_path):
+    """Assert a file path is opened lazily and read record by record."""
+    filepath = tmp_path / "records.json"
+    filepath.write_bytes(b"\xef\xbb\xbf" + json_array.encode("utf-8"))
+
+    iterator = iter_json_records(str(filepath), read_size=16)
+    filepath.write_bytes(b"\xef\xbb\xbf" + ndjson.encode("utf-8"))
+
+    assert next(iterator) == records[0]
+    assert list(iterator) == records[1:]
+    assert list(iter_json_records(filepath)) == records
+
+
+def test_iter_json_records_is_incremental():
+    """Assert only the data needed for the next record is read from the stream."""
+    stream = io.StringIO(json_array)
+    iterator = iter_json_records(stream, read_size=8)
+
+    next(iterator)
+
+    assert stream.tell() < len(json_array) / 2
+
+
+@pytest.mark.parametrize("fmt", ["array", "ndjson"])
+def test_iter_json_records_long_record(fmt):
+    """Assert a record much longer than the read size is read in a logarithmic number of reads."""
+    long_records = [{"routes": [f"10.{index // 256}.{index % 256}.0/24" for index in range(20_000)]}, "last"]
+    if fmt == "array":
+        text = json.dumps(long_records)
+    else:
+        text = "\n".join(json.dumps(record) for record in long_records)
+    reads = []
+
+    class CountingStream(io.StringIO):
+        def read(self, size=-1):
+            reads.append(size)
+            return super().read(size)
+
+    output = list(iter_json_records(CountingStream(text), fmt, read_size=16))
+    assert output == long_records, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=long_records)
+    assert len(text) > 10_000 * 16
+    assert len(reads) < 40
+
+
+@pytest.mark.parametrize("text", ["", "  \n", "\n\n"])
+def test_iter_json_records_empty(text):
+    """Assert an empty stream has no records."""
+    assert not list(iter_json_records(io.StringIO(text)))
+    assert not list(iter_json_records(io.StringIO("[ ]")))
+
+
+invalid_cases = [
+    ('[{"a": 1} {"b": 2}]', "auto", "Expecting ',' or ']'"),
+    ('[{"a": 1}, {"b": 2}', "auto", "Unterminated JSON array"),
+    ('[{"a": 1}] {"b": 2}', "auto", "Unexpected data after the end"),
+    ('{"a": 1}\n{"b": \n', "auto", "Invalid JSON on line 2"),
+    ('{"a": 1}', "array", "does not start with '['"),
+    ("", "array", "the stream is empty"),
+    ("[]", "csv", "'fmt' argument should be one of the following"),
+]
+
+
+@pytest.mark.parametrize("text, fmt, message", invalid_cases)
+def test_iter_json_records_invalid(text, fmt, message):
+    """Assert malformed streams raise ValueError."""
+    with pytest.raises(ValueError) as error:
+        list(iter_json_records(io.StringIO(text), fmt, read_size=4))
+
+    assert message in str(error.value)
+
+
+def test_iter_json_records_read_size_validation():
+    """Assert read_size must be a positive integer, checked before iterating."""
+    with pytest.raises(ValueError) as error:
+        iter_json_records(io.StringIO("[]"), read_size=0)
+
+    assert "read_size must be a positive integer" in str(error.value)
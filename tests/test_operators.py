@@ -250,6 +250,31 @@ def test_operator(filename, check_type_str, evaluate_args, path, expected_result
     )
 
 
+@pytest.mark.parametrize("filename, check_type_str, evaluate_args, path, expected_result", operator_all_tests)
+def test_operator_mapping_output(filename, check_type_str, evaluate_args, path, expected_result):
+    """Validate operator check types on data extracted as a mapping report the same items, keyed by reference key."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("api", filename)
+    value = extract_data_from_json(data, path, output="mapping")
+    actual_results = check.evaluate(evaluate_args, value)
+    expected_items, expected_passed = expected_result
+    expected_result = ({key: item[key] for item in expected_items for key in item}, expected_passed)
+    assert actual_results == expected_result, ASSERT_FAIL_MESSAGE.format(
+        output=actual_results, expected_output=expected_result
+    )
+
+
+@pytest.mark.parametrize("filename, check_type_str, evaluate_args, path, expected_result", operator_all_tests)
+@pytest.mark.parametrize("output", ["list", "mapping"])
+def test_operator_fail_fast(filename, check_type_str, evaluate_args, path, expected_result, output):
+    """Validate that fail-fast operator check types return only the boolean of the full evaluation."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("api", filename)
+    value = extract_data_from_json(data, path, output=output)
+    actual_results = check.evaluate(evaluate_args, value, fail_fast=True)
+    assert actual_results == ({}, expected_result[1])
+
+
 @pytest.mark.parametrize(
     "value, operator_data, expected_result",
     [
@@ -303,3 +328,4 @@ def test_all_same(value, operator_data, expected_result):
     check_args = {"params": {"mode": "all-same", "operator_data": operator_data}}
     check = CheckType.create("operator")
     assert check.evaluate(check_args, value) == expected_result
+    assert check.evaluate(check_args, value, fail_fast=True) == ({}, expected_result[1])
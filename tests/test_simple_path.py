@@ -0,0 +1,189 @@
+"""Test the simple path walker against jmespath."""
+
+import jmespath
+import pytest
+
+from jdiff.utils.jmespath_parsers import compile_expression
+from jdiff.utils.simple_path import SimplePath, compile_simple_path, list_depth
+
+from .utility import ASSERT_FAIL_MESSAGE, load_json_file
+
+data = {
+    "result": [
+        {
+            "vrfs": {
+                "default": {
+                    "peerList": [
+                        {"peerAddress": "10.1.0.0", "state": "Idle", "prefixesReceived": 0, "extra": None},
+                        {"peerAddress": "10.2.0.0", "state": "Established", "prefixesReceived": 10},
+                        {"peerAddress": "10.3.0.0", "prefixesReceived": None},
+                        "not-a-peer",
+                        None,
+                        [1, 2],
+                    ],
+                    "asn": "65000",
+                },
+                "mgmt": {"peerList": [], "asn": None},
+                "empty": {},
+                "list": [{"asn": 1}],
+            }
+        },
+        None,
+        [[1, 2], [3]],
+    ],
+    "nested": [[{"a": 1}, {"a": None}], [{"a": 2}], [], None, "x"],
+    "my-key": {"a.b": {"c": 1}},
+}
+
+expressions = [
+    "result",
+    "result[0]",
+    "result[-1]",
+    "result[3]",
+    "result[-4]",
+    "result[1].vrfs",
+    "result[0].vrfs.default.peerList",
+    "result[0].vrfs.default.peerList[*]",
+    "result[0].vrfs.default.peerList[*].state",
+    "result[0].vrfs.default.peerList[*].[peerAddress,state]",
+    "result[0].vrfs.default.peerList[*].[peerAddress, prefixesReceived]",
+    "result[0].vrfs.default.peerList[*].[extra]",
+    "result[0].vrfs.default.peerList[0].[peerAddress,state]",
+    "result[0].vrfs.default.peerList[0]",
+    "result[0].vrfs.default.peerList[3].state",
+    "result[0].vrfs.default.asn.value",
+    "result[0].vrfs.default.asn[0]",
+    "result[0].vrfs.*",
+    "result[0].vrfs.*.asn",
+    "result[0].vrfs.*.peerList",
+    "result[0].vrfs.*.peerList[*].state",
+    "result[0].vrfs.*.peerList[0]",
+    "result[0].vrfs.*.[asn]",
+    "result[0].vrfs.*.*",
+    "result[0].vrfs.list.*",
+    "result[*].vrfs",
+    "result[*][0]",
+    "result[*][*]",
+    "result[2][*][*]",
+    "result[0].[vrfs]",
+    "result.[vrfs]",
+    "nested[*][*].a",
+    "nested[*][0].a",
+    "nested[*][*]",
+    "nested.*",
+    "nested[*].*",
+    '"my-key"."a.b".c',
+    '"my-key".*.c',
+    "*",
+    "*.vrfs",
+    "*[0]",
+    "[*]",
+    "[0]",
+    "[result,nested]",
+    "@",
+    "@.*",
+    "@.result[0]",
+    "missing",
+    "missing[*].a",
+    "missing.*",
+    "missing.[a]",
+    "result[0].vrfs.*.peerList.state",
+    "result[0].vrfs.*.asn.value",
+    "result[0].vrfs.*.peerList[*].state.value",
+    "result[0].vrfs.*.*.asn",
+    "result[0].vrfs.*.peerList[0].state",
+    "result[0].vrfs.*.[asn, peerList]",
+    "result[0].vrfs.*.peerList[] | [*].state",
+    "result[*].vrfs.*.peerList[]",
+    "result[*].vrfs.*.peerList[].state",
+    "result[0].vrfs.* | [0]",
+    "nested[]",
+    "nested[][]",
+    "nested[].a",
+    "nested[*] | []",
+    "nested[*].[a, b.c, [a]]",
+    "result[0].vrfs.default.peerList[*].[peerAddress, [state, extra]]",
+    "*.*",
+    "*.*.*",
+    "*[*].*",
+    "[*].*.a",
+]
+
+
+@pytest.mark.parametrize("expression", expressions)
+def test_simple_path_matches_jmespath(expression):
+    """Assert SimplePath returns exactly what jmespath returns, for every shape of data."""
+    walker = compile_simple_path(expression)
+    assert isinstance(walker, SimplePath)
+    for document in (data, data["result"], data["result"][0], data["nested"], None, "text", 1):
+        output = walker.search(document)
+        expected_output = jmespath.search(expression, document)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "result[0].vrfs.default.peerList[*].[$peerAddress$,state]",
+        "global.$peers$.*.*.ipv4.[accepted_prefixes,received_prefixes,sent_prefixes]",
+        "$*$.peers.$*$.*.ipv4.[accepted_prefixes,received_prefixes,sent_prefixes]",
+        "*.peers.*.*.ipv4.[accepted_prefixes] | [] | []",
+        "*.peers | []",
+        "*.peers.*.*.ipv4.accepted_prefixes",
+    ],
+)
+def test_simple_path_mock(expression):
+    """Assert SimplePath matches jmespath on device output."""
+    document = load_json_file("napalm_get_bgp_neighbors", "multi_vrf.json")
+    expression = expression.replace("$", "")
+    output = compile_simple_path(expression).search(document)
+    expected_output = jmespath.search(expression, document)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+unsupported_expressions = [
+    "a[?b=='c']",
+    "a[0:2]",
+    "a || b",
+    "a && b",
+    "!a",
+    "length(a)",
+    "a.{b: c}",
+    "`1`",
+    "a == 'b'",
+    "sort_by(a, &b)",
+    "a[*].[b, length(c)]",
+]
+
+
+@pytest.mark.parametrize("expression", unsupported_expressions)
+def test_compile_simple_path_unsupported(expression):
+    """Assert expressions outside the subset are left to jmespath."""
+    assert compile_simple_path(expression) is None
+    assert not isinstance(compile_expression(expression), SimplePath)
+
+
+def test_compile_expression_fast_path():
+    """Assert compile_expression returns a SimplePath for expressions in the subset."""
+    walker = compile_expression("result[0].vrfs.*.peerList[*].state")
+    assert isinstance(walker, SimplePath)
+    assert walker.expression == "result[0].vrfs.*.peerList[*].state"
+
+
+@pytest.mark.parametrize(
+    "expression, expected_output",
+    [
+        ("result[0].vrfs.default.peerList[*].[peerAddress,state]", 2),
+        ("result[0].vrfs.default.peerList[0].state", 0),
+        ("vrfs.*.peerList[*].[peerAddress,state]", 3),
+        ("a[*].b[*].c[*].[x,y]", 4),
+        ("peerList[?state=='Idle'].[peerAddress]", 2),
+        ("a.*.b.*.c", None),
+        ("a[].b", None),
+        ("length(a)", None),
+    ],
+)
+def test_list_depth(expression, expected_output):
+    """Assert the nesting depth of results is known from the syntax tree when it does not depend on the data."""
+    output = list_depth(jmespath.compile(expression).parsed)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
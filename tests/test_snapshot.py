@@ -0,0 +1,133 @@
+"""Snapshot digest index tests."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from jdiff import load_snapshot, save_snapshot
+from jdiff import snapshot as snapshot_module
+from jdiff.evaluators import DIFF_ENGINES, diff_generator
+from jdiff.snapshot import INDEX_SUFFIX, LoadStats
+
+from .utility import ASSERT_FAIL_MESSAGE, MOCK_FOLDERS, load_mocks
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 4096])
+@pytest.mark.parametrize("folder_name", MOCK_FOLDERS)
+def test_snapshot_diff_mocks(tmp_path, folder_name, chunk_size):
+    """Assert a saved snapshot loads back whole and diffs like diff_generator, whatever the chunk size."""
+    pre, post = load_mocks(folder_name)
+    save_snapshot(pre, tmp_path / "pre.json", chunk_size=chunk_size)
+    snapshot = load_snapshot(tmp_path / "pre.json")
+    assert snapshot.load_data() == pre
+    expected_output = diff_generator(pre, post)
+    output = snapshot.diff(post)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+interfaces = {
+    "interfaces": {
+        f"Ethernet{index}": {"status": "connected", "mtu": 1500, "vlans": [10, 20], "counters": {"in": index}}
+        for index in range(100)
+    }
+}
+
+
+def changed_interfaces():
+    """Return a copy of interfaces with changed, removed and added interfaces."""
+    data = copy.deepcopy(interfaces)
+    data["interfaces"]["Ethernet3"]["status"] = "notconnect"
+    data["interfaces"]["Ethernet50"]["vlans"].append(30)
+    del data["interfaces"]["Ethernet7"]
+    data["interfaces"]["Ethernet100"] = {"status": "connected"}
+    return data
+
+
+@pytest.mark.parametrize("engine", DIFF_ENGINES)
+def test_snapshot_reads_changed_chunks(tmp_path, engine):
+    """Assert a diff only reads the chunks of the subtrees that changed."""
+    snapshot = save_snapshot(interfaces, tmp_path / "pre.json", chunk_size=128)
+    post = changed_interfaces()
+    expected_output = diff_generator(interfaces, post, engine=engine)
+    output = snapshot.diff(post, engine=engine)
+    assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+    assert snapshot.stats.chunks == 3
+
+    snapshot.diff(copy.deepcopy(interfaces))
+    assert snapshot.stats == LoadStats(chunks=0, size=0)
+
+    snapshot.load_data()
+    assert snapshot.stats.chunks == 100
+    assert snapshot.stats.size + 100 == os.path.getsize(tmp_path / "pre.json")
+
+
+def test_snapshot_load_changed_reuses_data(tmp_path):
+    """Assert unchanged subtrees are taken from the compared data instead of read."""
+    snapshot = save_snapshot(interfaces, tmp_path / "pre.json", chunk_size=128)
+    post = changed_interfaces()
+    pre = snapshot.load_changed(post)
+    assert pre == interfaces
+    assert pre["interfaces"]["Ethernet1"] is post["interfaces"]["Ethernet1"]
+    assert pre["interfaces"]["Ethernet3"] is not post["interfaces"]["Ethernet3"]
+
+
+def test_snapshot_structure_changes(tmp_path):
+    """Assert subtrees replaced by other types or shapes diff like diff_generator."""
+    pre = {"a": [{"b": 1}, {"c": [1, 2, 3]}], "d": {"e": "x" * 10}}
+    snapshot = save_snapshot(pre, tmp_path / "pre.json", chunk_size=8)
+    for post in ({"a": {"b": 1}, "d": "x"}, {"a": [{"b": 1}]}, {"d": {"e": "x" * 10, "f": 1}}, [], None):
+        expected_output = diff_generator(pre, post)
+        output = snapshot.diff(post)
+        assert output == expected_output, ASSERT_FAIL_MESSAGE.format(output=output, expected_output=expected_output)
+
+
+def test_snapshot_serializes_once(tmp_path, monkeypatch):
+    """Assert saving and diffing a deep document serialize each value once, not once per level."""
+    serialized = []
+
+    def counting(dumps):
+        def counting_dumps(value):
+            text = dumps(value)
+            serialized.append(len(text))
+            return text
+
+        return counting_dumps
+
+    for name in ("_dumps", "_scalar_dumps"):
+        monkeypatch.setattr(snapshot_module, name, counting(getattr(snapshot_module, name)))
+    pre = {"leaf": "x" * 1000}
+    for depth in range(50):
+        pre = {f"level{depth}": pre, "index": depth}
+    size = len(json.dumps(pre, separators=(",", ":")))
+    snapshot = save_snapshot(pre, tmp_path / "pre.json", chunk_size=64)
+    assert snapshot.load_data() == pre
+    assert sum(serialized) < 2 * size
+    serialized.clear()
+    assert snapshot.diff(copy.deepcopy(pre)) == {}
+    assert sum(serialized) < 2 * size
+    assert snapshot.stats == LoadStats(chunks=0, size=0)
+
+
+def test_snapshot_index_file(tmp_path):
+    """Assert the index file holds its version, chunk size and root node."""
+    save_snapshot(interfaces, tmp_path / "pre.json")
+    with open(str(tmp_path / "pre.json") + INDEX_SUFFIX, encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    assert index["version"] == 2
+    assert index["chunk_size"] == 4096
+    assert index["root"][0] == "dict"
+
+
+def test_snapshot_validation(tmp_path):
+    """Assert chunk sizes below 1 and unsupported index versions are rejected."""
+    with pytest.raises(ValueError) as error:
+        save_snapshot(interfaces, tmp_path / "pre.json", chunk_size=0)
+    assert "'chunk_size' must be a positive integer. You have: 0." in str(error.value)
+
+    with open(str(tmp_path / "other.json") + INDEX_SUFFIX, "w", encoding="utf-8") as index_file:
+        json.dump({"version": 0, "chunk_size": 1, "root": []}, index_file)
+    with pytest.raises(ValueError) as error:
+        load_snapshot(tmp_path / "other.json")
+    assert "Snapshot index version 0 is not supported, expected 2." in str(error.value)
@@ -143,6 +143,20 @@ def test_check_type_results(check_type_str, evaluate_args, folder_name, path, ex
     )
 
 
+@pytest.mark.parametrize("check_type_str, evaluate_args, folder_name, path, expected_results", check_type_tests)
+def test_check_type_fail_fast(check_type_str, evaluate_args, folder_name, path, expected_results):
+    """Validate that fail-fast evaluation returns only the boolean of the full evaluation."""
+    check = CheckType.create(check_type_str)
+    pre_data, post_data = load_mocks(folder_name)
+    pre_value = extract_data_from_json(pre_data, path)
+    post_value = extract_data_from_json(post_data, path)
+    actual_results = check.evaluate(pre_value, post_value, fail_fast=True, **evaluate_args)
+    expected_results = ({}, expected_results[1])
+    assert actual_results == expected_results, ASSERT_FAIL_MESSAGE.format(
+        output=actual_results, expected_output=expected_results
+    )
+
+
 napalm_bgp_neighbor_status = (
     "napalm_get_bgp_neighbors",
     "exact_match",
@@ -259,6 +273,87 @@ def test_checks(folder_name, check_type_str, evaluate_args, path, expected_resul
     )
 
 
+@pytest.mark.parametrize("folder_name, check_type_str, evaluate_args, path, expected_result", check_tests)
+def test_checks_fail_fast(folder_name, check_type_str, evaluate_args, path, expected_result):
+    """Validate that fail-fast evaluation returns only the boolean of the full evaluation."""
+    check = CheckType.create(check_type_str)
+    pre_data, post_data = load_mocks(folder_name)
+    pre_value = extract_data_from_json(pre_data, path)
+    post_value = extract_data_from_json(post_data, path)
+    for engine in ("deepdiff", "native"):
+        actual_results = check.evaluate(pre_value, post_value, engine=engine, fail_fast=True, **evaluate_args)
+        assert actual_results == ({}, expected_result[1]), ASSERT_FAIL_MESSAGE.format(
+            output=actual_results, expected_output=({}, expected_result[1])
+        )
+
+
+def test_tolerance_fail_fast():
+    """Validate that fail-fast tolerance ignores changes within tolerance and stops at the first one beyond it."""
+    pre = {"Ethernet1": {"counter": 100, "status": "up"}, "Ethernet2": {"counter": 100, "status": "up"}}
+    post = {"Ethernet1": {"counter": 105, "status": "up"}, "Ethernet2": {"counter": 100, "status": "up"}}
+    check = CheckType.create("tolerance")
+    assert check.evaluate(pre, post, 10, fail_fast=True) == ({}, True)
+    assert check.evaluate(pre, post, 1, fail_fast=True) == ({}, False)
+    post["Ethernet2"]["status"] = "down"
+    assert check.evaluate(pre, post, 10, fail_fast=True) == ({}, False)
+    # Changed values that aren't numbers, like multi-line strings reported with a unified diff, are beyond tolerance.
+    pre, post = {"config": "hostname a\nntp 1.1.1.1"}, {"config": "hostname b\nntp 1.1.1.1"}
+    assert check.evaluate(pre, post, 10) == check.evaluate(pre, post, 10, engine="native")
+    assert check.evaluate(pre, post, 10, fail_fast=True) == ({}, False)
+
+
+def test_tolerance_per_path():
+    """Validate that path patterns pick the tolerance of each changed value, in percent or absolute."""
+    pre = {
+        "Ethernet1": {"counters": {"inOctets": 1000, "outOctets": 1000}, "optics": {"rx_power": -4.0}, "mtu": 1500},
+        "Ethernet2": {"counters": {"inOctets": 1000, "outOctets": 1000}, "optics": {"rx_power": -4.0}, "mtu": 1500},
+    }
+    post = {
+        "Ethernet1": {"counters": {"inOctets": 1050, "outOctets": 1200}, "optics": {"rx_power": -4.4}, "mtu": 1500},
+        "Ethernet2": {"counters": {"inOctets": 1000, "outOctets": 1000}, "optics": {"rx_power": -5.5}, "mtu": 9214},
+    }
+    tolerance = {"*.counters.*": 10, "*.optics.*": {"absolute": 1}}
+    expected_output = {
+        "Ethernet1": {"counters": {"outOctets": {"new_value": 1200, "old_value": 1000}}},
+        "Ethernet2": {
+            "optics": {"rx_power": {"new_value": -5.5, "old_value": -4.0}},
+            "mtu": {"new_value": 9214, "old_value": 1500},
+        },
+    }
+    check = CheckType.create("tolerance")
+    for engine in ("deepdiff", "native"):
+        output = check.evaluate(pre, post, tolerance, engine=engine)
+        assert output == (expected_output, False), ASSERT_FAIL_MESSAGE.format(
+            output=output, expected_output=expected_output
+        )
+        assert check.evaluate(pre, post, tolerance, engine=engine, lazy=True)[0] == expected_output
+        assert check.evaluate(pre, post, tolerance, engine=engine, fail_fast=True) == ({}, False)
+
+    # The first matching pattern applies.
+    tolerance = {"Ethernet1.*": {"absolute": 500}, "*": {"percent": 0}}
+    assert check.evaluate(pre, post, tolerance)[0] == {
+        "Ethernet2": {
+            "optics": {"rx_power": {"new_value": -5.5, "old_value": -4.0}},
+            "mtu": {"new_value": 9214, "old_value": 1500},
+        }
+    }
+    post["Ethernet2"] = pre["Ethernet2"]
+    assert check.evaluate(pre, post, {"*": {"absolute": 201}}, fail_fast=True) == ({}, True)
+
+
+def test_tolerance_bounded():
+    """Validate that changes within tolerance are not counted against max_diffs."""
+    pre = {f"Ethernet{index}": {"counter": 100, "mtu": 1500} for index in range(5)}
+    post = {f"Ethernet{index}": {"counter": 105, "mtu": 9214} for index in range(5)}
+    output, passed = CheckType.create("tolerance").evaluate(pre, post, 10, max_diffs=2)
+    assert output == {
+        "Ethernet0": {"mtu": {"new_value": 9214, "old_value": 1500}},
+        "Ethernet1": {"mtu": {"new_value": 9214, "old_value": 1500}},
+        "_truncated": {"Ethernet2": 1, "Ethernet3": 1, "Ethernet4": 1},
+    }
+    assert not passed
+
+
 parameter_match_api = (
     "pre.json",
     "parameter_match",
@@ -312,6 +407,22 @@ def test_param_match(filename, check_type_str, evaluate_args, path, expected_res
     )
 
 
+@pytest.mark.parametrize(
+    "filename, check_type_str, evaluate_args, path, expected_result",
+    [parameter_match_api, parameter_no_match_api],
+)
+def test_param_match_mapping_output(filename, check_type_str, evaluate_args, path, expected_result):
+    """Validate parameter_match check type on data extracted as a mapping."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("parameter_match", filename)
+    value = extract_data_from_json(data, path, output="mapping")
+    # pylint:disable=too-many-function-args
+    actual_results = check.evaluate(evaluate_args["params"], value, evaluate_args["mode"])
+    assert actual_results == expected_result, ASSERT_FAIL_MESSAGE.format(
+        output=actual_results, expected_output=expected_result
+    )
+
+
 regex_match_include = (
     "pre.json",
     "regex",
@@ -358,3 +469,60 @@ def test_regex_match(filename, check_type_str, evaluate_args, path, expected_res
     assert actual_results == expected_result, ASSERT_FAIL_MESSAGE.format(
         output=actual_results, expected_output=expected_result
     )
+
+
+@pytest.mark.parametrize("filename, check_type_str, evaluate_args, path, expected_result", regex_match)
+def test_regex_match_mapping_output(filename, check_type_str, evaluate_args, path, expected_result):
+    """Validate regex check type on data extracted as a mapping."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("api", filename)
+    value = extract_data_from_json(data, path, output="mapping")
+    # pylint:disable=too-many-function-args
+    actual_results = check.evaluate(evaluate_args["regex"], value, evaluate_args["mode"])
+    assert actual_results == expected_result, ASSERT_FAIL_MESSAGE.format(
+        output=actual_results, expected_output=expected_result
+    )
+
+
+@pytest.mark.parametrize(
+    "filename, check_type_str, evaluate_args, path, expected_result",
+    [parameter_match_api, parameter_no_match_api, parameter_match_napalm_facts],
+)
+def test_param_match_fail_fast(filename, check_type_str, evaluate_args, path, expected_result):
+    """Validate that fail-fast parameter_match returns only the boolean of the full evaluation."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("parameter_match", filename)
+    value = extract_data_from_json(data, path)
+    # pylint:disable=too-many-function-args
+    actual_results = check.evaluate(evaluate_args["params"], value, evaluate_args["mode"], fail_fast=True)
+    assert actual_results == ({}, expected_result[1])
+
+
+@pytest.mark.parametrize("filename, check_type_str, evaluate_args, path, expected_result", regex_match)
+def test_regex_match_fail_fast(filename, check_type_str, evaluate_args, path, expected_result):
+    """Validate that fail-fast regex returns only the boolean of the full evaluation."""
+    check = CheckType.create(check_type_str)
+    data = load_json_file("api", filename)
+    value = extract_data_from_json(data, path, output="mapping")
+    # pylint:disable=too-many-function-args
+    actual_results = check.evaluate(evaluate_args["regex"], value, evaluate_args["mode"], fail_fast=True)
+    assert actual_results == ({}, expected_result[1])
+
+
+def test_exact_match_mapping_output():
+    """Validate exact_match reports changed, missing and new reference keys of data extracted as a mapping."""
+    pre = {"peerList": [{"peerAddress": "10.1.0.0", "state": "Up"}, {"peerAddress": "10.2.0.0", "state": "Up"}]}
+    post = {"peerList": [{"peerAddress": "10.3.0.0", "state": "Up"}, {"peerAddress": "10.1.0.0", "state": "Idle"}]}
+    path = "peerList[*].[$peerAddress$,state]"
+    check = CheckType.create("exact_match")
+
+    actual_results = check.evaluate(
+        extract_data_from_json(pre, path, output="mapping"), extract_data_from_json(post, path, output="mapping")
+    )
+    expected_result = (
+        {"10.1.0.0": {"state": {"new_value": "Idle", "old_value": "Up"}}, "10.2.0.0": "missing", "10.3.0.0": "new"},
+        False,
+    )
+    assert actual_results == expected_result, ASSERT_FAIL_MESSAGE.format(
+        output=actual_results, expected_output=expected_result
+    )
@@ -14,6 +14,22 @@ tolerance_wrong_value = (
     {"tolerance": "10"},
     "Tolerance argument's value must be a number. You have: <class 'str'>.",
 )
+tolerance_wrong_pattern = (
+    "tolerance",
+    {"tolerance": {1: 10}},
+    "Tolerance path patterns must be strings. You have: <class 'int'>.",
+)
+tolerance_wrong_pattern_value = (
+    "tolerance",
+    {"tolerance": {"*.counters.*": {"relative": 10}}},
+    "Tolerance of '*.counters.*' must be a number, or a dict with a 'percent' or 'absolute' number. "
+    "You have: {'relative': 10}.",
+)
+tolerance_negative_pattern_value = (
+    "tolerance",
+    {"tolerance": {"*.optics.*": {"absolute": -1}}},
+    "Tolerance value must be greater than 0. You have: -1.",
+)
 parameter_no_params = (
     "parameter_match",
     {"mode": "match", "wrong_key": {"localAsn": "65130.1100", "linkType": "external"}},
@@ -108,6 +124,9 @@ operator_params_subset = (
 all_tests = [
     tolerance_wrong_argumet,
     tolerance_wrong_value,
+    tolerance_wrong_pattern,
+    tolerance_wrong_pattern_value,
+    tolerance_negative_pattern_value,
     parameter_no_params,
     parameter_wrong_type,
     parameter_no_mode,
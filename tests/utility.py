@@ -5,6 +5,13 @@ import os
 
 dirname = os.path.dirname(os.path.abspath(__file__))
 
+# Mock folders holding pre and post data.
+MOCK_FOLDERS = sorted(
+    folder
+    for folder in os.listdir(os.path.join(dirname, "mock"))
+    if os.path.isfile(os.path.join(dirname, "mock", folder, "post.json"))
+)
+
 
 ASSERT_FAIL_MESSAGE = """Test output is different from expected output.
 output: {output}
@@ -24,3 +31,36 @@ def load_mocks(folder):
     pre = load_json_file(folder, "pre.json")
     post = load_json_file(folder, "post.json")
     return pre, post
+
+
+def random_value(rand, depth):
+    """Return a random JSON-compatible value."""
+    kind = rand.random()
+    if depth == 0 or kind < 0.35:
+        return rand.choice([0, 1, 2, 1.0, 2.5, True, False, None, "x", "y", "a\nb", "a\nc", ""])
+    if kind < 0.65:
+        return {rand.choice("abcdef"): random_value(rand, depth - 1) for _ in range(rand.randint(0, 5))}
+    if kind < 0.85:
+        return [random_value(rand, 0) for _ in range(rand.randint(0, 7))]
+    return [random_value(rand, depth - 1) for _ in range(rand.randint(0, 5))]
+
+
+def random_change(rand, value):
+    """Return a copy of value with random changes."""
+    if rand.random() < 0.15:
+        return random_value(rand, 3)
+    if isinstance(value, dict):
+        value = {key: random_change(rand, item) if rand.random() < 0.5 else item for key, item in value.items()}
+        if value and rand.random() < 0.2:
+            value.pop(rand.choice(list(value)))
+        if rand.random() < 0.3:
+            value[rand.choice("abcdef")] = random_value(rand, 2)
+        return value
+    if isinstance(value, list):
+        value = [random_change(rand, item) if rand.random() < 0.3 else item for item in value]
+        if value and rand.random() < 0.3:
+            del value[rand.randrange(len(value))]
+        if rand.random() < 0.3:
+            value.insert(rand.randint(0, len(value)), random_value(rand, 1))
+        return value
+    return random_value(rand, 0) if rand.random() < 0.5 else value